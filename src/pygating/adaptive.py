@@ -0,0 +1,212 @@
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class, _hook_applies
+
+# Every SAMPLE_INTERVAL-th evaluation of a node is timed and counted
+SAMPLE_INTERVAL = 16
+
+# Children are reordered, and their statistics decayed, every REORDER_INTERVAL samples
+REORDER_INTERVAL = 64
+
+
+def _composite_short_circuit(gate: AbstractGate) -> Optional[bool]:
+    """
+    Returns the child check result that short-circuits a built-in AndGate (False) or
+    OrGate (True), or None for any other gate, including subclasses changing evaluation.
+    """
+    from .gates import AndGate, OrGate
+
+    cls = type(gate)
+    if _defining_class(cls, "check") is not AbstractGate:
+        return None
+
+    owner = _defining_class(cls, "_check_gate")
+    if owner is AndGate:
+        return False
+    if owner is OrGate:
+        return True
+
+    return None
+
+
+# type -> "composite" for built-in And/Or gates, otherwise whether the type's side_effect_free declaration is trusted
+_side_effect_free_types: Dict[type, Any] = {}
+
+
+def side_effect_free(gate: AbstractGate) -> bool:
+    """
+    A gate may be evaluated in any order, or skipped, when it declares itself
+    side_effect_free and that declaration covers the evaluation methods it uses.
+    """
+    kind = _side_effect_free_types.get(type(gate))
+    if kind is None:
+        if _composite_short_circuit(gate) is not None:
+            kind = "composite"
+        else:
+            kind = _hook_applies(gate, "side_effect_free", ["check", "_check_gate"])
+        _side_effect_free_types[type(gate)] = kind
+
+    if kind == "composite":
+        return all(side_effect_free(child) for child in gate.gates)
+
+    return kind and bool(gate.side_effect_free)
+
+
+def static_cost(gate: AbstractGate) -> float:
+    if _composite_short_circuit(gate) is not None:
+        return sum(static_cost(child) for child in gate.gates)
+
+    return float(gate.static_cost)
+
+
+class _Child:
+    __slots__ = ("check", "static_cost", "samples", "decisive", "time")
+
+    def __init__(self, check: Callable[[Any], Any], cost: float):
+        self.check = check
+        self.static_cost = cost
+        self.samples = 0
+        self.decisive = 0
+        self.time = 0.0
+
+
+class AdaptiveNode:
+    """
+    Evaluates all() (short_circuit=False) or any() (short_circuit=True) of its
+    children's check results. When reorder is set, children are evaluated in the
+    order minimising expected cost: ascending cost / probability of short-circuiting,
+    estimated from sampled timings and outcomes, or from static costs before any
+    statistics exist.
+    """
+
+    def __init__(self, children: List[_Child], short_circuit: bool, reorder: bool):
+        self.children = children
+        self.short_circuit = short_circuit
+        self.reorder = reorder
+        self.calls = 0
+        self.samples = 0
+        if reorder:
+            self.order = tuple(sorted(children, key=lambda child: child.static_cost))
+        else:
+            self.order = tuple(children)
+
+    def evaluate(self, entity: Any) -> bool:
+        if self.reorder:
+            self.calls += 1
+            if self.calls % SAMPLE_INTERVAL == 0:
+                return self._evaluate_sampled(entity)
+
+        if self.short_circuit:
+            for child in self.order:
+                if child.check(entity):
+                    return True
+            return False
+
+        for child in self.order:
+            if not child.check(entity):
+                return False
+        return True
+
+    def _evaluate_sampled(self, entity: Any) -> bool:
+        result = not self.short_circuit
+        for child in self.order:
+            start = perf_counter()
+            passed = child.check(entity)
+            child.time += perf_counter() - start
+            child.samples += 1
+            if bool(passed) is self.short_circuit:
+                child.decisive += 1
+                result = self.short_circuit
+                break
+
+        self.samples += 1
+        if self.samples % REORDER_INTERVAL == 0:
+            self._reorder()
+
+        return result
+
+    def _reorder(self):
+        sampled_time = sum(child.time for child in self.children)
+        sampled_cost = sum(child.samples * child.static_cost for child in self.children)
+        # Children that were never reached are costed by their static cost in the same unit
+        scale = sampled_time / sampled_cost if sampled_cost else 1.0
+
+        def rank(child: _Child) -> float:
+            cost = child.time / child.samples if child.samples else child.static_cost * scale
+            probability = (child.decisive + 1) / (child.samples + 2)
+            return cost / probability
+
+        self.order = tuple(sorted(self.order, key=rank))
+
+        # Decay statistics so the order follows changes in traffic
+        for child in self.children:
+            child.samples //= 2
+            child.decisive //= 2
+            child.time /= 2
+
+
+def _build_child(gate: AbstractGate, raise_equivalent: Optional[bool]) -> _Child:
+    short_circuit = _composite_short_circuit(gate)
+    if short_circuit is None:
+        return _Child(gate.check, static_cost(gate))
+
+    # The gate's check result when one of its children short-circuits it
+    short_result = short_circuit == gate.allow
+    node = _build_node(gate.gates, short_circuit, raise_equivalent is not None and short_result == raise_equivalent)
+    allow = gate.allow
+
+    def check(entity: Any) -> bool:
+        return node.evaluate(entity) == allow
+
+    return _Child(check, static_cost(gate))
+
+
+def _build_node(gates: List[AbstractGate], short_circuit: bool, exception_safe: bool) -> AdaptiveNode:
+    """
+    exception_safe means a raising child leads to the same final result as a child
+    short-circuiting this node, so evaluation order cannot change the result.
+    """
+    children = [_build_child(gate, short_circuit if exception_safe else None) for gate in gates]
+    reorder = exception_safe and len(gates) > 1 and all(side_effect_free(gate) for gate in gates)
+
+    return AdaptiveNode(children, short_circuit, reorder)
+
+
+class AdaptiveEvaluator:
+    """
+    Adaptive evaluation tree for a GatingConfigurationAll or GatingConfigurationAny,
+    covering nested AndGates and OrGates. Gates are never mutated, and a node is
+    only reordered when its children are side effect free and an exception raised
+    by any of them yields the same check() result as a short-circuit. Which
+    exception, if any, reaches exception_callback may therefore differ from
+    declaration order evaluation, the result never does.
+    """
+
+    def __init__(self, configuration: AbstractGatingConfiguration, short_circuit: bool):
+        self.gates = configuration.gates
+        self.fail_closed = configuration.fail_closed
+
+        # A raise makes the configuration return `not fail_closed`
+        exception_safe = short_circuit == (not configuration.fail_closed)
+        self.root = _build_node(configuration.gates, short_circuit, exception_safe)
+
+    def evaluate(self, entity: Any) -> bool:
+        return self.root.evaluate(entity)
+
+
+def adaptive_evaluator(configuration: AbstractGatingConfiguration, short_circuit: bool) -> AdaptiveEvaluator:
+    """
+    Returns the configuration's evaluator, rebuilt when its gates list or
+    fail_closed is replaced. In place changes to gates are not tracked.
+    """
+    evaluator = configuration.__dict__.get("_adaptive_evaluator")
+    if (
+        evaluator is None
+        or evaluator.gates is not configuration.gates
+        or evaluator.fail_closed != configuration.fail_closed
+    ):
+        evaluator = AdaptiveEvaluator(configuration, short_circuit)
+        configuration._adaptive_evaluator = evaluator
+
+    return evaluator
@@ -0,0 +1,177 @@
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional
+
+from .adaptive import _composite_short_circuit, side_effect_free
+from .evaluation import EntityContext, _configuration_mode, _gate_mode, _Raised, active_context
+from .property_accessor import PropertyAccessor
+from .pygating import AbstractGate, _defining_class
+
+
+class _Pending(BaseException):
+    """
+    Raised out of a synchronous gate hook when a property path reached an awaitable.
+    A BaseException, so neither gates nor configurations record it as an error.
+    """
+
+    def __init__(self, prefix: str, awaitable: Optional[Any]):
+        super().__init__(prefix)
+        self.prefix = prefix
+        self.awaitable = awaitable
+
+
+class AsyncEntityContext(EntityContext):
+    """
+    EntityContext for check_async. Property paths are resolved segment by segment,
+    awaiting the values that are awaitable (coroutine returning methods, futures
+    stored in dicts, ...) once per path prefix, even across concurrent branches.
+    """
+
+    def __init__(self, entity: Optional[Any] = None):
+        super().__init__(entity)
+        self._fetches: Dict[str, "asyncio.Future"] = {}
+
+    def _resolve_path(self, accessor: PropertyAccessor) -> Any:
+        return self._resolve_segments(accessor)
+
+    def _resolve_segment(self, prefix: str, accessor: PropertyAccessor, index: int, value: Any) -> Any:
+        if prefix in self._fetches:
+            raise _Pending(prefix, None)
+
+        resolved = super()._resolve_segment(prefix, accessor, index, value)
+        if inspect.isawaitable(resolved):
+            raise _Pending(prefix, resolved)
+
+        return resolved
+
+    async def _fetch(self, prefix: str, awaitable: Any):
+        try:
+            value = await awaitable
+        except Exception as e:
+            value = _Raised(e)
+
+        self._prefixes[prefix] = value
+
+    async def _wait(self, pending: _Pending):
+        fetch = self._fetches.get(pending.prefix)
+        if fetch is None:
+            fetch = self._fetches[pending.prefix] = asyncio.ensure_future(self._fetch(pending.prefix, pending.awaitable))
+
+        # Other branches may share the fetch, cancelling this one must not cancel it
+        await asyncio.shield(fetch)
+
+    async def _call(self, check: Callable[[], Any]) -> Any:
+        """
+        Awaits check() with this context active, so that PropertyGatingType.entity_value
+        resolves properties through it, calling it again once a pending property was
+        fetched.
+        """
+        while True:
+            token = active_context.set(self)
+            try:
+                result = check()
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            except _Pending as pending:
+                await self._wait(pending)
+            finally:
+                active_context.reset(token)
+
+    async def check_async(self, gate: AbstractGate, raise_equivalent: Optional[bool] = None) -> bool:
+        """
+        Equivalent of gate.check(entity), awaiting awaitable properties and script results.
+        """
+        short_circuit = _composite_short_circuit(gate)
+        if short_circuit is not None:
+            short_result = short_circuit == gate.allow
+            exception_safe = raise_equivalent is not None and short_result == raise_equivalent
+            return await self.evaluate_async(gate.gates, short_circuit, exception_safe) == gate.allow
+
+        if _gate_mode(gate):
+            while True:
+                try:
+                    return self.check(gate)
+                except _Pending as pending:
+                    await self._wait(pending)
+
+        # Gates without a trusted hook are called directly, their results may be awaitable
+        if _defining_class(type(gate), "check") is AbstractGate:
+            return await self._call(lambda: gate._check_gate(self.entity)) == gate.allow
+
+        return await self._call(lambda: gate.check(self.entity))
+
+    async def evaluate_async(self, gates: List[AbstractGate], short_circuit: bool, exception_safe: bool) -> bool:
+        """
+        all() (short_circuit=False) or any() (short_circuit=True) of the gates' checks.
+        Like adaptive reordering, gates only run concurrently when they are side effect
+        free and a raise yields the same result as a short-circuit (exception_safe),
+        the first decisive branch then cancelling the others. Otherwise they run in
+        declaration order.
+        """
+        raise_equivalent = short_circuit if exception_safe else None
+        if not exception_safe or len(gates) < 2 or not all(side_effect_free(gate) for gate in gates):
+            for gate in gates:
+                if bool(await self.check_async(gate, raise_equivalent)) is short_circuit:
+                    return short_circuit
+            return not short_circuit
+
+        tasks = [asyncio.ensure_future(self.check_async(gate, raise_equivalent)) for gate in gates]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                if bool(await next_result) is short_circuit:
+                    return short_circuit
+            return not short_circuit
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Collects the cancelled branches and their exceptions
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def check_configuration_async(self, configuration: Any, exception_callback: Optional[Callable] = None) -> bool:
+        """
+        Equivalent of configuration.check(entity, exception_callback).
+        """
+        from .gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+        owner = _defining_class(type(configuration), "_check_gating")
+        if _configuration_mode(configuration) == "check" or owner not in (GatingConfigurationAll, GatingConfigurationAny):
+            return await self._call(lambda: configuration.check(self.entity, exception_callback=exception_callback))
+
+        short_circuit = owner is GatingConfigurationAny
+        try:
+            # A raise makes the configuration return `not fail_closed`
+            return await self.evaluate_async(
+                configuration.gates, short_circuit, short_circuit == (not configuration.fail_closed)
+            )
+        except Exception as e:
+            if exception_callback:
+                exception_callback(e)
+
+            return not configuration.fail_closed
+
+    async def close(self):
+        """
+        Cancels the property fetches no branch is waiting for anymore.
+        """
+        fetches = list(self._fetches.values())
+        for fetch in fetches:
+            fetch.cancel()
+        await asyncio.gather(*fetches, return_exceptions=True)
+
+
+async def check_async(
+    configuration: Any, entity: Optional[Any] = None, exception_callback: Optional[Callable] = None
+) -> bool:
+    """
+    Checks a gating configuration without blocking the event loop on awaitable
+    entity properties or async script functions. Built-in GatingConfigurationAll
+    and GatingConfigurationAny configurations and And/Or gates evaluate their
+    independent branches concurrently, other configurations are checked synchronously.
+    Custom gates get awaited property values through PropertyGatingType.entity_value.
+    """
+    context = AsyncEntityContext(entity)
+    try:
+        return await context.check_configuration_async(configuration, exception_callback)
+    finally:
+        await context.close()
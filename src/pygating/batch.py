@@ -0,0 +1,270 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+from .gates.property_gating_type import property_type_name
+from .pygating import AbstractGate, AbstractGatingConfiguration, GatingException, _defining_class, _hook_applies
+
+# Python type produced by .tolist() for each numpy dtype kind with a fixed element type
+_KIND_PYTHON_TYPES = {
+    "b": bool,
+    "i": int,
+    "u": int,
+    "f": float,
+    "c": complex,
+    "U": str,
+    "S": bytes,
+    "m": timedelta,
+}
+
+NUMERIC_KINDS = "biuf"
+
+# dtype kinds whose values can be type checked and compared without going through python objects
+VECTOR_KINDS = "biufcUSmM"
+
+
+def exact_numeric(column: Any, value: Any) -> bool:
+    """
+    Whether numpy compares value with the numeric column's values exactly like python
+    compares their python values: numpy converts int columns to float64 when compared
+    with a float (and python floats to float32 for float32 columns), python does not.
+    """
+    kind = column.dtype.kind
+    if kind in "biu":
+        if not isinstance(value, int):
+            return False
+        if kind == "b":
+            return value in (0, 1)
+        limits = np.iinfo(column.dtype)
+        return limits.min <= value <= limits.max
+
+    return kind == "f" and isinstance(value, float) and column.dtype.itemsize == 8
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for batch gating, install it with `pip install numpy`")
+
+
+class _Failure:
+    def __init__(self, exception: Exception, rows: Any):
+        self.exception = exception
+        self.rows = rows
+
+
+class GatingBatch:
+    """
+    A batch of entities described column-wise: a mapping of dotted entity_property
+    path -> numpy array. Gates evaluate batches through their _check_gate_batch
+    hook, and fall back to checking reconstructed row entities one at a time.
+
+    Row entities are nested dicts built from the columns, with numpy values
+    converted to python values (datetime64 becomes datetime), and the batch
+    result for each row always equals the scalar check of that row entity.
+    """
+
+    def __init__(self, columns: Mapping[str, Any]):
+        _require_numpy()
+        if not columns:
+            raise ValueError("At least one column must be provided")
+
+        self.columns: Dict[str, Any] = {}
+        for path, column in columns.items():
+            if not isinstance(path, str) or not path:
+                raise ValueError(f"Column names must be non empty property paths: {path!r}")
+            if not isinstance(column, np.ndarray):
+                # Arbitrary sequences may hold mixed python values, keep them as objects
+                column = np.array(list(column), dtype=object)
+            if column.ndim != 1:
+                raise ValueError(f"Column '{path}' must be one dimensional")
+            if column.dtype.kind == "M":
+                # Rows hold python datetimes, which have microsecond precision
+                column = column.astype("datetime64[us]")
+            self.columns[path] = column
+
+        sizes = {len(column) for column in self.columns.values()}
+        if len(sizes) != 1:
+            raise ValueError("All columns must have the same length")
+        self.size = sizes.pop()
+
+        paths = sorted(self.columns)
+        for path, following in zip(paths, paths[1:]):
+            if following.startswith(path + "."):
+                raise ValueError(f"Column '{path}' cannot also be the parent of column '{following}'")
+
+        self._python_columns: Optional[List[Tuple[Tuple[str, ...], List[Any]]]] = None
+        self._failures: List[_Failure] = []
+
+    def column(self, path: Optional[str]) -> Any:
+        if not path:
+            return None
+
+        return self.columns.get(path)
+
+    def ones(self) -> Any:
+        return np.ones(self.size, dtype=bool)
+
+    def zeros(self) -> Any:
+        return np.zeros(self.size, dtype=bool)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        if self._python_columns is None:
+            self._python_columns = [
+                (tuple(path.split(".")), column.tolist()) for path, column in self.columns.items()
+            ]
+
+        entity: Dict[str, Any] = {}
+        for segments, values in self._python_columns:
+            node = entity
+            for segment in segments[:-1]:
+                node = node.setdefault(segment, {})
+            node[segments[-1]] = values[index]
+
+        return entity
+
+    def fail(self, rows: Any, exception: Exception) -> Any:
+        """
+        Records an exception raised by a vectorised kernel for the given rows, and
+        returns the rows so kernels can use it as their error mask.
+        """
+        if rows.any():
+            self._failures.append(_Failure(exception, rows))
+
+        return rows
+
+    def type_errors(self, column: Any, property_type: Any) -> Any:
+        """
+        Vectorised equivalent of the isinstance check in PropertyGatingType.entity_value.
+        Returns the rows whose value does not have the expected type.
+        """
+        if not property_type:
+            return self.zeros()
+
+        kind = column.dtype.kind
+        if kind == "M":
+            errors = np.isnat(column) if issubclass(datetime, property_type) else self.ones()
+        elif kind in _KIND_PYTHON_TYPES:
+            errors = self.zeros() if issubclass(_KIND_PYTHON_TYPES[kind], property_type) else self.ones()
+        else:
+            errors = np.fromiter(
+                (not isinstance(value, property_type) for value in column.tolist()),
+                dtype=bool,
+                count=self.size,
+            )
+
+        return self.fail(
+            errors,
+            GatingException(
+                f"Entity is not or does not return expected type of: {property_type_name(property_type)}"
+            ),
+        )
+
+    def evaluate_rows(self, function: Callable[[Any], Any], mask: Any) -> Tuple[Any, Any]:
+        values = self.zeros()
+        errors = self.zeros()
+        for index in np.flatnonzero(mask):
+            try:
+                values[index] = True if function(self.row(index)) else False
+            except Exception as e:
+                errors[index] = True
+                self._failures.append(_Failure(e, index))
+
+        return values, errors
+
+    def check_gate(self, gate: AbstractGate, mask: Any) -> Tuple[Any, Any]:
+        """
+        Evaluates gate.check for the rows in mask. Returns the passed and errored rows;
+        rows outside of mask hold no meaningful value.
+        """
+        failures_before = len(self._failures)
+        if _hook_applies(gate, "_check_gate_batch", ["check", "_check_gate"]):
+            outcome = gate._check_gate_batch(self, mask)
+            if outcome is not NotImplemented:
+                values, errors = outcome
+                # Only the rows this gate was evaluated for can fail because of it
+                for failure in self._failures[failures_before:]:
+                    if not isinstance(failure.rows, (int, np.integer)):
+                        failure.rows = failure.rows & mask
+                return self.apply_allow(values, gate.allow), errors
+
+        return self.evaluate_rows(gate.check, mask)
+
+    def apply_allow(self, values: Any, allow: Any) -> Any:
+        if allow is True:
+            return values
+        if allow is False:
+            return ~values
+
+        return values == allow
+
+    def combine(self, gates: List[AbstractGate], mask: Any, short_circuit: bool) -> Tuple[Any, Any]:
+        """
+        Evaluates gates in declaration order with all() (short_circuit=False) or
+        any() (short_circuit=True) semantics. A row stops being evaluated as soon as a
+        gate decides it or raises, exactly like the scalar short-circuit.
+        """
+        result = np.full(self.size, not short_circuit, dtype=bool)
+        errors = self.zeros()
+        active = mask.copy()
+        for gate in gates:
+            if not active.any():
+                break
+
+            passed, gate_errors = self.check_gate(gate, active)
+            gate_errors = active & gate_errors
+            decided = active & ~gate_errors & (passed if short_circuit else ~passed)
+            result[decided] = short_circuit
+            errors |= gate_errors
+            active &= ~(gate_errors | decided)
+
+        return result, errors
+
+    def check_configuration(
+        self,
+        configuration: AbstractGatingConfiguration,
+        exception_callback: Optional[Callable] = None,
+    ) -> Any:
+        mask = self.ones()
+        if _defining_class(type(configuration), "check") is not AbstractGatingConfiguration:
+            # check itself was overridden, it handles its own exceptions
+            values, _ = self.evaluate_rows(
+                lambda row: configuration.check(row, exception_callback=exception_callback), mask
+            )
+            return values
+
+        outcome = NotImplemented
+        if _hook_applies(configuration, "_check_gating_batch", ["_check_gating"]):
+            outcome = configuration._check_gating_batch(self, mask)
+        if outcome is NotImplemented:
+            outcome = self.evaluate_rows(configuration._check_gating, mask)
+
+        values, errors = outcome
+        if exception_callback:
+            for failure in self._failures:
+                if isinstance(failure.rows, (int, np.integer)) or failure.rows.any():
+                    exception_callback(failure.exception)
+
+        return np.where(errors, False if configuration.fail_closed else True, values)
+
+
+def datetime64(value: Any) -> Any:
+    """
+    Converts a naive datetime bound to datetime64[us], or returns None for values
+    (timezone aware datetimes, dates) that do not compare like naive numpy datetimes.
+    """
+    if not isinstance(value, datetime) or value.tzinfo is not None:
+        return None
+
+    return np.datetime64(value, "us")
+
+
+def check_configuration_batch(
+    configuration: AbstractGatingConfiguration,
+    columns: Mapping[str, Any],
+    exception_callback: Optional[Callable] = None,
+) -> Any:
+    return GatingBatch(columns).check_configuration(configuration, exception_callback)
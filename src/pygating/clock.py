@@ -0,0 +1,114 @@
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+
+class Clock(ABC):
+    """
+    Source of the current time for gates evaluated against "now".
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        pass
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class CoarseClock(Clock):
+    """
+    Serves the time read from clock every resolution seconds by a daemon thread
+    (started on first use), so now() is an attribute read instead of a system
+    clock query. Readings lag behind the wrapped clock by up to resolution seconds.
+    """
+
+    def __init__(self, resolution: float = 0.01, clock: Optional[Clock] = None):
+        if resolution <= 0:
+            raise ValueError("resolution must be greater than 0")
+
+        self.resolution = resolution
+        self.clock = clock or SystemClock()
+        self._now: Optional[datetime] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        if hasattr(os, "register_at_fork"):
+            # Threads do not survive a fork, the child restarts its own refresher on first use
+            reference = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: reference() is not None and reference()._reset())
+
+    def now(self) -> datetime:
+        now = self._now
+        if now is None:
+            now = self.start()._now or self.clock.now()
+
+        return now
+
+    def _refresh(self):
+        while not self._stop.wait(self.resolution):
+            self._now = self.clock.now()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._now = None
+
+    def start(self) -> "CoarseClock":
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._now = self.clock.now()
+                self._thread = threading.Thread(target=self._refresh, name="pygating-CoarseClock", daemon=True)
+                self._thread.start()
+
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+            self._now = None
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Optional[Clock] = None):
+    """
+    Sets the clock of the gates evaluated against "now" that have no clock of their own (SystemClock for None).
+    """
+    global _clock
+    _clock = clock or SystemClock()
+
+
+def next_time_boundary(gates: Iterable[Any], now: datetime) -> Optional[datetime]:
+    """
+    Returns the earliest instant after now at which one of the gates' results for
+    checks without an entity may change, or None when none of them depends on the time.
+    """
+    boundaries = [boundary for boundary in (gate._next_time_boundary(now) for gate in gates) if boundary is not None]
+    return min(boundaries, default=None)
+
+
+def has_own_clock(gates: Iterable[Any]) -> bool:
+    """
+    Whether one of the gates, or of the gates nested in them, reads the time from a
+    clock of its own instead of get_clock().
+    """
+    return any(
+        getattr(gate, "clock", None) is not None or has_own_clock(getattr(gate, "gates", None) or ()) for gate in gates
+    )
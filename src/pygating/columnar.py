@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow installed
+    pa = None
+
+from .batch import check_configuration_batch
+from .projection import cached_projection
+from .pygating import AbstractGatingConfiguration
+
+
+def _needed(path: str, paths: Optional[FrozenSet[str]]) -> bool:
+    # The column is read, or is a parent or a child of a path that is
+    if paths is None or path in paths:
+        return True
+
+    return any(path.startswith(other + ".") or other.startswith(path + ".") for other in paths)
+
+
+def _object_array(values: list) -> Any:
+    # np.array() would make a 2 dimensional array out of list values
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _select(everything: Iterator[Tuple[str, Callable[[], Any]]], paths: Optional[FrozenSet[str]]) -> Dict[str, Any]:
+    # everything yields each column's path and a function converting it
+    columns = {}
+    first = None
+    for path, convert in everything:
+        if _needed(path, paths):
+            columns[path] = convert()
+        elif first is None:
+            first = path, convert
+
+    if not columns and first is not None:
+        # Gates reading no property still need a column giving the number of rows
+        columns[first[0]] = first[1]()
+
+    return columns
+
+
+def dataframe_columns(frame: Any, paths: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """
+    Returns the batch columns of a pandas DataFrame: column names are entity_property
+    paths, MultiIndex names being joined with ".". Only the columns related to paths
+    are converted, when given. Columns backed by numpy arrays are used without
+    copying them, missing values of extension dtypes (Int64, string, ...) become None,
+    strings become fixed width numpy strings and timezone aware datetimes become
+    naive UTC datetimes.
+    """
+
+    def convert(series):
+        dtype = series.dtype
+        if getattr(dtype, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        elif not isinstance(dtype, np.dtype):
+            if series.hasnans:
+                return series.to_numpy(dtype=object, na_value=None)
+            if getattr(dtype, "kind", None) == "O" and dtype.type is str:
+                # Fixed width strings have vectorised kernels, python strings do not
+                return series.to_numpy(dtype=str)
+
+        return series.to_numpy()
+
+    def everything():
+        for position, name in enumerate(frame.columns):
+            path = ".".join(str(part) for part in name) if isinstance(name, tuple) else str(name)
+            yield path, lambda position=position: convert(frame.iloc[:, position])
+
+    return _select(everything(), paths)
+
+
+def _arrow_array(array: Any) -> Any:
+    kind = array.type
+    if pa.types.is_timestamp(kind):
+        if kind.tz is not None:
+            # Timestamps are stored as UTC, dropping the timezone keeps their values
+            array = array.cast(pa.timestamp(kind.unit))
+        # Nulls become NaT, which the batch handles like None
+        return array.to_numpy(zero_copy_only=False)
+
+    if array.null_count == 0:
+        if pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_boolean(kind):
+            return array.to_numpy(zero_copy_only=False)
+        if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            # Fixed width strings have vectorised kernels, python strings do not
+            return array.to_numpy(zero_copy_only=False).astype(str)
+
+    return _object_array(array.to_pylist())
+
+
+def arrow_columns(table: Any, paths: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """
+    Returns the batch columns of a pyarrow Table or RecordBatch: struct fields are
+    flattened into dotted paths (e.g. "user.email"), and only the fields related to
+    paths are converted, when given. Numeric columns without nulls are used without
+    copying them, nulls become None, strings become fixed width numpy strings and
+    timezone aware timestamps become naive UTC datetimes.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for arrow gating, install it with `pip install pyarrow`")
+
+    def fields(path, array):
+        if isinstance(array, pa.ChunkedArray):
+            array = array.chunk(0) if array.num_chunks == 1 else array.combine_chunks()
+
+        if pa.types.is_struct(array.type) and array.type.num_fields:
+            if not _needed(path, paths):
+                # Keeps a single lazy column around in case no other column is needed
+                yield path + "." + array.type.field(0).name, lambda: _arrow_array(array.flatten()[0])
+                return
+
+            # flatten() applies the struct's nulls to its fields
+            for field, child in zip(array.type, array.flatten()):
+                yield from fields(path + "." + field.name, child)
+        else:
+            yield path, lambda: _arrow_array(array)
+
+    def everything():
+        for name, column in zip(table.column_names, table.columns):
+            yield from fields(name, column)
+
+    return _select(everything(), paths)
+
+
+def _paths(configuration: AbstractGatingConfiguration) -> Optional[FrozenSet[str]]:
+    projection = cached_projection(configuration)
+    return projection.paths if projection.complete else None
+
+
+def check_dataframe(
+    configuration: AbstractGatingConfiguration,
+    frame: Any,
+    exception_callback: Optional[Callable] = None,
+) -> Any:
+    """
+    Checks the configuration for every row of a pandas DataFrame, returning a bool
+    Series with the frame's index.
+    """
+    import pandas as pd
+
+    values = check_configuration_batch(configuration, dataframe_columns(frame, _paths(configuration)), exception_callback)
+    return pd.Series(values, index=frame.index, dtype=bool)
+
+
+def check_arrow(
+    configuration: AbstractGatingConfiguration,
+    table: Any,
+    exception_callback: Optional[Callable] = None,
+) -> Any:
+    """
+    Checks the configuration for every row of a pyarrow Table or RecordBatch,
+    returning a numpy bool mask.
+    """
+    return check_configuration_batch(configuration, arrow_columns(table, _paths(configuration)), exception_callback)
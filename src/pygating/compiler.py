@@ -0,0 +1,108 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class, _hook_applies
+
+
+class CompiledGatingConfiguration:
+    """
+    A gating configuration compiled into a single generated python function.
+    Exposes the same check(entity, exception_callback) signature as the
+    configuration it was compiled from, so it can be passed to PyGating.check_gating.
+    The configuration tree is snapshotted at compile time.
+    """
+
+    def __init__(self, configuration: AbstractGatingConfiguration, function: Callable, source: str):
+        self.configuration = configuration
+        self.fail_closed = configuration.fail_closed
+        self.source = source
+        self.check = function
+
+    def __call__(self, entity: Optional[Any] = None, exception_callback: Optional[Callable] = None) -> bool:
+        return self.check(entity, exception_callback)
+
+
+class GatingCompiler:
+    """
+    Turns a gating configuration tree into generated python source. Gates and
+    configurations take part through their _compile hook, which returns a python
+    expression over the local name `entity`. Objects needed at runtime are bound as
+    closure constants through bind().
+    """
+
+    def __init__(self):
+        self._constants: Dict[str, Any] = {}
+        self._names: Dict[int, str] = {}
+
+    def bind(self, value: Any) -> str:
+        key = id(value)
+        if key not in self._names:
+            name = f"_c{len(self._constants)}"
+            self._names[key] = name
+            self._constants[name] = value
+
+        return self._names[key]
+
+    def allow(self, gate: AbstractGate, expression: str, boolean: bool = True) -> str:
+        """
+        Applies the gate's allow flag to the expression of its _check_gate result.
+        Expressions that are not guaranteed to be a bool are compared with allow exactly
+        as AbstractGate.check does.
+        """
+        if not boolean:
+            return f"(True if {expression} == {gate.allow!r} else False)"
+
+        if gate.allow is True:
+            return expression
+
+        if gate.allow is False:
+            return f"(not {expression})"
+
+        return f"(True if {expression} == {gate.allow!r} else False)"
+
+    def compile_gate(self, gate: AbstractGate) -> str:
+        if _hook_applies(gate, "_compile", ["check", "_check_gate"]):
+            return gate._compile(self)
+
+        if _defining_class(type(gate), "check") is AbstractGate:
+            return AbstractGate._compile(gate, self)
+
+        return f"(True if {self.bind(gate.check)}(entity) else False)"
+
+    def compile_gates(self, gates: List[AbstractGate], operator: str, empty: str) -> str:
+        if not gates:
+            return empty
+
+        return "(" + f" {operator} ".join(self.compile_gate(gate) for gate in gates) + ")"
+
+    def compile_configuration(self, configuration: AbstractGatingConfiguration) -> CompiledGatingConfiguration:
+        if _defining_class(type(configuration), "check") is not AbstractGatingConfiguration:
+            # check itself was overridden, nothing can be inlined
+            return CompiledGatingConfiguration(configuration, configuration.check, "")
+
+        if _hook_applies(configuration, "_compile", ["_check_gating"]):
+            expression = configuration._compile(self)
+        else:
+            expression = AbstractGatingConfiguration._compile(configuration, self)
+
+        fail_result = False if configuration.fail_closed else True
+        constants = list(self._constants)
+        body = "\n".join(
+            [
+                f"def _make({', '.join(constants)}):",
+                "    def compiled_check(entity=None, exception_callback=None):",
+                "        try:",
+                f"            return {expression}",
+                "        except Exception as e:",
+                "            if exception_callback:",
+                "                exception_callback(e)",
+                f"            return {fail_result!r}",
+                "    return compiled_check",
+                "",
+            ]
+        )
+
+        namespace: Dict[str, Any] = {}
+        exec(compile(body, "<pygating-compiled>", "exec"), namespace)
+        function = namespace["_make"](*self._constants.values())
+
+        return CompiledGatingConfiguration(configuration, function, body)
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+ConfigurationCacheInfo = namedtuple(
+    "ConfigurationCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+def _canonical_default(value: Any) -> Any:
+    # Datetimes are accepted by the date gates in json configs, so give them a stable form
+    if isinstance(value, (datetime, date)):
+        return {"__datetime__": value.isoformat()}
+
+    raise TypeError(f"Object of type {type(value).__name__} cannot be used in a cache key")
+
+
+def configuration_content_key(gate_configuration_json: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Returns a digest of the canonical json form of a gating configuration, or None
+    when the configuration holds values that cannot be serialized deterministically
+    """
+    try:
+        canonical = json.dumps(
+            gate_configuration_json,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=_canonical_default,
+        )
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+
+class GatingConfigurationCache:
+    """
+    Bounded LRU cache of parsed gating configurations keyed by the content hash of
+    their json. Identical dicts resolve to the same parsed configuration object.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 0:
+            raise ValueError("maxsize must be greater than or equal to 0")
+
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_parse(self, gate_configuration_json: Dict[str, Any], parse: Callable[[Dict[str, Any]], Any]) -> Any:
+        if self.maxsize == 0:
+            return parse(gate_configuration_json)
+
+        key = configuration_content_key(gate_configuration_json)
+        if key is None:
+            return parse(gate_configuration_json)
+
+        with self._lock:
+            gating_config = self._entries.get(key)
+            if gating_config is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return gating_config
+            self._misses += 1
+
+        # Parse outside of the lock so a slow parse does not block other lookups
+        gating_config = parse(gate_configuration_json)
+
+        with self._lock:
+            self._entries[key] = gating_config
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return gating_config
+
+    def cache_info(self) -> ConfigurationCacheInfo:
+        with self._lock:
+            return ConfigurationCacheInfo(
+                self._hits, self._misses, self._evictions, self.maxsize, len(self._entries)
+            )
+
+    def invalidate(self):
+        """
+        Drops every cached configuration while keeping the hit/miss statistics.
+        Used when the gate registries change, since parsing may now resolve differently.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
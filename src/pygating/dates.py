@@ -0,0 +1,46 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Strict ISO-8601 datetimes datetime.fromisoformat parses exactly like dateutil does
+_ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:\d{2})?")
+
+
+def epoch_us(value: Any) -> int:
+    """
+    Returns the microseconds since the unix epoch of a datetime. Naive datetimes
+    are taken as UTC, so naive values keep their order and mix with aware ones.
+    """
+    if not isinstance(value, datetime):
+        raise TypeError(f"Expected a datetime, got: {type(value).__name__}")
+
+    delta = value - (_EPOCH if value.tzinfo is None or value.utcoffset() is None else _EPOCH_UTC)
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_epoch_us(value: int) -> datetime:
+    """
+    Inverse of epoch_us, returns a UTC datetime.
+    """
+    return _EPOCH_UTC + timedelta(microseconds=value)
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Parses a date string with datetime.fromisoformat when it is strict ISO-8601,
+    and with the (much slower) dateutil parser otherwise.
+    """
+    if _ISO_DATETIME.fullmatch(value):
+        try:
+            return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except ValueError:
+            # Out of range fields, or formats older pythons do not accept
+            pass
+
+    # dateutil is slow to import, only non ISO strings need it
+    import dateutil.parser
+
+    return dateutil.parser.parse(value)
@@ -0,0 +1,322 @@
+from contextvars import ContextVar
+from typing import AbstractSet, Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Union
+
+from .adaptive import _composite_short_circuit, side_effect_free
+from .property_accessor import PropertyAccessor
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class, _hook_applies
+
+_MISSING = object()
+
+# EntityContext whose entity's properties PropertyGatingType.entity_value resolves
+# through it, so gates without a _check_gate_context hook share its resolution too
+active_context: ContextVar[Optional["EntityContext"]] = ContextVar("active_context", default=None)
+
+# How instances of each type are evaluated, see _gate_mode and _configuration_mode
+_gate_modes: Dict[type, bool] = {}
+_configuration_modes: Dict[type, str] = {}
+
+
+def _gate_mode(gate: AbstractGate) -> bool:
+    """
+    Whether the gate's _check_gate_context hook can be trusted.
+    """
+    mode = _gate_modes.get(type(gate))
+    if mode is None:
+        mode = _gate_modes[type(gate)] = _hook_applies(gate, "_check_gate_context", ["check", "_check_gate", "entity_value"])
+
+    return mode
+
+
+def _configuration_mode(configuration: Any) -> str:
+    """
+    "check" when check() itself must be called, "context" when _check_gating_context
+    can be trusted, "gating" otherwise.
+    """
+    mode = _configuration_modes.get(type(configuration))
+    if mode is None:
+        if (
+            not isinstance(configuration, AbstractGatingConfiguration)
+            or _defining_class(type(configuration), "check") is not AbstractGatingConfiguration
+        ):
+            mode = "check"
+        elif _hook_applies(configuration, "_check_gating_context", ["_check_gating"]):
+            mode = "context"
+        else:
+            mode = "gating"
+        _configuration_modes[type(configuration)] = mode
+
+    return mode
+
+
+_OWNER = object()
+_IDENTITY = object()
+
+
+def _identity(value: Any) -> Hashable:
+    # Only the object itself is known to be equal to itself. Keys are computed while
+    # every gate, and so every value, is alive, so ids cannot be reused meanwhile
+    return _IDENTITY, id(value)
+
+
+def _frozen(value: Any, owner: AbstractGate) -> Hashable:
+    # Values that cannot be compared by content (memoryviews, mmaps, ...) are compared by identity
+    if value is owner:
+        return _OWNER
+    if isinstance(value, AbstractGate):
+        return gate_state_key(value)
+    if isinstance(value, PropertyAccessor):
+        # Its resolver caches are filled by evaluations, only the path matters
+        return PropertyAccessor, value.path
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_frozen(item, owner) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_frozen(item, owner) for item in value)
+    if isinstance(value, dict):
+        return type(value), frozenset((_frozen(key, owner), _frozen(item, owner)) for key, item in value.items())
+
+    bound_to = getattr(value, "__self__", None)
+    if bound_to is not None and callable(value) and not isinstance(value, type):
+        # Bound methods, e.g. of the gate itself or of a compiled pattern
+        return type(value), getattr(value, "__func__", value.__name__), _frozen(bound_to, owner)
+    if type(value).__eq__ is object.__eq__ and hasattr(value, "__dict__") and not callable(value):
+        # Helper objects compared by identity (value sets, ...) are compared by their attributes
+        return type(value), frozenset((name, _frozen(item, owner)) for name, item in vars(value).items())
+
+    try:
+        hash(value)
+    except (TypeError, ValueError):
+        # e.g. memoryviews of other formats than bytes raise ValueError
+        return _identity(value)
+
+    # The type tells apart values comparing equal across types, e.g. 1 and True
+    return type(value), value
+
+
+def gate_state_key(gate: AbstractGate) -> Hashable:
+    """
+    Returns a key equal for gates of the same type whose attributes currently hold
+    equal values. Attributes that cannot be compared by content must be the same objects.
+    """
+    return type(gate), frozenset((name, _frozen(value, gate)) for name, value in vars(gate).items())
+
+
+def shared_gate_keys(configurations: Iterable[Any]) -> Dict[int, Hashable]:
+    """
+    Maps id(gate) to a common key for the side effect free gates that appear in
+    the configurations more than once with the same state (see gate_state_key), so
+    an EntityContext evaluates them once. Computed from the gates' current state:
+    gates changed in place afterwards must not be checked with the returned keys.
+    """
+    gates: Dict[int, AbstractGate] = {}
+
+    def collect(gate: AbstractGate):
+        gates[id(gate)] = gate
+        if _composite_short_circuit(gate) is not None:
+            for child in gate.gates:
+                collect(child)
+
+    for configuration in configurations:
+        if isinstance(configuration, AbstractGatingConfiguration):
+            for gate in configuration.gates:
+                collect(gate)
+
+    keys: Dict[int, Hashable] = {}
+    counts: Dict[Hashable, int] = {}
+    for gate_id, gate in gates.items():
+        if not side_effect_free(gate):
+            continue
+        key = keys[gate_id] = gate_state_key(gate)
+        counts[key] = counts.get(key, 0) + 1
+
+    return {gate_id: key for gate_id, key in keys.items() if counts[key] > 1}
+
+
+class _Raised:
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+class EntityContext:
+    """
+    Evaluation state of a single entity shared by every flag checked for it. Each
+    distinct entity_property path is resolved once, percentage buckets are hashed
+    once per (hash mode, property, salt), and side effect free gates are evaluated
+    once, including the distinct gates shared_keys (see shared_gate_keys) maps to
+    a common key. Exceptions are memoized like results, so every gate depending
+    on them raises exactly as it would have on its own.
+
+    Gates take part through their _check_gate_context hook, gates whose hook cannot
+    be trusted are checked against the entity as usual.
+    """
+
+    def __init__(self, entity: Optional[Any] = None, shared_keys: Optional[Mapping[int, Hashable]] = None):
+        self.entity = entity
+        self.shared_keys = shared_keys
+        self._values: Dict[Optional[str], Any] = {}
+        self._memo: Dict[Hashable, Any] = {}
+        self._results: Dict[Hashable, Any] = {}
+        self._prefixes: Dict[str, Any] = {}
+
+    def entity_value(self, gate: AbstractGate) -> Any:
+        """
+        Equivalent of gate.entity_value(entity), resolving each property path once.
+        """
+        accessor = gate._property_accessor
+        if not self.entity or not accessor.valid:
+            return gate.entity_value(self.entity)
+
+        return gate._typed_value(self.property_value(accessor))
+
+    def property_value(self, accessor: PropertyAccessor) -> Any:
+        """
+        Returns accessor.resolve(entity), resolved once per path. The entity must be truthy.
+        """
+        value = self._values.get(accessor.path, _MISSING)
+        if value is _MISSING:
+            value = self._values[accessor.path] = self._resolve_path(accessor)
+
+        if type(value) is _Raised:
+            raise value.exception
+
+        return value
+
+    def _resolve_path(self, accessor: PropertyAccessor) -> Any:
+        """
+        Returns the value of the accessor's path, or a _Raised.
+        """
+        try:
+            return accessor.resolve(self.entity)
+        except Exception as e:
+            return _Raised(e)
+
+    def _resolve_segments(self, accessor: PropertyAccessor) -> Any:
+        """
+        _resolve_path for subclasses resolving some segments differently: walks the
+        path through _resolve_segment, memoizing the value of every path prefix.
+        """
+        if not accessor.valid:
+            return EntityContext._resolve_path(self, accessor)
+
+        value = self.entity
+        prefix = None
+        for index, segment in enumerate(accessor.segments):
+            prefix = segment if prefix is None else f"{prefix}.{segment}"
+            resolved = self._prefixes.get(prefix, _MISSING)
+            if resolved is _MISSING:
+                resolved = self._prefixes[prefix] = self._resolve_segment(prefix, accessor, index, value)
+
+            if type(resolved) is _Raised:
+                return resolved
+            value = resolved
+
+        return value
+
+    def _resolve_segment(self, prefix: str, accessor: PropertyAccessor, index: int, value: Any) -> Any:
+        """
+        Returns the value of the path prefix ending at segment index of value, or a _Raised.
+        """
+        try:
+            return accessor.resolve_segment(index, value)
+        except Exception as e:
+            return _Raised(e)
+
+    def memoize(self, key: Hashable, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Returns function(*args), computed only the first time key is seen for this entity.
+        """
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._memo[key] = function(*args)
+
+        return value
+
+    def check(self, gate: AbstractGate) -> bool:
+        """
+        Equivalent of gate.check(entity).
+        """
+        key = id(gate)
+        if self.shared_keys:
+            key = self.shared_keys.get(key, key)
+        result = self._results.get(key)
+        if result is not None:
+            if type(result) is _Raised:
+                raise result.exception
+            return result
+
+        # Gates with side effects must run every time they are checked
+        shared = side_effect_free(gate)
+        try:
+            if _gate_mode(gate):
+                result = gate._check_gate_context(self) == gate.allow
+            else:
+                result = gate.check(self.entity)
+        except Exception as e:
+            if shared:
+                self._results[key] = _Raised(e)
+            raise
+
+        if shared:
+            self._results[key] = result
+
+        return result
+
+    def check_configuration(self, configuration: Any, exception_callback: Optional[Callable] = None) -> bool:
+        """
+        Equivalent of configuration.check(entity, exception_callback).
+        """
+        mode = _configuration_mode(configuration)
+        if mode == "check":
+            return configuration.check(self.entity, exception_callback=exception_callback)
+
+        try:
+            if mode == "context":
+                return configuration._check_gating_context(self)
+            return configuration._check_gating(entity=self.entity)
+        except Exception as e:
+            if exception_callback:
+                exception_callback(e)
+
+            return not configuration.fail_closed
+
+
+def evaluate_all(
+    configurations: Mapping[str, Any],
+    entity: Optional[Any] = None,
+    exception_callback: Optional[Callable] = None,
+    as_bitset: bool = False,
+    index: Optional[Any] = None,
+    shared_keys: Optional[Mapping[int, Hashable]] = None,
+) -> Union[Dict[str, bool], int]:
+    """
+    Checks every name -> gating configuration for the same entity through one
+    EntityContext. Returns name -> result, or with as_bitset an int whose bit i is
+    set when the i-th configuration (in iteration order) passed.
+
+    index is a FlagIndex built over (at least) the same configurations. Flags it
+    rules out are not evaluated, unless an exception_callback needs their errors.
+    shared_keys lets identical gates share their results, see shared_gate_keys.
+    """
+    context = EntityContext(entity, shared_keys)
+
+    indexed: AbstractSet[str] = frozenset()
+    candidates: AbstractSet[str] = frozenset()
+    if index is not None and exception_callback is None:
+        indexed = index.indexed
+        candidates = index.candidates(context)
+
+    def check(name: str, configuration: Any) -> bool:
+        if name in indexed and name not in candidates:
+            return False
+        return context.check_configuration(configuration, exception_callback)
+
+    if not as_bitset:
+        return {name: check(name, configuration) for name, configuration in configurations.items()}
+
+    bits = 0
+    for position, (name, configuration) in enumerate(configurations.items()):
+        if check(name, configuration):
+            bits |= 1 << position
+
+    return bits
@@ -0,0 +1,118 @@
+from typing import Any, Dict, FrozenSet, Hashable, List, Mapping, Optional, Set, Tuple
+
+from .adaptive import _composite_short_circuit, side_effect_free
+from .property_accessor import PropertyAccessor
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class
+from .value_set import ValueSet
+
+
+def _required_inclusions(gates: List[AbstractGate]) -> List[Tuple[str, ValueSet]]:
+    """
+    Returns (entity_property, valid values) of the InclusionGates every gate of an
+    all() must pass, looking into nested AndGates with allow=True.
+    """
+    from .gates import InclusionGate
+
+    inclusions = []
+    for gate in gates:
+        if _composite_short_circuit(gate) is False and gate.allow is True:
+            inclusions.extend(_required_inclusions(gate.gates))
+        elif (
+            type(gate) is InclusionGate
+            and gate.allow is True
+            and gate.property_type is None
+            and gate._property_accessor.valid
+            and not gate._valid_value_set.unhashable
+        ):
+            inclusions.append((gate.entity_property, gate._valid_value_set))
+
+    return inclusions
+
+
+def _indexable_inclusion(configuration: Any) -> Optional[Tuple[str, ValueSet]]:
+    """
+    Returns the most selective InclusionGate a configuration cannot pass without,
+    or None when it has none or skipping its evaluation could be observed.
+    """
+    from .gating_configurations import GatingConfigurationAll
+
+    if not isinstance(configuration, GatingConfigurationAll):
+        return None
+    cls = type(configuration)
+    if (
+        _defining_class(cls, "check") is not AbstractGatingConfiguration
+        or _defining_class(cls, "_check_gating") is not GatingConfigurationAll
+    ):
+        return None
+
+    # An error anywhere fails a fail closed configuration, and side effects must not be skipped
+    if not configuration.fail_closed or not all(side_effect_free(gate) for gate in configuration.gates):
+        return None
+
+    inclusions = _required_inclusions(configuration.gates)
+    if not inclusions:
+        return None
+
+    return min(inclusions, key=lambda inclusion: len(inclusion[1].hashed))
+
+
+class FlagIndex:
+    """
+    Inverted index over the InclusionGates of a set of flags: for each entity_property
+    path, maps every valid value to the flags whose inclusion it satisfies. A flag is
+    indexed when it is a fail closed, side effect free GatingConfigurationAll with
+    an InclusionGate it cannot pass without, so for a given entity only the indexed
+    flags listed under the entity's values can pass.
+    """
+
+    def __init__(self, configurations: Mapping[str, Any]):
+        self.paths: Dict[str, Tuple[PropertyAccessor, Dict[Hashable, Set[str]]]] = {}
+        indexed = set()
+        for name, configuration in configurations.items():
+            inclusion = _indexable_inclusion(configuration)
+            if inclusion is None:
+                continue
+
+            path, values = inclusion
+            if path not in self.paths:
+                self.paths[path] = (PropertyAccessor(path), {})
+            flags_by_value = self.paths[path][1]
+            for value in values.hashed:
+                flags_by_value.setdefault(value, set()).add(name)
+            indexed.add(name)
+
+        self.indexed: FrozenSet[str] = frozenset(indexed)
+        # Flags listed under each path, candidates whenever the entity's value cannot be looked up
+        self._path_flags = {
+            path: frozenset().union(*flags_by_value.values()) for path, (_, flags_by_value) in self.paths.items()
+        }
+
+    def candidates(self, context: Any) -> Set[str]:
+        """
+        Returns the indexed flags that may pass for context.entity (an EntityContext).
+        """
+        candidates: Set[str] = set()
+        if not context.entity:
+            # Inclusion gates raise without an entity
+            return candidates
+
+        for path, (accessor, flags_by_value) in self.paths.items():
+            try:
+                value = context.property_value(accessor)
+            except Exception:
+                # The inclusion gate raises too
+                continue
+
+            try:
+                flags = flags_by_value.get(value)
+            except TypeError:
+                # Unhashable values are only matched by evaluating the flags
+                flags = self._path_flags[path]
+
+            if flags:
+                candidates.update(flags)
+
+        return candidates
+
+    def __len__(self) -> int:
+        return len(self.indexed)
@@ -0,0 +1,305 @@
+import itertools
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Mapping, NamedTuple, Optional, Union
+
+from .configuration_cache import configuration_content_key
+
+_MISSING = object()
+# Marks the pure flags whose results are not constant between time boundaries of the global clock
+_VARYING = object()
+
+
+class FlagEntry(NamedTuple):
+    name: str
+    configuration: Any
+    # Unique across the store's lifetime, it changes whenever the flag's configuration does
+    version: int
+    # Content key of the json the flag was parsed from, None for configuration objects
+    content_key: Optional[bytes]
+    # Whether check results only depend on the entity, see pygating.result_cache.is_pure_configuration
+    pure: bool = False
+
+
+class FlagSnapshot(Mapping):
+    """
+    An immutable set of flags, name -> FlagEntry. Holding on to a snapshot for the
+    duration of a request guarantees every check sees the same flag versions.
+    """
+
+    def __init__(self, entries: Dict[str, FlagEntry], generation: int, result_cache: Optional[Any] = None):
+        self._entries = MappingProxyType(entries)
+        self.generation = generation
+        self.result_cache = result_cache
+        self._index = None
+        self._shared_keys: Optional[Dict[int, Hashable]] = None
+        self._configurations: Optional[Dict[str, Any]] = None
+        # name -> (valid from, valid until or None, result) of pure flags checked without an entity, or _VARYING
+        self._constants: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> FlagEntry:
+        return self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configuration(self, name: str) -> Any:
+        entry = self._entries.get(name)
+        return entry.configuration if entry is not None else None
+
+    def check(
+        self,
+        name: str,
+        entity: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None,
+        default: Any = _MISSING,
+        entity_key: Optional[Hashable] = None,
+    ) -> bool:
+        entry = self._entries.get(name)
+        if entry is None:
+            if default is _MISSING:
+                from .pygating import GatingException
+
+                raise GatingException(f"Could not find flag named {name}")
+            return default
+
+        if entity is None and entry.pure:
+            return self._check_constant(entry, exception_callback)
+
+        if self.result_cache is not None:
+            return self.result_cache.check(entry, entity, exception_callback, entity_key)
+
+        return entry.configuration.check(entity=entity, exception_callback=exception_callback)
+
+    def _check_constant(self, entry: FlagEntry, exception_callback: Optional[Callable]) -> bool:
+        """
+        Without an entity a pure flag's result only changes when the current time
+        crosses one of its dates, so it is served as a constant until its next time boundary.
+        Flags with gates reading their own clock are evaluated on every check.
+        """
+        from .clock import get_clock, has_own_clock
+
+        cached = self._constants.get(entry.name)
+        if cached is None and has_own_clock(entry.configuration.gates):
+            cached = self._constants[entry.name] = _VARYING
+        if cached is _VARYING:
+            return entry.configuration.check(entity=None, exception_callback=exception_callback)
+
+        now = get_clock().now()
+        if cached is not None:
+            valid_from, valid_until, result = cached
+            try:
+                if valid_from <= now and (valid_until is None or now < valid_until):
+                    return result
+            except TypeError:
+                # The clock switched between naive and timezone aware datetimes
+                del self._constants[entry.name]
+
+        errors = []
+
+        def record(exception: Exception):
+            errors.append(exception)
+            if exception_callback:
+                exception_callback(exception)
+
+        result = entry.configuration.check(entity=None, exception_callback=record)
+        if not errors:
+            try:
+                self._constants[entry.name] = (now, entry.configuration.next_time_boundary(now), result)
+            except Exception:
+                # e.g. timezone aware dates compared with a naive clock, simply not cached
+                pass
+
+        return result
+
+    @property
+    def index(self) -> Any:
+        """
+        FlagIndex over the snapshot's flags, built on first use.
+        """
+        if self._index is None:
+            from .flag_index import FlagIndex
+
+            self._index = FlagIndex({name: entry.configuration for name, entry in self._entries.items()})
+
+        return self._index
+
+    @property
+    def shared_keys(self) -> Dict[int, Hashable]:
+        """
+        pygating.evaluation.shared_gate_keys over the snapshot's flags, built on first use.
+        """
+        if self._shared_keys is None:
+            from .evaluation import shared_gate_keys
+
+            self._shared_keys = shared_gate_keys(entry.configuration for entry in self._entries.values())
+
+        return self._shared_keys
+
+    def required_properties(self, names: Optional[Iterable[str]] = None) -> Any:
+        """
+        Returns the merged pygating.projection.Projection of the named flags, or of every flag.
+        """
+        from .projection import merge_projections, required_properties
+
+        if names is None:
+            names = self._entries
+        configurations = []
+        for name in names:
+            entry = self._entries.get(name)
+            if entry is None:
+                from .pygating import GatingException
+
+                raise GatingException(f"Could not find flag named {name}")
+            configurations.append(entry.configuration)
+
+        return merge_projections(required_properties(configuration) for configuration in configurations)
+
+    def evaluate_all(
+        self,
+        entity: Optional[Any] = None,
+        names: Optional[Iterable[str]] = None,
+        exception_callback: Optional[Callable] = None,
+        as_bitset: bool = False,
+    ) -> Union[Dict[str, bool], int]:
+        """
+        Checks the named flags, or every flag in sorted name order, for one entity in
+        a single pass (see pygating.evaluation.evaluate_all). Unknown names raise a GatingException.
+        Flags the snapshot's index rules out for the entity are not evaluated, and
+        identical gates of different flags are evaluated once.
+        """
+        from .evaluation import evaluate_all
+
+        if names is None:
+            if self._configurations is None:
+                self._configurations = {name: self._entries[name].configuration for name in sorted(self._entries)}
+            configurations = self._configurations
+        else:
+            configurations = {}
+            for name in names:
+                entry = self._entries.get(name)
+                if entry is None:
+                    from .pygating import GatingException
+
+                    raise GatingException(f"Could not find flag named {name}")
+                configurations[name] = entry.configuration
+
+        return evaluate_all(
+            configurations, entity, exception_callback, as_bitset, index=self.index, shared_keys=self.shared_keys
+        )
+
+
+class FlagStore:
+    """
+    Named gating configurations with lock free reads. Every load or update parses
+    the new configurations first, then publishes a complete new FlagSnapshot with
+    a single reference assignment (copy-on-write), so readers never block and
+    never observe a partially applied change. Writers are serialized by a lock.
+
+    Flags whose json did not change keep their parsed configuration and version.
+    """
+
+    def __init__(self, parse: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self._parse = parse
+        self._write_lock = threading.Lock()
+        self._versions = itertools.count(1)
+        self.result_cache: Optional[Any] = None
+        self._snapshot = FlagSnapshot({}, 0)
+
+    def snapshot(self) -> FlagSnapshot:
+        return self._snapshot
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def get(self, name: str) -> Any:
+        return self._snapshot.configuration(name)
+
+    def check(
+        self,
+        name: str,
+        entity: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None,
+        default: Any = _MISSING,
+        entity_key: Optional[Hashable] = None,
+    ) -> bool:
+        return self._snapshot.check(name, entity, exception_callback, default, entity_key)
+
+    def set_result_cache(self, result_cache: Optional[Any]) -> FlagSnapshot:
+        """
+        Checks flags through result_cache (a pygating.result_cache.ResultCache), or without a cache for None.
+        """
+        with self._write_lock:
+            self.result_cache = result_cache
+            return self._publish(dict(self._snapshot._entries))
+
+    def _parse_configuration(self, configuration: Any) -> Any:
+        if isinstance(configuration, dict):
+            # pygating.pygating holds the store, import it lazily
+            from .pygating import PyGating
+
+            parse = self._parse or PyGating._parse_gate_configuration_from_json
+            return parse(configuration)
+
+        if not callable(getattr(configuration, "check", None)):
+            raise ValueError(f"Flags must be json dicts or gating configurations, got: {type(configuration).__name__}")
+
+        return configuration
+
+    def _entry(self, name: str, configuration: Any, current: Optional[FlagEntry]) -> FlagEntry:
+        if not isinstance(name, str):
+            raise ValueError(f"Flag names must be str, got: {name!r}")
+
+        content_key = configuration_content_key(configuration) if isinstance(configuration, dict) else None
+        if current is not None:
+            if content_key is not None and content_key == current.content_key:
+                return current
+            if content_key is None and configuration is current.configuration:
+                return current
+
+        from .result_cache import is_pure_configuration
+
+        parsed = self._parse_configuration(configuration)
+        return FlagEntry(name, parsed, next(self._versions), content_key, is_pure_configuration(parsed))
+
+    def _publish(self, entries: Dict[str, FlagEntry]) -> FlagSnapshot:
+        snapshot = FlagSnapshot(entries, self._snapshot.generation + 1, self.result_cache)
+        self._snapshot = snapshot
+        return snapshot
+
+    def load(self, flags: Mapping[str, Any]) -> FlagSnapshot:
+        """
+        Replaces every flag with the given name -> json dict or configuration bundle.
+        Nothing is published if any configuration fails to parse.
+        """
+        with self._write_lock:
+            current = self._snapshot
+            entries = {name: self._entry(name, configuration, current.get(name)) for name, configuration in flags.items()}
+            return self._publish(entries)
+
+    def update(self, flags: Mapping[str, Any], removed: Iterable[str] = ()) -> FlagSnapshot:
+        """
+        Adds or replaces the given flags and removes the removed names, keeping every other flag.
+        """
+        with self._write_lock:
+            current = self._snapshot
+            entries = dict(current._entries)
+            for name, configuration in flags.items():
+                entries[name] = self._entry(name, configuration, current.get(name))
+            for name in removed:
+                entries.pop(name, None)
+            return self._publish(entries)
+
+    def clear(self) -> FlagSnapshot:
+        with self._write_lock:
+            return self._publish({})
@@ -1,12 +1,49 @@
-from .and_gate import AndGate
-from .boolean_gate import BooleanGate
-from .custom_script_gate import CustomScriptGate
-from .date_gate import DateGate
-from .inclusion_gate import InclusionGate
-from .or_gate import OrGate
-from .percentage_gate import PercentageGate
-from .property_gating_type import PropertyGatingType
-from .random_gate import RandomGate
-from .regex_gate import RegexGate
-from .simple_gate import SimpleGate
-from .list_container_gate import ListContainertGate
\ No newline at end of file
+# Gate modules are imported on first access, so importing one gate does not import them all
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+_GATE_MODULES = {
+    "AndGate": ".and_gate",
+    "BooleanGate": ".boolean_gate",
+    "CustomScriptGate": ".custom_script_gate",
+    "DateGate": ".date_gate",
+    "IdFileGate": ".id_file_gate",
+    "InclusionGate": ".inclusion_gate",
+    "OrGate": ".or_gate",
+    "PercentageGate": ".percentage_gate",
+    "PropertyGatingType": ".property_gating_type",
+    "RandomGate": ".random_gate",
+    "RegexGate": ".regex_gate",
+    "SimpleGate": ".simple_gate",
+    "ListContainertGate": ".list_container_gate",
+}
+
+__all__ = list(_GATE_MODULES)
+
+if TYPE_CHECKING:
+    from .and_gate import AndGate
+    from .boolean_gate import BooleanGate
+    from .custom_script_gate import CustomScriptGate
+    from .date_gate import DateGate
+    from .id_file_gate import IdFileGate
+    from .inclusion_gate import InclusionGate
+    from .or_gate import OrGate
+    from .percentage_gate import PercentageGate
+    from .property_gating_type import PropertyGatingType
+    from .random_gate import RandomGate
+    from .regex_gate import RegexGate
+    from .simple_gate import SimpleGate
+    from .list_container_gate import ListContainertGate
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _GATE_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_GATE_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,8 +1,13 @@
+from datetime import datetime
 from typing import Any,  Optional, List, Dict
+from ..clock import next_time_boundary
 from ..pygating import AbstractGate, GatingException
 
 
 class AndGate(AbstractGate):
+    side_effect_free = True
+    pure = True
+
     def __init__(self, gates: List[AbstractGate], allow: bool = True):
         super().__init__(allow=allow)
         if not gates:
@@ -15,6 +20,18 @@ class AndGate(AbstractGate):
 
     def _check_gate(self, entity: Optional[Any] = None) -> bool:
         return all(gate.check(entity) for gate in self.gates)
+
+    def _check_gate_context(self, context) -> bool:
+        return all(context.check(gate) for gate in self.gates)
+
+    def _next_time_boundary(self, now: datetime) -> Optional[datetime]:
+        return next_time_boundary(self.gates, now)
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(self, compiler.compile_gates(self.gates, "and", "True"))
+
+    def _check_gate_batch(self, batch, mask):
+        return batch.combine(self.gates, mask, short_circuit=False)
     
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
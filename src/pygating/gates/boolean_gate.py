@@ -1,9 +1,13 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
 from .property_gating_type import PropertyGatingType
 
 
 class BooleanGate(PropertyGatingType):
+    side_effect_free = True
+    pure = True
+    static_cost = 1.0
+
     def __init__(self, entity_property: Optional[str] = None, allow: bool = True):
         super().__init__(
             property_type=bool, entity_property=entity_property, allow=allow
@@ -12,6 +16,26 @@ class BooleanGate(PropertyGatingType):
     def _check_gate(self, entity: Any) -> bool:
         return self.entity_value(entity)
 
+    def _check_gate_context(self, context) -> bool:
+        return context.entity_value(self)
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        # entity_value already guarantees a bool
+        return compiler.allow(self, f"{compiler.bind(self.entity_value)}(entity)")
+
+    def _check_gate_batch(self, batch, mask):
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        if column.dtype.kind != "b":
+            return batch.zeros(), errors
+
+        return column, errors
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
@@ -1,5 +1,5 @@
 import operator
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
 from .property_gating_type import PropertyGatingType
 
@@ -12,8 +12,21 @@ COMPARISON_OPERATORS = {
     "ne": operator.ne,
 }
 
+COMPARISON_SYMBOLS = {
+    operator.eq: "==",
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.gt: ">",
+    operator.ge: ">=",
+    operator.ne: "!=",
+}
+
 
 class ComparisonGate(PropertyGatingType):
+    side_effect_free = True
+    pure = True
+    static_cost = 1.0
+
     def __init__(
         self,
         comparison_operator: str,
@@ -36,6 +49,48 @@ class ComparisonGate(PropertyGatingType):
         value = self.entity_value(entity)
         return self.comparison_function(value, self.comparison_value)
 
+    def _check_gate_context(self, context) -> bool:
+        return self.comparison_function(context.entity_value(self), self.comparison_value)
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        # Rich comparisons may return non-bool objects, so allow is applied with ==
+        operator_symbol = COMPARISON_SYMBOLS.get(self.comparison_function)
+        value = f"{compiler.bind(self.entity_value)}(entity)"
+        comparison_value = compiler.bind(self.comparison_value)
+        if operator_symbol:
+            expression = f"({value} {operator_symbol} {comparison_value})"
+        else:
+            expression = f"{compiler.bind(self.comparison_function)}({value}, {comparison_value})"
+
+        return compiler.allow(self, expression, boolean=False)
+
+    def _check_gate_batch(self, batch, mask):
+        from ..batch import NUMERIC_KINDS, datetime64, exact_numeric
+
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        if errors.all():
+            return batch.zeros(), errors
+
+        # Only vectorise comparisons numpy evaluates exactly like python does
+        kind = column.dtype.kind
+        comparison_value = self.comparison_value
+        if kind in NUMERIC_KINDS and exact_numeric(column, comparison_value):
+            pass
+        elif kind == "U" and isinstance(comparison_value, str):
+            pass
+        elif kind == "M" and datetime64(comparison_value) is not None:
+            comparison_value = datetime64(comparison_value)
+        else:
+            return NotImplemented
+
+        return self.comparison_function(column, comparison_value), errors
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
@@ -2,12 +2,26 @@ from typing import Any,  Optional, Callable, Dict
 from ..pygating import AbstractGate
 
 class CustomScriptGate(AbstractGate):
-    def __init__(self, script_function: Callable[[Any], bool], allow: bool = True):
+    # Scripts may have side effects, they always run in declaration order unless pure
+    side_effect_free = False
+    # Scripts are only cached when created with pure=True
+    pure = False
+    static_cost = 10.0
+
+    def __init__(self, script_function: Callable[[Any], bool], allow: bool = True, pure: bool = False):
+        """
+        script_function may be a coroutine function when checked with PyGating.check_gating_async.
+        """
         super().__init__(allow=allow)
         self.script_function = script_function
+        self.pure = pure
+        self.side_effect_free = pure
 
     def _check_gate(self, entity: Optional[Any] = None) -> bool:
         return self.script_function(entity)
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(self, f"{compiler.bind(self.script_function)}(entity)", boolean=False)
     
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
@@ -1,12 +1,15 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
-from dateutil.parser import parse as parse_date
-
-from .comparison_gate import ComparisonGate
+from ..dates import epoch_us, parse_datetime
+from .comparison_gate import COMPARISON_SYMBOLS, ComparisonGate
 
 
 class DateComparisonGate(ComparisonGate):
+    # Dates are compared as microseconds since the unix epoch, naive datetimes being taken as UTC
+    side_effect_free = True
+    pure = True
+
     def __init__(
         self,
         comparison_operator: str,
@@ -22,6 +25,44 @@ class DateComparisonGate(ComparisonGate):
             allow=allow,
         )
 
+    @property
+    def comparison_value(self) -> datetime:
+        return self._comparison_value
+
+    @comparison_value.setter
+    def comparison_value(self, comparison_value: datetime):
+        if not isinstance(comparison_value, datetime):
+            raise ValueError(f"'comparison_value' must be a datetime: {comparison_value}")
+
+        self._comparison_us = epoch_us(comparison_value)
+        self._comparison_value = comparison_value
+
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        return self.comparison_function(epoch_us(self.entity_value(entity)), self._comparison_us)
+
+    def _check_gate_context(self, context) -> bool:
+        return self.comparison_function(epoch_us(context.entity_value(self)), self._comparison_us)
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        value = f"{compiler.bind(epoch_us)}({compiler.bind(self.entity_value)}(entity))"
+        return compiler.allow(self, f"({value} {COMPARISON_SYMBOLS[self.comparison_function]} {self._comparison_us!r})")
+
+    def _check_gate_batch(self, batch, mask):
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        if errors.all():
+            return batch.zeros(), errors
+        if column.dtype.kind != "M":
+            return NotImplemented
+
+        # Batch datetimes are naive datetime64[us], their integers are epoch_us of the row values
+        return self.comparison_function(column.view("int64"), self._comparison_us), errors
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
@@ -29,7 +70,7 @@ class DateComparisonGate(ComparisonGate):
         comparison_value = gate_json.get("comparison_value")
         if comparison_value:
             if isinstance(comparison_value, str):
-                comparison_value = parse_date(comparison_value)
+                comparison_value = parse_datetime(comparison_value)
             elif not isinstance(comparison_value, datetime):
                 raise ValueError(
                     f"'comparison_value' must be a datetime: {comparison_value}"
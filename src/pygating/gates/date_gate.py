@@ -1,47 +1,148 @@
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-import dateutil.parser
+from typing import Any, Dict, FrozenSet, Optional
 
+from ..clock import Clock, get_clock
+from ..dates import epoch_us, from_epoch_us, parse_datetime
 from .property_gating_type import PropertyGatingType
 
 
 class DateGate(PropertyGatingType):
+    """
+    Open between start_date and end_date (inclusive), for the entity's date or the
+    current time without an entity. Bounds are compared as microseconds since the
+    unix epoch, naive datetimes being taken as UTC, except for the current time of
+    naive clocks (datetime.now() is local time) against timezone aware bounds.
+    """
+
+    side_effect_free = True
+    # Only compared with "now" without an entity, and results are never cached without one
+    pure = True
+    static_cost = 2.0
+
     def __init__(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         entity_property: Optional[str] = None,
         allow: bool = True,
+        clock: Optional[Clock] = None,
     ):
         super().__init__(
             property_type=datetime, entity_property=entity_property, allow=allow
         )
+        self._start_date: Optional[datetime] = None
+        self._end_date: Optional[datetime] = None
         self.start_date = start_date
         self.end_date = end_date
+        # Compared against without an entity, the global clock (pygating.clock.get_clock()) when None
+        self.clock = clock
+
+    @property
+    def start_date(self) -> Optional[datetime]:
+        return self._start_date
+
+    @start_date.setter
+    def start_date(self, start_date: Optional[datetime]):
+        self._start_us = self._bound(start_date, "start_date")
+        self._start_date = start_date
+        self._update_aware()
+
+    @property
+    def end_date(self) -> Optional[datetime]:
+        return self._end_date
+
+    @end_date.setter
+    def end_date(self, end_date: Optional[datetime]):
+        self._end_us = self._bound(end_date, "end_date")
+        self._end_date = end_date
+        self._update_aware()
+
+    @staticmethod
+    def _bound(value: Optional[datetime], name: str) -> Optional[int]:
+        # An undefined bound leaves that side of the range open
+        if value is None:
+            return None
+        if not isinstance(value, datetime):
+            raise ValueError(f"'{name}' must be a datetime: {value}")
+
+        return epoch_us(value)
 
     def _check_gate(self, entity: Optional[Any] = None) -> bool:
-        date_property = self._get_current_datetime()
         if entity:
-            date_property = self.entity_value(entity)
+            return self._in_range(self.entity_value(entity))
+
+        return self._in_range_us(self._now_us(self._get_current_datetime()))
+
+    def _check_gate_context(self, context) -> bool:
+        if not context.entity:
+            return self._in_range_us(self._now_us(self._get_current_datetime()))
+
+        return self._in_range(context.entity_value(self))
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _in_range(self, date_property: datetime) -> bool:
+        return self._in_range_us(epoch_us(date_property))
+
+    def _in_range_us(self, value: int) -> bool:
+        return (self._start_us is None or value >= self._start_us) and (self._end_us is None or value <= self._end_us)
+
+    def _now_us(self, now: datetime) -> int:
+        if now.tzinfo is None and self._aware:
+            # Naive clocks read local time, aware bounds are compared with the actual instant
+            now = now.astimezone()
+
+        return epoch_us(now)
+
+    def _update_aware(self):
+        self._aware = any(bound is not None and bound.tzinfo is not None for bound in (self._start_date, self._end_date))
+
+    def _check_gate_batch(self, batch, mask):
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        if column.dtype.kind != "M":
+            return (batch.zeros(), errors) if errors.all() else NotImplemented
+
+        # Batch datetimes are naive datetime64[us], their integers are epoch_us of the row values
+        values = column.view("int64")
+        if self._start_us is None and self._end_us is None:
+            return batch.ones(), errors
+        if self._start_us is None:
+            return values <= self._end_us, errors
+        if self._end_us is None:
+            return values >= self._start_us, errors
 
-        # If start_date is not defined, assume the gate is always open before end_date
-        if self.start_date is None and self.end_date:
-            return date_property <= self.end_date
+        return (self._start_us <= values) & (values <= self._end_us), errors
 
-        # If end_date is not defined, assume the gate is always open after start_date
-        if self.end_date is None and self.start_date:
-            return date_property >= self.start_date
+    def _next_time_boundary(self, now: datetime) -> Optional[datetime]:
+        now_us = self._now_us(now)
+        # The gate stays open through end_date itself
+        boundaries = [
+            boundary
+            for boundary in (self._start_us, None if self._end_us is None else self._end_us + 1)
+            if boundary is not None and boundary > now_us
+        ]
+        if not boundaries:
+            return None
 
-        # If both dates are defined
-        if self.start_date and self.end_date:
-            return self.start_date <= date_property <= self.end_date
+        try:
+            boundary = from_epoch_us(min(boundaries))
+        except OverflowError:
+            # Past datetime.max
+            return None
 
-        # If neither date is defined, gate is always open
-        return True
+        # Returned in the same form as now
+        if now.tzinfo is not None:
+            return boundary
+        if self._aware:
+            return boundary.astimezone().replace(tzinfo=None)
+        return boundary.replace(tzinfo=None)
 
     def _get_current_datetime(self):
-        return datetime.now()
+        return (self.clock or get_clock()).now()
 
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
@@ -49,21 +150,21 @@ class DateGate(PropertyGatingType):
         start_date = gate_json.get("start_date")
         if start_date:
             if isinstance(start_date, str):
-                start_date = dateutil.parser.parse(start_date)
+                start_date = parse_datetime(start_date)
             elif not isinstance(start_date, datetime):
                 raise ValueError(f"'start_date' must be a datetime: {start_date}")
 
         end_date = gate_json.get("end_date")
         if end_date:
             if isinstance(end_date, str):
-                end_date = dateutil.parser.parse(end_date)
+                end_date = parse_datetime(end_date)
             elif not isinstance(end_date, datetime):
                 raise ValueError(f"'end_date' must be a datetime: {end_date}")
 
         if not start_date and not end_date:
             raise ValueError("Either 'start_date' or 'end_date' must be provided")
 
-        params["start_date"] = start_date
-        params["end_date"] = end_date
+        params["start_date"] = start_date or None
+        params["end_date"] = end_date or None
 
         return params
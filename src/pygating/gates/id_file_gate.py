@@ -0,0 +1,69 @@
+from typing import Any, Dict, FrozenSet, Optional
+
+from ..id_file import open_id_file
+from .property_gating_type import PropertyGatingType
+
+
+class IdFileGate(PropertyGatingType):
+    """
+    Passes entities whose id is listed in an id file built with
+    pygating.id_file.build_id_file. The file is memory-mapped and shared by every
+    gate and process using it, so multi-million entry allowlists stay out of the
+    gating configuration. Ids are non negative integers or decimal strings.
+    """
+
+    side_effect_free = True
+    pure = True
+    static_cost = 2.0
+
+    def __init__(self, path: str, entity_property: Optional[str] = None, allow: bool = True):
+        super().__init__(
+            property_type=(int, str), entity_property=entity_property, allow=allow
+        )
+        self.path = path
+        self.id_file = open_id_file(path)
+
+    def _check_gate(self, entity: Any) -> bool:
+        return self.entity_value(entity) in self.id_file
+
+    def _check_gate_context(self, context) -> bool:
+        return context.entity_value(self) in self.id_file
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(
+            self, f"({compiler.bind(self.entity_value)}(entity) in {compiler.bind(self.id_file)})"
+        )
+
+    def _check_gate_batch(self, batch, mask):
+        import numpy as np
+
+        column, errors = self._batch_column(batch)
+        if column is None or column.dtype.kind not in "biu":
+            return NotImplemented
+
+        ids = self.id_file.array()
+        if column.dtype.kind == "b" or not len(ids):
+            # bools are ints but never ids
+            return batch.zeros(), errors
+
+        candidates = column >= 0
+        values = np.where(candidates, column, 0).astype(np.uint64)
+        index = np.searchsorted(ids, values)
+        found = index < len(ids)
+        found[found] = ids[index[found]] == values[found]
+
+        return candidates & found, errors
+
+    @classmethod
+    def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
+        params = super()._parse_json_params(gate_json)
+
+        if "path" not in gate_json or not isinstance(gate_json["path"], str):
+            raise ValueError("'path' field must be provided and be a str")
+
+        params["path"] = gate_json["path"]
+
+        return params
@@ -1,9 +1,14 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
+from ..value_set import ValueSet
 from .property_gating_type import PropertyGatingType
 
 
 class InclusionGate(PropertyGatingType):
+    side_effect_free = True
+    pure = True
+    static_cost = 1.0
+
     def __init__(
         self,
         valid_values: List[Any],
@@ -15,9 +20,60 @@ class InclusionGate(PropertyGatingType):
         )
         self.valid_values = valid_values
 
+    @property
+    def valid_values(self) -> List[Any]:
+        return self._valid_values
+
+    @valid_values.setter
+    def valid_values(self, valid_values: List[Any]):
+        # Membership is hashed once here, reassign valid_values rather than mutating it in place
+        self._valid_values = valid_values
+        self._valid_value_set = ValueSet(valid_values)
+
     def _check_gate(self, entity: Any) -> bool:
         entity_value = self.entity_value(entity)
-        return entity_value in self.valid_values
+        return entity_value in self._valid_value_set
+
+    def _check_gate_context(self, context) -> bool:
+        return context.entity_value(self) in self._valid_value_set
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(
+            self, f"({compiler.bind(self.entity_value)}(entity) in {compiler.bind(self._valid_value_set)})"
+        )
+
+    def _check_gate_batch(self, batch, mask):
+        import numpy as np
+
+        from ..batch import NUMERIC_KINDS, exact_numeric
+
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        # Values of other types can never compare equal to the column values
+        kind = column.dtype.kind
+        if kind in NUMERIC_KINDS:
+            numbers = [value for value in self.valid_values if isinstance(value, (int, float))]
+            # Only vectorise comparisons numpy evaluates exactly like python does
+            if any(isinstance(value, float) if kind in "biu" else isinstance(value, int) for value in numbers):
+                return NotImplemented
+            # Integers outside of the column's range can never be equal to its values
+            candidates = [value for value in numbers if exact_numeric(column, value)]
+            if kind == "f" and len(candidates) != len(numbers):
+                return NotImplemented
+        elif kind == "U":
+            candidates = [value for value in self.valid_values if isinstance(value, str)]
+        else:
+            return NotImplemented
+
+        if not candidates:
+            return batch.zeros(), errors
+
+        return np.isin(column, candidates), errors
 
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
@@ -1,22 +1,80 @@
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, FrozenSet
+from ..value_set import ValueSet
 from .property_gating_type import PropertyGatingType
 
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+MATCH_MODES = (MATCH_ANY, MATCH_ALL)
+
+
 class ListContainertGate(PropertyGatingType):
-    def __init__(self, tag: Any, entity_property: Optional[str] = None, allow: bool = True):
+    side_effect_free = True
+    pure = True
+    static_cost = 2.0
+
+    def __init__(
+        self,
+        tag: Any = None,
+        entity_property: Optional[str] = None,
+        allow: bool = True,
+        tags: Optional[List[Any]] = None,
+        match: str = MATCH_ANY,
+    ):
         super().__init__(property_type=List, entity_property=entity_property, allow=allow)
+        if match not in MATCH_MODES:
+            raise ValueError(f"Invalid match mode: {match}. Must be one of {list(MATCH_MODES)}")
+        if tags is not None and (tag is not None or not tags):
+            raise ValueError("Either a single 'tag' or a non empty 'tags' list must be provided")
+
         self.tag = tag
+        self.tags = ValueSet(tags) if tags is not None else None
+        self.match = match
 
     def _check_gate(self, entity: Any) -> bool:
-        entity_list = self.entity_value(entity)
-        return self.tag in entity_list
+        return self._match(self.entity_value(entity))
+
+    def _check_gate_context(self, context) -> bool:
+        return self._match(context.entity_value(self))
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _match(self, entity_list: List[Any]) -> bool:
+        if self.tags is None:
+            return self.tag in entity_list
+
+        # Multiple tags are matched with set operations instead of a scan per tag
+        if self.match == MATCH_ALL:
+            return self.tags.contained_in(entity_list)
+
+        return self.tags.intersects(entity_list)
+
+    def _compile(self, compiler) -> str:
+        if self.tags is not None:
+            return compiler.allow(self, f"{compiler.bind(self._check_gate)}(entity)")
+
+        return compiler.allow(
+            self, f"({compiler.bind(self.tag)} in {compiler.bind(self.entity_value)}(entity))"
+        )
 
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
         
-        if "tag" not in gate_json:
+        if "tags" in gate_json:
+            if "tag" in gate_json:
+                raise ValueError("Only one of the 'tag' and 'tags' fields can be provided")
+            if not isinstance(gate_json["tags"], list) or not gate_json["tags"]:
+                raise ValueError("The 'tags' field must be a non empty list")
+            params["tags"] = gate_json["tags"]
+        elif "tag" not in gate_json:
             raise ValueError("The 'tag' field must be provided")
-        
-        params["tag"] = gate_json["tag"]
+        else:
+            params["tag"] = gate_json["tag"]
+
+        if "match" in gate_json:
+            if gate_json["match"] not in MATCH_MODES:
+                raise ValueError(f"The 'match' field must be one of {list(MATCH_MODES)}")
+            params["match"] = gate_json["match"]
         
         return params
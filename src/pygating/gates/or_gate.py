@@ -1,8 +1,14 @@
+from datetime import datetime
 from typing import Any,  Optional, List, Dict
+from ..clock import next_time_boundary
 from ..pygating import AbstractGate, GatingException
+from .regex_gate import merge_regex_gates
 
 
 class OrGate(AbstractGate):
+    side_effect_free = True
+    pure = True
+
     def __init__(self, gates: List[AbstractGate], allow: bool = True):
         super().__init__(allow=allow)
         if not gates:
@@ -16,6 +22,19 @@ class OrGate(AbstractGate):
     def _check_gate(self, entity: Optional[Any] = None) -> bool:
         return any(gate.check(entity) for gate in self.gates)
 
+    def _check_gate_context(self, context) -> bool:
+        return any(context.check(gate) for gate in self.gates)
+
+    def _next_time_boundary(self, now: datetime) -> Optional[datetime]:
+        return next_time_boundary(self.gates, now)
+
+    def _compile(self, compiler) -> str:
+        # Sibling regexes on the same property are matched with a single alternation
+        return compiler.allow(self, compiler.compile_gates(merge_regex_gates(self.gates), "or", "False"))
+
+    def _check_gate_batch(self, batch, mask):
+        return batch.combine(self.gates, mask, short_circuit=True)
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
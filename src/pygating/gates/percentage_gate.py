@@ -1,41 +1,153 @@
 import hashlib
-from typing import Any, Dict, Optional
+import zlib
+from typing import Any, Dict, FrozenSet, Optional
 
 from .property_gating_type import PropertyGatingType
 
+MD5_HASH_MODE = "md5"
+SPLITMIX64_HASH_MODE = "splitmix64"
+HASH_MODES = (MD5_HASH_MODE, SPLITMIX64_HASH_MODE)
+
+BUCKETS = 10000
+
+_MASK64 = (1 << 64) - 1
+_CRC_SEED = 0x9E3779B9
+
+
+def splitmix64(value: int) -> int:
+    """
+    splitmix64 finalizer, a fast non-cryptographic 64-bit mixer
+    """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def splitmix64_array(values: Any) -> Any:
+    """
+    Vectorised splitmix64 over a numpy uint64 array, equal to splitmix64 for each element
+    """
+    import numpy as np
+
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def hash_key64(value: Any) -> int:
+    """
+    Reduces an integer or string property value to the 64-bit key mixed by splitmix64.
+    Integers are used as is (two's complement), strings as two differently seeded crc32s.
+    """
+    if isinstance(value, int):
+        return value & _MASK64
+
+    data = value.encode()
+    return (zlib.crc32(data) << 32) | zlib.crc32(data, _CRC_SEED)
+
 
 class PercentageGate(PropertyGatingType):
+    side_effect_free = True
+    pure = True
+    static_cost = 4.0
+
     def __init__(
         self,
         percentage: float,
         entity_property: Optional[str] = None,
         salt: Optional[str] = None,
         allow: bool = True,
+        hash_mode: str = MD5_HASH_MODE,
     ):
+        if hash_mode not in HASH_MODES:
+            raise ValueError(f"Invalid hash mode: {hash_mode}. Must be one of {list(HASH_MODES)}")
+
+        # Only the md5 mode is restricted to strings, it hashes the property's text
         super().__init__(
-            property_type=str, entity_property=entity_property, allow=allow
+            property_type=str if hash_mode == MD5_HASH_MODE else (str, int),
+            entity_property=entity_property,
+            allow=allow,
         )
+        self.hash_mode = hash_mode
         self.salt = salt
+        self.bucket = self._splitmix64_bucket if hash_mode == SPLITMIX64_HASH_MODE else self._md5_bucket
 
         if not (0 <= percentage <= 100):
             raise ValueError("Percentage must be between 0 and 100")
 
         self.percentage = percentage
 
+    @property
+    def salt(self) -> Optional[str]:
+        return self._salt
+
+    @salt.setter
+    def salt(self, salt: Optional[str]):
+        self._salt = salt
+        self._salt_seed = hash_key64(salt) if salt else 0
+
+    # bucket(property_value) maps a property value to one of the 10000 consistent buckets,
+    # it is bound to the implementation of the gate's hash mode in __init__
+
+    def _md5_bucket(self, property_value: Any) -> int:
+        if self._salt:
+            property_value += self._salt
+
+        # Byte-exact with int(md5(...).hexdigest(), 16) without the hex round trip
+        digest = hashlib.md5(str(property_value).encode()).digest()
+        return int.from_bytes(digest, "big") % BUCKETS
+
+    def _splitmix64_bucket(self, property_value: Any) -> int:
+        return splitmix64(hash_key64(property_value) ^ self._salt_seed) % BUCKETS
+
     def _check_gate(self, entity: Any) -> bool:
         property_value = self.entity_value(entity)
 
-        if self.salt:
-            property_value += self.salt
-
-        # Convert the property value to a string and hash it
-        hash_value = int(hashlib.md5(str(property_value).encode()).hexdigest(), 16)
-        user_percentage = (
-            hash_value % 10000
-        ) / 100.0  # Maps the hash to a value between 0.00-99.99
+        # Maps the hash to a value between 0.00-99.99
+        user_percentage = self.bucket(property_value) / 100.0
 
         return user_percentage < self.percentage
 
+    def _check_gate_context(self, context) -> bool:
+        property_value = context.entity_value(self)
+
+        # Gates bucketing the same property with the same salt share the hash
+        bucket = context.memoize((self.hash_mode, self.entity_property, self._salt), self.bucket, property_value)
+        return bucket / 100.0 < self.percentage
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _check_gate_batch(self, batch, mask):
+        import numpy as np
+
+        column, errors = self._batch_column(batch)
+        if column is None:
+            return NotImplemented
+
+        if errors.all():
+            return batch.zeros(), errors
+
+        kind = column.dtype.kind
+        if self.hash_mode == SPLITMIX64_HASH_MODE and kind in "biu":
+            keys = column.astype(np.uint64)
+        elif self.hash_mode == SPLITMIX64_HASH_MODE and kind == "U":
+            keys = np.fromiter(
+                (hash_key64(value) for value in column.tolist()), dtype=np.uint64, count=batch.size
+            )
+        elif kind == "U":
+            buckets = np.fromiter(
+                (self.bucket(value) for value in column.tolist()), dtype=np.int64, count=batch.size
+            )
+            return buckets / 100.0 < self.percentage, errors
+        else:
+            return NotImplemented
+
+        buckets = splitmix64_array(keys ^ np.uint64(self._salt_seed)) % np.uint64(BUCKETS)
+        return buckets / 100.0 < self.percentage, errors
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
@@ -52,6 +164,12 @@ class PercentageGate(PropertyGatingType):
                 raise ValueError("'salt' field must be a str")
             params["salt"] = gate_json["salt"]
 
+        # Configs without a hash_mode keep the legacy md5 bucketing so existing rollouts keep their assignments
+        if "hash_mode" in gate_json:
+            if gate_json["hash_mode"] not in HASH_MODES:
+                raise ValueError(f"'hash_mode' field must be one of {list(HASH_MODES)}")
+            params["hash_mode"] = gate_json["hash_mode"]
+
         params["percentage"] = gate_json["percentage"]
 
         return params
@@ -1,8 +1,17 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
+from ..evaluation import active_context
+from ..property_accessor import PropertyAccessor
 from ..pygating import AbstractGate, GatingException
 
 
+def property_type_name(property_type: Any) -> str:
+    if isinstance(property_type, tuple):
+        return " or ".join(getattr(klass, "__name__", repr(klass)) for klass in property_type)
+
+    return getattr(property_type, "__name__", repr(property_type))
+
+
 class PropertyGatingType(AbstractGate):
     def __init__(
         self,
@@ -14,44 +23,57 @@ class PropertyGatingType(AbstractGate):
         self.property_type = property_type
         self.entity_property = entity_property
 
+    @property
+    def entity_property(self) -> Optional[str]:
+        return self._property_accessor.path
+
+    @entity_property.setter
+    def entity_property(self, entity_property: Optional[str]):
+        # The path is parsed once here instead of on every check
+        self._property_accessor = PropertyAccessor(entity_property)
+
     def entity_value(self, entity: Any) -> Any:
         if not entity:
             raise GatingException(
                 f"Entity must be provided when using gate of type: {self.__class__.__name__}"
             )
 
-        value = entity
-        if self.entity_property:
-            properties = self.entity_property.split(".")
-            for prop in properties:
-                if isinstance(value, dict):
-                    if prop in value:
-                        value = value[prop]
-                    else:
-                        raise GatingException(
-                            f"Entity does not have a key named '{prop}'"
-                        )
-                elif hasattr(value, prop):
-                    value = getattr(value, prop)
-                    if callable(value):
-                        try:
-                            value = value()
-                        except Exception as e:
-                            raise GatingException(
-                                f"Entity function {prop} threw an exception, {e}"
-                            )
-                else:
-                    raise GatingException(
-                        f"Entity does not have a property or function named '{prop}'"
-                    )
+        accessor = self._property_accessor
+        context = active_context.get()
+        if context is not None and context.entity is entity and accessor.segments:
+            return self._typed_value(context.property_value(accessor))
 
+        return self._typed_value(accessor.resolve(entity))
+
+    def _entity_property_paths(self) -> Optional[FrozenSet[str]]:
+        """
+        _required_properties of gates reading the entity only through entity_value.
+        Without a path the entity itself is the property.
+        """
+        path = self.entity_property
+        return frozenset((path,)) if path and isinstance(path, str) else None
+
+    def _typed_value(self, value: Any) -> Any:
         if self.property_type and not isinstance(value, self.property_type):
             raise GatingException(
-                f"Entity is not or does not return expected type of: {self.property_type.__name__}"
+                f"Entity is not or does not return expected type of: {property_type_name(self.property_type)}"
             )
 
         return value
 
+    def _batch_column(self, batch):
+        """
+        Returns the batch column for entity_property and the rows failing the
+        property_type check, or (None, None) when the column cannot be vectorised.
+        """
+        from ..batch import VECTOR_KINDS
+
+        column = batch.column(self.entity_property)
+        if column is None or column.dtype.kind not in VECTOR_KINDS:
+            return None, None
+
+        return column, batch.type_errors(column, self.property_type)
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
@@ -1,10 +1,12 @@
 import random
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
 from ..pygating import AbstractGate
 
 
 class RandomGate(AbstractGate):
+    pure = False
+
     def __init__(self, chance: float, allow: bool = True):
         super().__init__(allow=allow)
         if not 0 <= chance <= 1:
@@ -17,6 +19,9 @@ class RandomGate(AbstractGate):
 
         return False
 
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return frozenset()
+
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
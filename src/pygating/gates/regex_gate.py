@@ -1,29 +1,199 @@
 import re
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
 
 from .property_gating_type import PropertyGatingType
 
+# Constructs whose meaning depends on group numbering or names, which merging would shift
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _mergeable(regex: Any) -> bool:
+    return (
+        isinstance(regex.pattern, str)
+        and regex.flags == _DEFAULT_FLAGS
+        and not _GROUP_REFERENCE.search(regex.pattern)
+    )
+
+
+def compile_patterns(patterns: List[Any]) -> List[Any]:
+    """
+    Compiles patterns into as few regular expressions as possible: patterns without
+    global inline flags or group references are merged into a single alternation,
+    which re.match()es exactly when one of them does.
+    """
+    regexes = [re.compile(pattern) for pattern in patterns]
+    mergeable = [regex for regex in regexes if _mergeable(regex)]
+    if len(mergeable) < 2:
+        return regexes
+
+    try:
+        merged = re.compile("|".join(f"(?:{regex.pattern})" for regex in mergeable))
+    except re.error:
+        # e.g. the same group name used by several patterns
+        return regexes
+
+    return [merged] + [regex for regex in regexes if not _mergeable(regex)]
+
 
 class RegexGate(PropertyGatingType):
+    side_effect_free = True
+    pure = True
+    static_cost = 4.0
+
     def __init__(
-        self, pattern: str, entity_property: Optional[str] = None, allow: bool = True
+        self,
+        pattern: Optional[str] = None,
+        entity_property: Optional[str] = None,
+        allow: bool = True,
+        patterns: Optional[List[str]] = None,
+        cache_size: int = 0,
     ):
         super().__init__(
             property_type=str, entity_property=entity_property, allow=allow
         )
+        if (pattern is None) == (patterns is None) or patterns == []:
+            raise ValueError("Either a single 'pattern' or a non empty 'patterns' list must be provided")
+
+        self._cache_size = cache_size
+        if patterns is None:
+            self.pattern = pattern
+        else:
+            self.patterns = patterns
+
+    @property
+    def pattern(self) -> Optional[str]:
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, pattern: str):
+        self.patterns = [pattern]
+        self._pattern = pattern
+
+    @property
+    def patterns(self) -> List[str]:
+        return self._patterns
+
+    @patterns.setter
+    def patterns(self, patterns: List[str]):
+        # Patterns are compiled once here, reassign patterns rather than mutating them in place
+        if not patterns:
+            raise ValueError("Either a single 'pattern' or a non empty 'patterns' list must be provided")
+        self._pattern = None
+        self._patterns = patterns
+
+        # Invalid patterns raise on every check, as re.match would
+        self._error: Optional[re.error] = None
+        try:
+            self._regexes = compile_patterns(patterns)
+        except re.error as e:
+            self._error = e
+            self._regexes = []
+
+        self._reset_cache()
 
-        self.pattern = pattern
+    @property
+    def cache_size(self) -> int:
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, cache_size: int):
+        self._cache_size = cache_size
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self.match_value: Callable[[str], bool] = self._match_value
+        if self._cache_size:
+            self.match_value = lru_cache(maxsize=self._cache_size)(self._match_value)
+
+    def _match_value(self, value: str) -> bool:
+        if self._error is not None:
+            raise self._error
+
+        for regex in self._regexes:
+            if regex.match(value):
+                return True
+
+        return False
 
     def _check_gate(self, entity: Any) -> bool:
-        return bool(re.match(self.pattern, self.entity_value(entity)))
+        return self.match_value(self.entity_value(entity))
+
+    def _check_gate_context(self, context) -> bool:
+        return self.match_value(context.entity_value(self))
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(
+            self, f"{compiler.bind(self.match_value)}({compiler.bind(self.entity_value)}(entity))"
+        )
 
     @classmethod
     def _parse_json_params(cls, gate_json: Dict[str, Any]) -> Dict:
         params = super()._parse_json_params(gate_json)
 
-        if "pattern" not in gate_json or not isinstance(gate_json["pattern"], str):
-            raise ValueError("'pattern' field must be provided and be a str")
+        if "patterns" in gate_json:
+            patterns = gate_json["patterns"]
+            if (
+                "pattern" in gate_json
+                or not isinstance(patterns, list)
+                or not patterns
+                or not all(isinstance(pattern, str) for pattern in patterns)
+            ):
+                raise ValueError("'patterns' field must be a non empty list of str, and cannot be used with 'pattern'")
+            params["patterns"] = patterns
+        else:
+            if "pattern" not in gate_json or not isinstance(gate_json["pattern"], str):
+                raise ValueError("'pattern' field must be provided and be a str")
+            params["pattern"] = gate_json["pattern"]
 
-        params["pattern"] = gate_json["pattern"]
+        if "cache_size" in gate_json:
+            cache_size = gate_json["cache_size"]
+            if not isinstance(cache_size, int) or isinstance(cache_size, bool) or cache_size < 0:
+                raise ValueError("'cache_size' field must be a non negative int")
+            params["cache_size"] = cache_size
 
         return params
+
+
+def _or_mergeable(gate: Any) -> bool:
+    return type(gate) is RegexGate and gate.allow is True and gate._error is None
+
+
+def merge_regex_gates(gates: List[Any]) -> List[Any]:
+    """
+    Replaces runs of sibling RegexGates on the same entity_property (allow=True)
+    with one multi-pattern RegexGate. Used where the gates are or-ed together:
+    the merged gate passes, fails and raises exactly like the run it replaces.
+    """
+    runs: List[List[Any]] = []
+    for gate in gates:
+        previous = runs[-1][-1] if runs else None
+        if (
+            _or_mergeable(gate)
+            and previous is not None
+            and _or_mergeable(previous)
+            and gate.entity_property == previous.entity_property
+        ):
+            runs[-1].append(gate)
+        else:
+            runs.append([gate])
+
+    merged = []
+    for run in runs:
+        if len(run) == 1:
+            merged.append(run[0])
+        else:
+            merged.append(
+                RegexGate(
+                    entity_property=run[0].entity_property,
+                    patterns=[pattern for gate in run for pattern in gate.patterns],
+                    cache_size=max(gate.cache_size for gate in run),
+                )
+            )
+
+    return merged
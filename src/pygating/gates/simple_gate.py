@@ -1,7 +1,24 @@
-from typing import Any,  Optional
+from typing import Any,  FrozenSet, Optional
 from ..pygating import AbstractGate
 
 class SimpleGate(AbstractGate):
+    side_effect_free = True
+    pure = True
+    static_cost = 0.1
+
     def _check_gate(self, entity: Optional[Any] = None) -> bool:
         return True
+
+    def _check_gate_context(self, context) -> bool:
+        return True
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return frozenset()
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(self, "True")
+
+    def _check_gate_batch(self, batch, mask):
+        return batch.ones(), batch.zeros()
+
     
\ No newline at end of file
@@ -1,12 +1,30 @@
+from ..adaptive import adaptive_evaluator
 from ..pygating import AbstractGatingConfiguration
 from typing import Any, Optional
 
 class GatingConfigurationAll(AbstractGatingConfiguration):
     def _check_gating(self, entity: Optional[Any] = None):
+        if self.adaptive:
+            return adaptive_evaluator(self, short_circuit=False).evaluate(entity)
+
         for gate in self.gates:
             passed = gate.check(entity)
 
             if not passed:
                 return False
             
-        return True
\ No newline at end of file
+        return True
+
+    def _check_gating_context(self, context):
+        # Declaration order, adaptive reordering never changes results
+        for gate in self.gates:
+            if not context.check(gate):
+                return False
+
+        return True
+
+    def _compile(self, compiler) -> str:
+        return compiler.compile_gates(self.gates, "and", "True")
+
+    def _check_gating_batch(self, batch, mask):
+        return batch.combine(self.gates, mask, short_circuit=False)
\ No newline at end of file
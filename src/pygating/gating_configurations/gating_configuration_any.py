@@ -1,10 +1,29 @@
+from ..adaptive import adaptive_evaluator
+from ..gates.regex_gate import merge_regex_gates
 from ..pygating import AbstractGatingConfiguration
 from typing import Any, Optional
 
 class GatingConfigurationAny(AbstractGatingConfiguration):
     def _check_gating(self, entity: Optional[Any] = None):
+        if self.adaptive:
+            return adaptive_evaluator(self, short_circuit=True).evaluate(entity)
+
         for gate in self.gates:
             if gate.check(entity):
                 return True
             
-        return False
\ No newline at end of file
+        return False
+
+    def _check_gating_context(self, context):
+        # Declaration order, adaptive reordering never changes results
+        for gate in self.gates:
+            if context.check(gate):
+                return True
+
+        return False
+
+    def _compile(self, compiler) -> str:
+        return compiler.compile_gates(merge_regex_gates(self.gates), "or", "False")
+
+    def _check_gating_batch(self, batch, mask):
+        return batch.combine(self.gates, mask, short_circuit=True)
\ No newline at end of file
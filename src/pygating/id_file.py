@@ -0,0 +1,153 @@
+import csv
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# File layout: 8 byte magic, little endian uint64 count, then count sorted unique little endian uint64 ids
+ID_FILE_MAGIC = b"PYGIDS1\0"
+_HEADER = struct.Struct("<8sQ")
+MAX_ID = 2**64 - 1
+
+
+def _parse_id(value: Any) -> Optional[int]:
+    """
+    Returns the id an entity value stands for, or None when it cannot be an id
+    (negative or too large ints, non decimal strings, other types).
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdecimal() or not value.isascii():
+            return None
+        value = int(value)
+    elif not isinstance(value, int) or isinstance(value, bool):
+        return None
+
+    if value < 0 or value > MAX_ID:
+        return None
+
+    return value
+
+
+class IdFile:
+    """
+    A read-only, memory-mapped view of an id file built by build_id_file.
+    Pages are shared by every process mapping the same file, and lookups are a
+    binary search over the sorted ids.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"'{path}' is not a pygating id file")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(self._mmap)
+        if magic != ID_FILE_MAGIC or size != _HEADER.size + count * 8:
+            self._mmap.close()
+            raise ValueError(f"'{path}' is not a pygating id file")
+
+        self.count = count
+        if sys.byteorder == "little":
+            self.ids: Any = memoryview(self._mmap)[_HEADER.size:].cast("Q")
+        else:  # pragma: no cover - the stored ids are little endian
+            self.ids = array("Q", self._mmap[_HEADER.size:])
+            self.ids.byteswap()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, value: Any) -> bool:
+        value = _parse_id(value)
+        if value is None:
+            return False
+
+        ids = self.ids
+        index = bisect_left(ids, value)
+        return index < self.count and ids[index] == value
+
+    def array(self) -> Any:
+        """
+        Returns the ids as a numpy uint64 array sharing the mapped pages.
+        """
+        import numpy as np
+
+        return np.frombuffer(self._mmap, dtype="<u8", count=self.count, offset=_HEADER.size)
+
+
+_open_files: Dict[str, Tuple[Tuple[int, int, int], IdFile]] = {}
+_open_files_lock = threading.Lock()
+
+
+def open_id_file(path: str) -> IdFile:
+    """
+    Returns the process wide IdFile for path, so every gate referencing the same
+    file shares one mapping. A file replaced on disk is mapped again.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    with _open_files_lock:
+        cached = _open_files.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        id_file = IdFile(path)
+        # Replaced mappings are left to the gates still referencing them
+        _open_files[path] = (signature, id_file)
+        return id_file
+
+
+def _read_ids(source: str, delimiter: Optional[str]) -> Iterable[int]:
+    with open(source, newline="") as file:
+        if delimiter is None and source.lower().endswith(".csv"):
+            delimiter = ","
+
+        rows = csv.reader(file, delimiter=delimiter) if delimiter else ([line] for line in file)
+        for line_number, row in enumerate(rows, start=1):
+            field = row[0].strip() if row else ""
+            if not field:
+                continue
+
+            value = _parse_id(field)
+            if value is None:
+                if line_number == 1:
+                    # A header row
+                    continue
+                raise ValueError(f"Invalid id {field!r} on line {line_number} of '{source}'")
+
+            yield value
+
+
+def build_id_file(source: str, output: str, delimiter: Optional[str] = None) -> int:
+    """
+    Builds an id file from a text file with one id per line, or the first column
+    of a csv file (a header row is skipped). Ids must be integers between 0 and
+    2**64 - 1. The output is replaced atomically, so processes mapping the old
+    file keep working. Returns the number of unique ids written.
+    """
+    ids = array("Q", sorted(set(_read_ids(source, delimiter))))
+    if sys.byteorder != "little":  # pragma: no cover
+        ids.byteswap()
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".pygating-ids-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_HEADER.pack(ID_FILE_MAGIC, len(ids)))
+            ids.tofile(file)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, output)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+    return len(ids)
@@ -0,0 +1,189 @@
+import json
+import re
+from functools import lru_cache
+from json.decoder import JSONDecodeError, scanstring
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Rest of a string after its opening quote, escapes included
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|-?Infinity")
+# Arrays and objects without nested containers or strings, e.g. arrays of numbers
+_FLAT_CONTAINER = re.compile(r"\[[^\[\]{}\"]*\]|\{[^\[\]{}\"]*\}")
+
+_decoder = json.JSONDecoder()
+_SHORT_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "\b": "b", "\f": "f", "\n": "n", "\r": "r", "\t": "t"}
+
+# A path tree maps each key to the tree of its needed children, or to None when the whole value is needed
+_Tree = Dict[str, Optional[dict]]
+
+
+class _Nonempty(dict):
+    """
+    Sparse entity of a non empty object none of whose requested keys were found.
+    Gates treat falsy entities as missing, so it stays as truthy as the object.
+    """
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def _path_tree(paths: Iterable[str]) -> _Tree:
+    tree: _Tree = {}
+    for path in sorted(paths, key=lambda path: path.count(".")):
+        node = tree
+        segments = path.split(".")
+        for segment in segments[:-1]:
+            child = node.setdefault(segment, {})
+            if child is None:
+                # A parent is needed whole
+                break
+            node = child
+        else:
+            node[segments[-1]] = None
+
+    return tree
+
+
+def _spellings(character: str) -> str:
+    # Pattern matching the character inside a json string, escaped or not
+    units = character.encode("utf-16-be").hex()
+    # Characters outside the basic plane are escaped as surrogate pairs
+    spellings = [
+        "".join(
+            "\\\\u" + "".join(f"[{digit}{digit.upper()}]" if digit.isalpha() else digit for digit in units[i : i + 4])
+            for i in range(0, len(units), 4)
+        )
+    ]
+    if character in _SHORT_ESCAPES:
+        spellings.append(re.escape("\\" + _SHORT_ESCAPES[character]))
+    if character not in '"\\' and character >= " ":
+        spellings.append(re.escape(character))
+
+    return "(?:" + "|".join(spellings) + ")"
+
+
+@lru_cache(maxsize=256)
+def _keys_pattern(keys: Tuple[str, ...]) -> "re.Pattern[str]":
+    # Matches the json strings decoding to one of the keys
+    return re.compile("|".join('"' + "".join(_spellings(c) for c in key) + '"' for key in keys))
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()
+
+
+def _skip_string(text: str, index: int) -> int:
+    match = _STRING_END.match(text, index)
+    if match is None:
+        raise JSONDecodeError("Unterminated string", text, index - 1)
+
+    return match.end()
+
+
+def _skip_value(text: str, index: int) -> int:
+    character = text[index : index + 1]
+    if character == '"':
+        return _skip_string(text, index + 1)
+    if character == "{" or character == "[":
+        match = _FLAT_CONTAINER.match(text, index)
+        if match is not None:
+            return match.end()
+        # Scanning nested containers in python is slower than decoding them in C
+        return _decoder.raw_decode(text, index)[1]
+
+    match = _SCALAR.match(text, index)
+    if match is None:
+        raise JSONDecodeError("Expecting value", text, index)
+
+    return match.end()
+
+
+def _extract_object(text: str, index: int, tree: _Tree, stop_early: bool = False) -> Tuple[Dict[str, Any], int, bool]:
+    """
+    Extracts the tree's keys from the object whose content starts at index, later
+    duplicate keys replacing earlier ones like json.loads does. Returns the
+    extracted dict, the index after the object and True, or with stop_early the
+    index after the value of the last key of the tree found and False, when
+    scanning stopped inside the object because every key was found.
+    """
+    result: Dict[str, Any] = {}
+    index = _skip_whitespace(text, index)
+    if text[index : index + 1] == "}":
+        return result, index + 1, True
+
+    while True:
+        if text[index : index + 1] != '"':
+            raise JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+        key, index = scanstring(text, index + 1)
+
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] != ":":
+            raise JSONDecodeError("Expecting ':' delimiter", text, index)
+        index = _skip_whitespace(text, index + 1)
+
+        if key in tree:
+            children = tree[key]
+            if children is not None and text[index : index + 1] == "{":
+                value, index, _ = _extract_object(text, index + 1, children)
+            else:
+                value, index = _decoder.raw_decode(text, index)
+            result[key] = value
+
+            if stop_early and len(result) == len(tree):
+                return result, index, False
+        else:
+            index = _skip_value(text, index)
+
+        index = _skip_whitespace(text, index)
+        character = text[index : index + 1]
+        if character == ",":
+            index = _skip_whitespace(text, index + 1)
+        elif character == "}":
+            return result, index + 1, True
+        else:
+            raise JSONDecodeError("Expecting ',' delimiter", text, index)
+
+
+def json_entity(data: Union[bytes, bytearray, memoryview, str], paths: Optional[Iterable[str]] = None) -> Any:
+    """
+    Returns the entity encoded as json in data, as json.loads would, but only
+    decoding the values at the given dotted property paths: the result is a
+    sparse dict holding those paths, so gates reading them see the same values and
+    raise the same errors for missing keys. Duplicate keys resolve to their last
+    occurrence, like json.loads.
+
+    Scanning stops as soon as every top level key of the paths was found: the rest
+    of the payload is neither decoded nor validated, unless it holds one of
+    those keys' strings again, in which case the whole payload is decoded.
+
+    The sparse dict is truthy whenever the object is not empty, like the fully
+    decoded object. Without paths, or when data does not hold a json object, it is
+    fully decoded.
+    """
+    if isinstance(data, str):
+        text = data
+    else:
+        # Decoded like json.loads decodes bytes
+        text = str(data, json.detect_encoding(bytes(data[:4])), "surrogatepass")
+    if paths is None:
+        return json.loads(text)
+
+    tree = _path_tree(paths)
+    index = _skip_whitespace(text, 0)
+    if text[index : index + 1] != "{":
+        return json.loads(text)
+
+    content = _skip_whitespace(text, index + 1)
+    empty = text[content : content + 1] == "}"
+    if not tree:
+        return {} if empty else _Nonempty()
+
+    entity, end, complete = _extract_object(text, index + 1, tree, stop_early=True)
+    if not complete and _keys_pattern(tuple(tree)).search(text, end):
+        # The rest may hold a duplicate of a needed key, whose value json.loads keeps
+        return json.loads(text)
+    if not entity and not empty:
+        return _Nonempty()
+
+    return entity
@@ -0,0 +1,153 @@
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .evaluation import _MISSING, EntityContext, _Raised, active_context
+from .property_accessor import PropertyAccessor
+from .pygating import AbstractGate
+
+
+class PropertyLoader:
+    """
+    Resolves the last segment of an entity_property path for many objects with one
+    call: load(objects) receives the distinct objects the path's parent prefix
+    resolved to (e.g. the customers for "customer.get_plan"), and returns their
+    values in the same order. Objects are told apart by key(object), their
+    identity by default.
+    """
+
+    def __init__(self, load: Callable[[List[Any]], Sequence[Any]], key: Optional[Callable[[Any], Hashable]] = None):
+        self.load = load
+        self.key = key or id
+
+
+class _Deferred(BaseException):
+    """
+    Raised out of a gate hook when a path prefix waits for its loader. A
+    BaseException, so neither gates nor configurations record it as an error.
+    """
+
+
+class LoaderBatch:
+    """
+    The loader requests of every entity in a batch, and the values loaded for them.
+    """
+
+    def __init__(self, loaders: Mapping[str, Union[PropertyLoader, Callable[[List[Any]], Sequence[Any]]]]):
+        self.loaders: Dict[str, PropertyLoader] = {
+            path: loader if isinstance(loader, PropertyLoader) else PropertyLoader(loader)
+            for path, loader in loaders.items()
+        }
+        self._values: Dict[Tuple[str, Hashable], Any] = {}
+        self._requests: Dict[str, Dict[Hashable, Any]] = {}
+        # Number of bulk calls made, per path
+        self.loads: Dict[str, int] = {}
+
+    def value(self, prefix: str, parent: Any) -> Any:
+        """
+        Returns the loaded value (or a _Raised) of prefix for parent, requesting it
+        and raising _Deferred when it has not been loaded yet.
+        """
+        key = self.loaders[prefix].key(parent)
+        value = self._values.get((prefix, key), _MISSING)
+        if value is _MISSING:
+            self._requests.setdefault(prefix, {}).setdefault(key, parent)
+            raise _Deferred(prefix)
+
+        return value
+
+    def load(self):
+        """
+        Resolves every pending request with one call per loader.
+        """
+        requests, self._requests = self._requests, {}
+        for prefix, parents in requests.items():
+            self.loads[prefix] = self.loads.get(prefix, 0) + 1
+            try:
+                values = list(self.loaders[prefix].load(list(parents.values())))
+                if len(values) != len(parents):
+                    raise ValueError(
+                        f"The loader of '{prefix}' returned {len(values)} values for {len(parents)} objects"
+                    )
+            except Exception as e:
+                values = [_Raised(e)] * len(parents)
+
+            for key, value in zip(parents, values):
+                self._values[(prefix, key)] = value
+
+
+class LoaderEntityContext(EntityContext):
+    """
+    EntityContext resolving the path prefixes of the batch's loaders through
+    LoaderBatch.value. Checks waiting for a loader are retried once it has run,
+    reusing the results of the gates that were already evaluated.
+    """
+
+    def __init__(self, entity: Optional[Any], batch: LoaderBatch):
+        super().__init__(entity)
+        self.batch = batch
+        self._checked: Dict[int, Any] = {}
+
+    def _resolve_path(self, accessor: PropertyAccessor) -> Any:
+        return self._resolve_segments(accessor)
+
+    def _resolve_segment(self, prefix: str, accessor: PropertyAccessor, index: int, value: Any) -> Any:
+        if prefix in self.batch.loaders:
+            return self.batch.value(prefix, value)
+
+        return super()._resolve_segment(prefix, accessor, index, value)
+
+    def check(self, gate: AbstractGate) -> bool:
+        # Gates are evaluated once per entity even when the check is retried
+        result = self._checked.get(id(gate), _MISSING)
+        if result is not _MISSING:
+            if type(result) is _Raised:
+                raise result.exception
+            return result
+
+        try:
+            result = super().check(gate)
+        except Exception as e:
+            self._checked[id(gate)] = _Raised(e)
+            raise
+
+        self._checked[id(gate)] = result
+        return result
+
+
+def check_many(
+    configuration: Any,
+    entities: Sequence[Any],
+    loaders: Optional[Mapping[str, Any]] = None,
+    exception_callback: Optional[Callable] = None,
+) -> List[bool]:
+    """
+    Checks a gating configuration for every entity. loaders maps entity_property
+    path prefixes (e.g. "customer.get_plan") to a PropertyLoader or a bulk load
+    function: checks are run in rounds, each round collecting the values every
+    entity is waiting for and loading them with one call per path, until every
+    check completed. Loaded values are shared by the whole batch.
+
+    Gates take part through their _check_gate_context hook, or through
+    PropertyGatingType.entity_value, which resolves the properties of the entity
+    being checked through its context. Gates reading the entity in other ways
+    resolve their properties from the entity as usual.
+    """
+    batch = LoaderBatch(loaders or {})
+    contexts = [LoaderEntityContext(entity, batch) for entity in entities]
+    results = [False] * len(contexts)
+
+    pending = range(len(contexts))
+    while pending:
+        deferred = []
+        for position in pending:
+            token = active_context.set(contexts[position])
+            try:
+                results[position] = contexts[position].check_configuration(configuration, exception_callback)
+            except _Deferred:
+                deferred.append(position)
+            finally:
+                active_context.reset(token)
+
+        batch.load()
+        pending = deferred
+
+    return results
@@ -0,0 +1,220 @@
+import copy
+from typing import Any, FrozenSet, List, Optional
+
+from .adaptive import _composite_short_circuit
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class
+from .value_set import ValueSet
+
+
+class FoldedPropertyGate(AbstractGate):
+    """
+    Stands in for a property gate whose result no longer depends on the property's
+    value (e.g. PercentageGate(100)). The property is still resolved and type
+    checked through the original gate, so errors are raised exactly as before.
+    """
+
+    side_effect_free = True
+    pure = True
+    static_cost = 1.0
+
+    def __init__(self, gate: AbstractGate, value: bool):
+        super().__init__(allow=gate.allow)
+        self.gate = gate
+        self.value = value
+
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        self.gate.entity_value(entity)
+        return self.value
+
+    def _check_gate_context(self, context) -> bool:
+        context.entity_value(self.gate)
+        return self.value
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        return self.gate._entity_property_paths()
+
+    def _compile(self, compiler) -> str:
+        return compiler.allow(self, f"({compiler.bind(self.gate.entity_value)}(entity), {self.value!r})[1]")
+
+
+def _exact(gate: AbstractGate, cls: type) -> bool:
+    """
+    True when the gate evaluates exactly like cls (cls or a subclass not changing evaluation).
+    """
+    return isinstance(gate, cls) and all(
+        _defining_class(type(gate), name) is _defining_class(cls, name) for name in ("check", "_check_gate")
+    )
+
+
+def _constant(gate: AbstractGate, preserve_errors: bool) -> Any:
+    """
+    Returns the gate's check() result when it does not depend on the entity (and
+    cannot raise), or None.
+    """
+    from .gates import PercentageGate, RandomGate, SimpleGate
+
+    if _exact(gate, SimpleGate):
+        return True == gate.allow
+
+    # random.random() is always below 1
+    if _exact(gate, RandomGate) and gate.chance >= 1:
+        return True == gate.allow
+
+    if not preserve_errors and _exact(gate, PercentageGate) and gate.percentage in (0, 100):
+        return (gate.percentage == 100) == gate.allow
+
+    return None
+
+
+def _constant_gate(value: bool) -> AbstractGate:
+    from .gates import SimpleGate
+
+    return SimpleGate(allow=value)
+
+
+def _fold_property_gate(gate: AbstractGate) -> AbstractGate:
+    from .gates import PercentageGate
+
+    # Every bucket is below 100 and none is below 0, only property errors remain
+    if _exact(gate, PercentageGate) and gate.percentage in (0, 100):
+        return FoldedPropertyGate(gate, gate.percentage == 100)
+
+    return gate
+
+
+def _merge_inclusion(first: AbstractGate, second: AbstractGate, short_circuit: bool) -> Optional[AbstractGate]:
+    """
+    Merges two adjacent InclusionGates on the same property into one. Both gates
+    resolve the same value, so they raise together and the merged gate only
+    differs from the pair in doing the lookup once.
+    """
+    from .gates import InclusionGate
+
+    if not (_exact(first, InclusionGate) and _exact(second, InclusionGate)):
+        return None
+    if first.entity_property != second.entity_property or type(first.allow) is not bool or type(second.allow) is not bool:
+        return None
+
+    first_set = ValueSet(first.valid_values)
+    second_set = ValueSet(second.valid_values)
+    if first_set.unhashable or second_set.unhashable:
+        return None
+
+    def union():
+        return first.valid_values + [value for value in second.valid_values if value not in first_set]
+
+    def intersection():
+        return [value for value in first.valid_values if value in second_set]
+
+    def difference(values, excluded):
+        return [value for value in values if value not in excluded]
+
+    # Under all() (short_circuit=False) both checks must pass, under any() one of them
+    if first.allow == second.allow:
+        combine_values = union if first.allow == short_circuit else intersection
+        return InclusionGate(combine_values(), entity_property=first.entity_property, allow=first.allow)
+
+    allowed, denied = (first, second) if first.allow else (second, first)
+    denied_set = first_set if denied is first else second_set
+    allowed_set = first_set if allowed is first else second_set
+    if not short_circuit:
+        # in allowed and not in denied
+        return InclusionGate(difference(allowed.valid_values, denied_set), entity_property=first.entity_property)
+
+    # not in denied or in allowed
+    return InclusionGate(difference(denied.valid_values, allowed_set), entity_property=first.entity_property, allow=False)
+
+
+def _optimize_gate(gate: AbstractGate, preserve_errors: bool) -> AbstractGate:
+    short_circuit = _composite_short_circuit(gate)
+    if short_circuit is None:
+        if _constant(gate, preserve_errors) is None:
+            return _fold_property_gate(gate)
+        return gate
+
+    gates = optimize_gates(gate.gates, short_circuit, preserve_errors)
+    if not gates:
+        # An empty all() is True, an empty any() is False
+        return _constant_gate((not short_circuit) == gate.allow)
+    if len(gates) == 1 and gate.allow is True:
+        return gates[0]
+    if len(gates) == 1 and _constant(gates[0], preserve_errors) is not None:
+        return _constant_gate(_constant(gates[0], preserve_errors) == gate.allow)
+
+    optimized = copy.copy(gate)
+    optimized.gates = gates
+    return optimized
+
+
+def optimize_gates(gates: List[AbstractGate], short_circuit: bool, preserve_errors: bool = True) -> List[AbstractGate]:
+    """
+    Optimizes the children of an all() (short_circuit=False) or any() (short_circuit=True)
+    node. The returned gates evaluate to the same result, and raise the same errors,
+    for every entity.
+    """
+    from .gates.regex_gate import merge_regex_gates
+
+    flattened: List[AbstractGate] = []
+    for gate in gates:
+        gate = _optimize_gate(gate, preserve_errors)
+        if _composite_short_circuit(gate) == short_circuit and gate.allow is True:
+            # all() inside all() and any() inside any() are associative
+            flattened.extend(gate.gates)
+        else:
+            flattened.append(gate)
+
+    optimized: List[AbstractGate] = []
+    for gate in flattened:
+        constant = _constant(gate, preserve_errors)
+        if constant is None:
+            merged = _merge_inclusion(optimized[-1], gate, short_circuit) if optimized else None
+            if merged is not None:
+                optimized[-1] = merged
+            else:
+                optimized.append(gate)
+        elif bool(constant) is short_circuit:
+            # Decides the node, every following gate is unreachable
+            optimized.append(_constant_gate(constant))
+            break
+        # Neutral constants cannot change the result
+
+    if short_circuit:
+        optimized = merge_regex_gates(optimized)
+
+    return optimized
+
+
+def optimize_configuration(
+    configuration: AbstractGatingConfiguration, preserve_errors: bool = True
+) -> AbstractGatingConfiguration:
+    """
+    Returns an optimized copy of a GatingConfigurationAll or GatingConfigurationAny:
+    nested AndGates and OrGates are flattened, constant gates (SimpleGate,
+    RandomGate(chance >= 1), PercentageGate(0 or 100)) are folded with respect to allow,
+    unreachable gates after a deciding constant are dropped, and adjacent
+    InclusionGates on the same property (and RegexGates in any() nodes) are merged.
+
+    Results, and the errors raised for every entity, are unchanged. Side effects
+    are not: folded RandomGates no longer draw from the random module, so the
+    numbers later draws get differ, e.g. after random.seed(). With
+    preserve_errors=False PercentageGate(0 or 100) is folded completely, dropping
+    the property resolution errors it would raise. Other configurations are
+    returned unchanged.
+    """
+    from .gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+    if _defining_class(type(configuration), "check") is not AbstractGatingConfiguration:
+        return configuration
+
+    owner = _defining_class(type(configuration), "_check_gating")
+    if owner is GatingConfigurationAll:
+        short_circuit = False
+    elif owner is GatingConfigurationAny:
+        short_circuit = True
+    else:
+        return configuration
+
+    optimized = copy.copy(configuration)
+    optimized.__dict__.pop("_adaptive_evaluator", None)
+    optimized.gates = optimize_gates(configuration.gates, short_circuit, preserve_errors)
+    return optimized
@@ -0,0 +1,86 @@
+from typing import Any, Dict, FrozenSet, Iterable, NamedTuple
+
+from .adaptive import _composite_short_circuit
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class, _hook_applies
+
+
+class Projection(NamedTuple):
+    # The entity_property paths read, e.g. "shop.get_name.details"
+    paths: FrozenSet[str]
+    # False when some gate may read any part of the entity (custom scripts, gates without
+    # an entity_property, custom configurations), the whole entity must then be provided
+    complete: bool
+
+
+# Whether each gate type's _required_properties hook can be trusted
+_hook_types: Dict[type, bool] = {}
+
+
+def gate_projection(gate: AbstractGate) -> Projection:
+    """
+    Returns the entity properties gate.check() reads, covering And/Or gates' children.
+    """
+    if _composite_short_circuit(gate) is not None:
+        return merge_projections(gate_projection(child) for child in gate.gates)
+
+    trusted = _hook_types.get(type(gate))
+    if trusted is None:
+        trusted = _hook_types[type(gate)] = _hook_applies(
+            gate, "_required_properties", ["check", "_check_gate", "entity_value"]
+        )
+
+    paths = gate._required_properties() if trusted else None
+    if paths is None:
+        return Projection(frozenset(), False)
+
+    return Projection(frozenset(paths), True)
+
+
+def required_properties(configuration: Any) -> Projection:
+    """
+    Returns the entity properties a gating configuration's check() reads. Loading
+    only those paths (when complete) is enough to get the same results.
+    """
+    from .gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+    if not isinstance(configuration, AbstractGatingConfiguration):
+        return Projection(frozenset(), False)
+
+    projection = merge_projections(gate_projection(gate) for gate in configuration.gates)
+    cls = type(configuration)
+    if _defining_class(cls, "check") is not AbstractGatingConfiguration or _defining_class(cls, "_check_gating") not in (
+        GatingConfigurationAll,
+        GatingConfigurationAny,
+    ):
+        return Projection(projection.paths, False)
+
+    return projection
+
+
+def cached_projection(configuration: Any) -> Projection:
+    """
+    required_properties(configuration), recomputed when its gates list is replaced.
+    In place changes to gates are not tracked.
+    """
+    cached = getattr(configuration, "__dict__", {}).get("_projection")
+    if cached is None or cached[0] is not configuration.gates:
+        cached = (configuration.gates, required_properties(configuration))
+        try:
+            configuration._projection = cached
+        except AttributeError:
+            pass
+
+    return cached[1]
+
+
+def merge_projections(projections: Iterable[Projection]) -> Projection:
+    """
+    Returns the projection reading everything the given projections read, e.g. for a whole flag set.
+    """
+    paths = set()
+    complete = True
+    for projection in projections:
+        paths.update(projection.paths)
+        complete = complete and projection.complete
+
+    return Projection(frozenset(paths), complete)
@@ -0,0 +1,175 @@
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .pygating import GatingException
+
+# Per segment resolver caches are bounded so dynamically created entity types cannot grow them forever
+_MAX_CACHED_TYPES = 256
+
+_MISSING = object()
+
+
+def _static_lookup(cls: type, name: str) -> Any:
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass, klass.__dict__[name]
+
+    return None, _MISSING
+
+
+def _namedtuple_field_index(cls: type, name: str) -> Optional[int]:
+    if not issubclass(cls, tuple):
+        return None
+
+    owner, _ = _static_lookup(cls, name)
+    fields = owner.__dict__.get("_fields") if owner is not None else None
+    if not isinstance(fields, tuple) or name not in fields:
+        return None
+
+    return fields.index(name)
+
+
+def _call_if_callable(prop: str, value: Any) -> Any:
+    if callable(value):
+        try:
+            value = value()
+        except Exception as e:
+            raise GatingException(f"Entity function {prop} threw an exception, {e}")
+
+    return value
+
+
+def _dict_resolver(prop: str) -> Callable[[Any], Any]:
+    def resolve(value: Any) -> Any:
+        result = value.get(prop, _MISSING)
+        if result is _MISSING:
+            raise GatingException(f"Entity does not have a key named '{prop}'")
+        return result
+
+    return resolve
+
+
+def _dict_subclass_resolver(prop: str) -> Callable[[Any], Any]:
+    # dict subclasses may customise get/__missing__, so keep the exact membership test
+    def resolve(value: Any) -> Any:
+        if prop in value:
+            return value[prop]
+        raise GatingException(f"Entity does not have a key named '{prop}'")
+
+    return resolve
+
+
+def _attribute_resolver(prop: str, getter: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def resolve(value: Any) -> Any:
+        try:
+            result = getter(value)
+        except AttributeError:
+            raise GatingException(
+                f"Entity does not have a property or function named '{prop}'"
+            )
+
+        if callable(result):
+            try:
+                result = result()
+            except Exception as e:
+                raise GatingException(f"Entity function {prop} threw an exception, {e}")
+
+        return result
+
+    return resolve
+
+
+def _generic_resolver(prop: str) -> Callable[[Any], Any]:
+    def resolve(value: Any) -> Any:
+        if isinstance(value, dict):
+            if prop in value:
+                return value[prop]
+            raise GatingException(f"Entity does not have a key named '{prop}'")
+
+        result = getattr(value, prop, _MISSING)
+        if result is _MISSING:
+            raise GatingException(
+                f"Entity does not have a property or function named '{prop}'"
+            )
+
+        return _call_if_callable(prop, result)
+
+    return resolve
+
+
+def _specialize(prop: str, cls: type) -> Callable[[Any], Any]:
+    if cls is dict:
+        return _dict_resolver(prop)
+
+    if issubclass(cls, dict):
+        return _dict_subclass_resolver(prop)
+
+    if cls.__getattribute__ is not object.__getattribute__ or hasattr(cls, "__getattr__"):
+        # Custom attribute protocols must be honoured exactly
+        return _generic_resolver(prop)
+
+    # namedtuple fields are read by position, everything else (dataclasses,
+    # __slots__ classes and plain objects) through a C level attrgetter
+    index = _namedtuple_field_index(cls, prop)
+    if index is not None:
+        return _attribute_resolver(prop, itemgetter(index))
+
+    return _attribute_resolver(prop, attrgetter(prop))
+
+
+class PropertyAccessor:
+    """
+    Parsed form of a dotted entity_property path (e.g. 'shop.get_name.details.length').
+    The path is split once, and every segment caches a resolver specialised for
+    each concrete type it is applied to (dict, namedtuple, __slots__ or dataclass
+    instances, ...). Resolution semantics and error messages match the original
+    walk: dict keys are looked up, attributes are read and callables are invoked.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.valid = not path or isinstance(path, str)
+        self.segments: Tuple[str, ...] = tuple(path.split(".")) if path and self.valid else ()
+        self._resolvers: Tuple[Dict[type, Callable[[Any], Any]], ...] = tuple(
+            {} for _ in self.segments
+        )
+        self._steps = tuple(zip(self.segments, self._resolvers))
+
+    def resolver(self, index: int, cls: type) -> Callable[[Any], Any]:
+        resolvers = self._resolvers[index]
+        resolve = resolvers.get(cls)
+        if resolve is None:
+            if len(resolvers) >= _MAX_CACHED_TYPES:
+                resolvers.clear()
+            resolve = resolvers[cls] = _specialize(self.segments[index], cls)
+
+        return resolve
+
+    def resolve_segment(self, index: int, value: Any) -> Any:
+        return self.resolver(index, type(value))(value)
+
+    def resolve(self, entity: Any) -> Any:
+        if not self.valid:
+            raise GatingException(
+                f"The entity_property must be a str defining the path to the property to check, got: {self.path!r}"
+            )
+
+        value = entity
+        index = 0
+        for prop, resolvers in self._steps:
+            if type(value) is dict:
+                # Plain dicts are by far the most common container, resolve them without a call
+                value = value.get(prop, _MISSING)
+                if value is _MISSING:
+                    raise GatingException(f"Entity does not have a key named '{prop}'")
+            else:
+                resolve = resolvers.get(type(value))
+                if resolve is None:
+                    resolve = self.resolver(index, type(value))
+                value = resolve(value)
+            index += 1
+
+        return value
+
+    def __repr__(self) -> str:
+        return f"PropertyAccessor({self.path!r})"
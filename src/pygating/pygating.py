@@ -1,5 +1,16 @@
-from typing import Any, List, Optional, Dict, Callable
+from typing import Any, FrozenSet, List, Mapping, Optional, Dict, Callable
 from abc import ABC, abstractmethod
+from datetime import datetime
+
+from .configuration_cache import GatingConfigurationCache
+from .flag_store import FlagStore
+from .registry import (
+    BUILTIN_GATES,
+    BUILTIN_GATING_CONFIGURATIONS,
+    GATES_ENTRY_POINT_GROUP,
+    GATING_CONFIGURATIONS_ENTRY_POINT_GROUP,
+    LazyRegistry,
+)
 
 
 class GatingException(Exception):
@@ -8,8 +19,39 @@ class GatingException(Exception):
 
 def handle_exception(exception: Exception):
     pass
+
+
+def _defining_class(cls: type, name: str) -> type:
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass
+
+    return object
+
+
+def _hook_applies(instance: Any, hook_name: str, evaluation_names: List[str]) -> bool:
+    """
+    An optimisation hook (compile, batch, ...) may only be trusted when it is defined
+    at or below every class that defines the evaluation methods it replaces. Otherwise
+    a subclass changed the behaviour and the hook would reproduce the parent's logic.
+    """
+    cls = type(instance)
+    hook_owner = _defining_class(cls, hook_name)
+    return all(issubclass(hook_owner, _defining_class(cls, name)) for name in evaluation_names)
+
     
 class AbstractGate(ABC):
+    # Whether the gate may be evaluated out of order or skipped (see adaptive configurations).
+    # Only trusted when declared by the class defining _check_gate
+    side_effect_free = False
+
+    # Whether the gate's result only depends on the entity (deterministic, no side effects),
+    # which lets result caches reuse it. Only trusted when declared by the class defining _check_gate
+    pure = False
+
+    # Relative evaluation cost used to order gates before timings are known
+    static_cost = 1.0
+
     def __init__(self, allow: bool = True):
         self.allow = allow
 
@@ -46,15 +88,54 @@ class AbstractGate(ABC):
     def check(self, entity: Optional[Any] = None) -> bool:
         return self._check_gate(entity) == self.allow
 
+    def _compile(self, compiler) -> str:
+        """
+        Hook method for GatingCompiler. Returns a python expression over `entity`
+        equivalent to check(entity). Subclasses override it to inline their logic.
+        """
+        return compiler.allow(self, f"{compiler.bind(self._check_gate)}(entity)", boolean=False)
+
+    def _check_gate_batch(self, batch, mask) -> Any:
+        """
+        Hook method for vectorised evaluation over a GatingBatch. Returns a tuple of
+        numpy bool arrays (_check_gate results, rows that raised), or NotImplemented
+        to have the batch check every row entity through check().
+        """
+        return NotImplemented
+
+    def _check_gate_context(self, context) -> bool:
+        """
+        Hook method for evaluate_all. Returns _check_gate(context.entity), subclasses
+        override it to reuse the property values and hashes memoized by the EntityContext.
+        """
+        return self._check_gate(context.entity)
+
+    def _required_properties(self) -> Optional[FrozenSet[str]]:
+        """
+        Hook method for pygating.projection. Returns the entity_property paths check()
+        reads from the entity, or None when it may read any part of it.
+        """
+        return None
+
+    def _next_time_boundary(self, now: datetime) -> Optional[datetime]:
+        """
+        Hook method for gates evaluated against the current time. Returns the earliest
+        instant after now at which check() without an entity may change, or None when
+        it does not depend on the time.
+        """
+        return None
+
     
 class AbstractGatingConfiguration(ABC):
     def __init__(
             self, 
             gates: Optional[List[AbstractGate]] = [],
-            fail_closed: Optional[bool] = True
+            fail_closed: Optional[bool] = True,
+            adaptive: bool = False
         ):
         self.gates = gates
         self.fail_closed = fail_closed
+        self.adaptive = adaptive
     @abstractmethod
     def _check_gating(self, entity: Optional[Any] = None):
         pass
@@ -69,6 +150,11 @@ class AbstractGatingConfiguration(ABC):
             else:
                 raise ValueError("The 'fail_closed' field must be a boolean")
 
+        if "adaptive" in gate_config_json:
+            if not isinstance(gate_config_json["adaptive"], bool):
+                raise ValueError("The 'adaptive' field must be a boolean")
+            instance.adaptive = gate_config_json["adaptive"]
+
         instance.gates = instance._load_gate_json(gate_config_json["gates"])
 
         return instance
@@ -81,6 +167,63 @@ class AbstractGatingConfiguration(ABC):
 
         return gates
 
+    def _compile(self, compiler) -> str:
+        """
+        Hook method for GatingCompiler. Returns a python expression over `entity`
+        equivalent to _check_gating(entity).
+        """
+        return f"{compiler.bind(self._check_gating)}(entity)"
+
+    def _check_gating_batch(self, batch, mask) -> Any:
+        """
+        Hook method for vectorised evaluation over a GatingBatch. Returns a tuple of
+        numpy bool arrays (_check_gating results, rows that raised), or NotImplemented.
+        """
+        return NotImplemented
+
+    def _check_gating_context(self, context) -> bool:
+        """
+        Hook method for evaluate_all. Returns _check_gating(context.entity), subclasses
+        override it to check their gates through the EntityContext.
+        """
+        return self._check_gating(entity=context.entity)
+
+    def next_time_boundary(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Returns the next start_date/end_date crossing after now (the clock's time by
+        default) across the whole gate tree, or None when no gate depends on the time.
+        Until then, check() without an entity only changes if the configuration does.
+        """
+        from .clock import get_clock, next_time_boundary
+
+        return next_time_boundary(self.gates, now if now is not None else get_clock().now())
+
+    def required_properties(self):
+        """
+        Returns the pygating.projection.Projection of the entity properties check() reads.
+        """
+        from .projection import required_properties
+
+        return required_properties(self)
+
+    def optimize(self, preserve_errors: bool = True) -> "AbstractGatingConfiguration":
+        """
+        Returns an optimized copy of the configuration with the same check() results,
+        see pygating.optimizer.optimize_configuration.
+        """
+        from .optimizer import optimize_configuration
+
+        return optimize_configuration(self, preserve_errors=preserve_errors)
+
+    def compile(self):
+        """
+        Compiles the configuration into a single generated function with the same check() semantics.
+        Changes made to the configuration after compiling are not reflected in the compiled result.
+        """
+        from .compiler import GatingCompiler
+
+        return GatingCompiler().compile_configuration(self)
+
     def check(self, entity: Optional[Any] = None, exception_callback: Optional[Callable] = None) -> bool:
         try:
             return self._check_gating(entity=entity)
@@ -93,53 +236,88 @@ class AbstractGatingConfiguration(ABC):
             else:
                 return True
     
+
+def _invalidate_configuration_cache():
+    PyGating.configuration_cache.invalidate()
+
+
 class PyGating():
-    registered_gates = {}
-    registered_gate_configurations = {}
+    # Registry changes invalidate the parsed configurations cached for json configurations
+    registered_gates = LazyRegistry(GATES_ENTRY_POINT_GROUP, on_change=_invalidate_configuration_cache)
+    registered_gate_configurations = LazyRegistry(
+        GATING_CONFIGURATIONS_ENTRY_POINT_GROUP, on_change=_invalidate_configuration_cache
+    )
+    configuration_cache = GatingConfigurationCache()
+    optimizer_enabled = False
+    flag_store = FlagStore()
 
     @staticmethod
     def init():
-        from .gates import (
-            AndGate,
-            BooleanGate,
-            CustomScriptGate,
-            DateGate,
-            InclusionGate,
-            OrGate,
-            PercentageGate,
-            RandomGate,
-            RegexGate,
-            SimpleGate
-        )
-        from .gating_configurations import (
-            GatingConfigurationAll,
-            GatingConfigurationAny
+        # Library types are registered by module path and only imported when first used
+        for name, path in BUILTIN_GATES.items():
+            PyGating.registered_gates.register_path(name, path)
+
+        for name, path in BUILTIN_GATING_CONFIGURATIONS.items():
+            PyGating.registered_gate_configurations.register_path(name, path)
+
+    @staticmethod
+    def set_optimizer(enabled: bool = True):
+        """
+        When enabled, json configurations passed to check_gating and check_gating_batch
+        are optimized once after parsing.
+        """
+        PyGating.optimizer_enabled = enabled
+        PyGating.configuration_cache.invalidate()
+
+    @staticmethod
+    def set_result_cache(
+        enabled: bool = True,
+        maxsize: int = 4096,
+        ttl: float = 30.0,
+        entity_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        When enabled, check_flag reuses the results of pure flags for the same entity
+        key for up to ttl seconds, see pygating.result_cache.ResultCache.
+        """
+        from .result_cache import ResultCache
+
+        PyGating.flag_store.set_result_cache(
+            ResultCache(maxsize=maxsize, ttl=ttl, entity_key=entity_key) if enabled else None
         )
 
-        # Register Library gates
-        PyGating.registered_gates[AndGate.__name__] = AndGate
-        PyGating.registered_gates[BooleanGate.__name__] = BooleanGate
-        PyGating.registered_gates[CustomScriptGate.__name__] = CustomScriptGate
-        PyGating.registered_gates[DateGate.__name__] = DateGate
-        PyGating.registered_gates[InclusionGate.__name__] = InclusionGate
-        PyGating.registered_gates[OrGate.__name__] = OrGate
-        PyGating.registered_gates[PercentageGate.__name__] = PercentageGate
-        PyGating.registered_gates[RandomGate.__name__] = RandomGate
-        PyGating.registered_gates[RegexGate.__name__] = RegexGate
-        PyGating.registered_gates[SimpleGate.__name__] = SimpleGate
+    @staticmethod
+    def set_clock(clock: Optional[Any] = None):
+        """
+        Sets the clock date gates without an entity compare against, e.g. a
+        pygating.clock.CoarseClock. None restores the system clock.
+        """
+        from .clock import set_clock
 
-        # Register Library gate configurations
-        PyGating.registered_gate_configurations[GatingConfigurationAll.__name__] = GatingConfigurationAll
-        PyGating.registered_gate_configurations[GatingConfigurationAny.__name__] = GatingConfigurationAny
+        set_clock(clock)
 
     @staticmethod
     def register_gate(gate: AbstractGate):
         PyGating.registered_gates[gate.__name__] = gate
 
+    @staticmethod
+    def register_gate_path(name: str, path: str):
+        """
+        Registers a gate type name to be imported from "package.module:ClassName" on first use.
+        """
+        PyGating.registered_gates.register_path(name, path)
+
     @staticmethod
     def register_gate_configuration(gate_config: AbstractGatingConfiguration):
         PyGating.registered_gate_configurations[gate_config.__name__] = gate_config
 
+    @staticmethod
+    def register_gate_configuration_path(name: str, path: str):
+        """
+        Registers a gating configuration type name to be imported from "package.module:ClassName" on first use.
+        """
+        PyGating.registered_gate_configurations.register_path(name, path)
+
     @staticmethod
     def _parse_gate_configuration_from_json(gate_configuration_json: Dict[str, Any]):
 
@@ -150,6 +328,8 @@ class PyGating():
         gating_config_type = PyGating.registered_gate_configurations[gate_config_type_str]
 
         gating_config = gating_config_type.from_json(gate_configuration_json)
+        if PyGating.optimizer_enabled:
+            gating_config = gating_config.optimize()
 
         return gating_config
 
@@ -163,10 +343,236 @@ class PyGating():
         if not gate_configuration:
             raise ValueError("No gate configuration provided")
         
-        # Check if json was passed, and parse if so
+        # Check if json was passed, and parse if so. Identical json reuses the previously parsed configuration
         if isinstance(gate_configuration, dict):
-            gate_configuration = PyGating._parse_gate_configuration_from_json(gate_configuration)
+            gate_configuration = PyGating.configuration_cache.get_or_parse(
+                gate_configuration, PyGating._parse_gate_configuration_from_json
+            )
 
         return gate_configuration.check(entity=entity, exception_callback=exception_callback)
+
+    @staticmethod
+    async def check_gating_async(
+        gate_configuration: Any,
+        entity: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None
+    ):
+        """
+        check_gating for asyncio code: awaitable entity properties and async script
+        functions are awaited, and independent gates run concurrently, see
+        pygating.async_evaluation.check_async.
+        """
+        from .async_evaluation import check_async
+
+        if not gate_configuration:
+            raise ValueError("No gate configuration provided")
+
+        if isinstance(gate_configuration, dict):
+            gate_configuration = PyGating.configuration_cache.get_or_parse(
+                gate_configuration, PyGating._parse_gate_configuration_from_json
+            )
+
+        return await check_async(gate_configuration, entity, exception_callback)
+
+    @staticmethod
+    def check_gating_json(
+        gate_configuration: Any,
+        data: Any,
+        exception_callback: Optional[Callable] = None
+    ):
+        """
+        check_gating for an entity given as raw json (bytes, memoryview or str). Only
+        the properties the configuration reads are decoded, see
+        pygating.json_entity.json_entity. Invalid json raises a json.JSONDecodeError
+        when found in the part of the payload that was scanned, which does not go
+        past the last property read.
+        """
+        from .json_entity import json_entity
+        from .projection import cached_projection
+
+        if not gate_configuration:
+            raise ValueError("No gate configuration provided")
+
+        if isinstance(gate_configuration, dict):
+            gate_configuration = PyGating.configuration_cache.get_or_parse(
+                gate_configuration, PyGating._parse_gate_configuration_from_json
+            )
+
+        projection = cached_projection(gate_configuration)
+        entity = json_entity(data, projection.paths if projection.complete else None)
+        return gate_configuration.check(entity=entity, exception_callback=exception_callback)
+
+    @staticmethod
+    def check_gating_many(
+        gate_configuration: Any,
+        entities: List[Any],
+        loaders: Optional[Mapping[str, Any]] = None,
+        exception_callback: Optional[Callable] = None
+    ) -> List[bool]:
+        """
+        check_gating for every entity, resolving the entity_property paths that have
+        a loader with one bulk call for the whole batch (e.g. {"customer.get_plan":
+        load_plans}), see pygating.loaders.check_many.
+        """
+        from .loaders import check_many
+
+        if not gate_configuration:
+            raise ValueError("No gate configuration provided")
+
+        if isinstance(gate_configuration, dict):
+            gate_configuration = PyGating.configuration_cache.get_or_parse(
+                gate_configuration, PyGating._parse_gate_configuration_from_json
+            )
+
+        return check_many(gate_configuration, entities, loaders, exception_callback)
+
+    @staticmethod
+    def load_flags(flags: Dict[str, Any]):
+        """
+        Parses a bundle of flag name -> gating configuration (json or object) and
+        atomically replaces every flag of the flag store with it.
+        """
+        return PyGating.flag_store.load(flags)
+
+    @staticmethod
+    def update_flags(flags: Dict[str, Any], removed: Optional[List[str]] = None):
+        """
+        Parses the given flags and atomically adds or replaces them, removing the removed names.
+        """
+        return PyGating.flag_store.update(flags, removed or ())
+
+    @staticmethod
+    def check_flag(
+        name: str,
+        entity: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None,
+        default: Optional[bool] = None,
+        entity_key: Optional[Any] = None,
+    ):
+        """
+        Checks the flag store's configuration named name. Unknown flags raise a
+        GatingException, unless a default result is given. entity_key identifies the
+        entity for the result cache (see set_result_cache).
+        """
+        if default is None:
+            return PyGating.flag_store.check(name, entity, exception_callback, entity_key=entity_key)
+
+        return PyGating.flag_store.check(name, entity, exception_callback, default, entity_key)
+
+    @staticmethod
+    def evaluate_all(
+        entity: Optional[Any] = None,
+        flags: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None,
+        as_bitset: bool = False,
+    ):
+        """
+        Checks many flags for the same entity in one pass, resolving each entity
+        property and percentage hash once. flags is a mapping of name -> gating
+        configuration (json or object), an iterable of flag store names, or None for
+        every flag of the flag store in sorted name order. Returns name -> result,
+        or with as_bitset an int whose bit i is the result of the i-th flag.
+        """
+        from .evaluation import evaluate_all
+
+        if not isinstance(flags, Mapping):
+            return PyGating.flag_store.snapshot().evaluate_all(entity, flags, exception_callback, as_bitset)
+
+        configurations = {}
+        for name, gate_configuration in flags.items():
+            if isinstance(gate_configuration, dict):
+                gate_configuration = PyGating.configuration_cache.get_or_parse(
+                    gate_configuration, PyGating._parse_gate_configuration_from_json
+                )
+            configurations[name] = gate_configuration
+
+        return evaluate_all(configurations, entity, exception_callback, as_bitset)
+
+    @staticmethod
+    def required_properties(flags: Optional[Any] = None):
+        """
+        Returns the pygating.projection.Projection of the entity properties the flags
+        read, merged over all of them. flags is a mapping of name -> gating
+        configuration (json or object), an iterable of flag store names, or None for
+        every flag of the flag store.
+        """
+        from .projection import merge_projections, required_properties
+
+        if not isinstance(flags, Mapping):
+            return PyGating.flag_store.snapshot().required_properties(flags)
+
+        projections = []
+        for gate_configuration in flags.values():
+            if isinstance(gate_configuration, dict):
+                gate_configuration = PyGating.configuration_cache.get_or_parse(
+                    gate_configuration, PyGating._parse_gate_configuration_from_json
+                )
+            projections.append(required_properties(gate_configuration))
+
+        return merge_projections(projections)
+
+    @staticmethod
+    def check_gating_batch(
+        gate_configuration: Any,
+        columns: Dict[str, Any],
+        exception_callback: Optional[Callable] = None
+    ):
+        """
+        Evaluates a gating configuration for many entities at once. columns maps each
+        entity_property path to a numpy array holding that property for every entity.
+        Returns a numpy bool mask equal to check_gating for each row entity.
+        Requires numpy.
+        """
+        from .batch import check_configuration_batch
+
+        return check_configuration_batch(
+            PyGating._batch_configuration(gate_configuration), columns, exception_callback
+        )
+
+    @staticmethod
+    def _batch_configuration(gate_configuration: Any) -> AbstractGatingConfiguration:
+        if not gate_configuration:
+            raise ValueError("No gate configuration provided")
+
+        from .compiler import CompiledGatingConfiguration
+
+        if isinstance(gate_configuration, dict):
+            return PyGating.configuration_cache.get_or_parse(
+                gate_configuration, PyGating._parse_gate_configuration_from_json
+            )
+        if isinstance(gate_configuration, CompiledGatingConfiguration):
+            return gate_configuration.configuration
+
+        return gate_configuration
+
+    @staticmethod
+    def check_gating_dataframe(
+        gate_configuration: Any,
+        frame: Any,
+        exception_callback: Optional[Callable] = None
+    ):
+        """
+        check_gating_batch for the rows of a pandas DataFrame, whose column names are
+        entity_property paths. Returns a bool Series with the frame's index.
+        Requires pandas.
+        """
+        from .columnar import check_dataframe
+
+        return check_dataframe(PyGating._batch_configuration(gate_configuration), frame, exception_callback)
+
+    @staticmethod
+    def check_gating_arrow(
+        gate_configuration: Any,
+        table: Any,
+        exception_callback: Optional[Callable] = None
+    ):
+        """
+        check_gating_batch for the rows of a pyarrow Table or RecordBatch, struct
+        fields being read as dotted entity_property paths. Returns a numpy bool mask.
+        Requires pyarrow.
+        """
+        from .columnar import check_arrow
+
+        return check_arrow(PyGating._batch_configuration(gate_configuration), table, exception_callback)
         
         
@@ -0,0 +1,145 @@
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional
+
+GATES_ENTRY_POINT_GROUP = "pygating.gates"
+GATING_CONFIGURATIONS_ENTRY_POINT_GROUP = "pygating.gating_configurations"
+
+# Library types, as "module:attribute" paths relative to this package
+BUILTIN_GATES = {
+    "AndGate": ".gates.and_gate:AndGate",
+    "BooleanGate": ".gates.boolean_gate:BooleanGate",
+    "CustomScriptGate": ".gates.custom_script_gate:CustomScriptGate",
+    "DateGate": ".gates.date_gate:DateGate",
+    "IdFileGate": ".gates.id_file_gate:IdFileGate",
+    "InclusionGate": ".gates.inclusion_gate:InclusionGate",
+    "OrGate": ".gates.or_gate:OrGate",
+    "PercentageGate": ".gates.percentage_gate:PercentageGate",
+    "RandomGate": ".gates.random_gate:RandomGate",
+    "RegexGate": ".gates.regex_gate:RegexGate",
+    "SimpleGate": ".gates.simple_gate:SimpleGate",
+}
+
+BUILTIN_GATING_CONFIGURATIONS = {
+    "GatingConfigurationAll": ".gating_configurations.gating_configuration_all:GatingConfigurationAll",
+    "GatingConfigurationAny": ".gating_configurations.gating_configuration_any:GatingConfigurationAny",
+}
+
+
+def import_path(path: str) -> Any:
+    """
+    Imports "package.module:attribute" (or a path relative to pygating when it starts with a dot).
+    """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected a 'module:attribute' path, got: {path!r}")
+
+    value = importlib.import_module(module_name, package=__package__)
+    for name in attribute.split("."):
+        value = getattr(value, name)
+
+    return value
+
+
+def _entry_points(group: str) -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover - python < 3.8
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+
+    if sys.version_info >= (3, 10):
+        return list(entry_points(group=group))
+
+    return list(entry_points().get(group, []))  # pragma: no cover
+
+
+class LazyRegistry(MutableMapping):
+    """
+    Maps type names to gate or gating configuration classes. Entries may be
+    registered as classes or as "module:attribute" paths, which are only imported
+    the first time the name is looked up. Names that are not registered are looked
+    up once in the installed packages' entry points of entry_point_group.
+    """
+
+    def __init__(self, entry_point_group: Optional[str] = None, on_change: Optional[Callable[[], None]] = None):
+        self.entry_point_group = entry_point_group
+        self.on_change = on_change
+        self._entries: Dict[str, Any] = {}
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def _load_entry_points(self) -> Dict[str, Any]:
+        if self._entry_points is None:
+            self._entry_points = {}
+            if self.entry_point_group:
+                for entry_point in _entry_points(self.entry_point_group):
+                    self._entry_points.setdefault(entry_point.name, entry_point)
+
+        return self._entry_points
+
+    def _find(self, name: str) -> Any:
+        if name in self._entries:
+            return self._entries[name]
+
+        entry_point = self._load_entry_points().get(name)
+        if entry_point is not None:
+            self._entries[name] = entry_point
+        return entry_point
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            entry = self._find(name)
+            if entry is None:
+                raise KeyError(name)
+
+            if isinstance(entry, str):
+                entry = import_path(entry)
+            elif not isinstance(entry, type) and hasattr(entry, "load"):
+                entry = entry.load()
+            else:
+                return entry
+
+            self._entries[name] = entry
+            return entry
+
+    def __contains__(self, name: Any) -> bool:
+        with self._lock:
+            return self._find(name) is not None
+
+    def __setitem__(self, name: str, value: Any):
+        with self._lock:
+            self._entries[name] = value
+        self._changed()
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            del self._entries[name]
+        self._changed()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def register_path(self, name: str, path: str):
+        """
+        Registers name to be imported from "package.module:attribute" on first use.
+        """
+        self[name] = path
+
+    def refresh_entry_points(self):
+        with self._lock:
+            self._entry_points = None
+        self._changed()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({sorted(self._entries)!r})"
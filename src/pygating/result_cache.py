@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .adaptive import _composite_short_circuit
+from .pygating import AbstractGate, AbstractGatingConfiguration, _defining_class, _hook_applies
+
+ResultCacheInfo = namedtuple("ResultCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+# type -> "composite" for built-in And/Or gates, otherwise whether the type's pure declaration is trusted
+_pure_types: Dict[type, Any] = {}
+
+
+def is_pure(gate: AbstractGate) -> bool:
+    """
+    A gate is pure when it declares so and that declaration covers the evaluation
+    methods it uses. And/Or gates are pure when all of their gates are.
+    """
+    kind = _pure_types.get(type(gate))
+    if kind is None:
+        if _composite_short_circuit(gate) is not None:
+            kind = "composite"
+        else:
+            kind = _hook_applies(gate, "pure", ["check", "_check_gate"])
+        _pure_types[type(gate)] = kind
+
+    if kind == "composite":
+        return all(is_pure(child) for child in gate.gates)
+
+    return kind and bool(gate.pure)
+
+
+def is_pure_configuration(configuration: Any) -> bool:
+    """
+    Whether a configuration's check() result only depends on the entity: a built-in
+    GatingConfigurationAll or GatingConfigurationAny made of pure gates.
+    """
+    from .gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+    if not isinstance(configuration, AbstractGatingConfiguration):
+        return False
+
+    cls = type(configuration)
+    if _defining_class(cls, "check") is not AbstractGatingConfiguration:
+        return False
+    if _defining_class(cls, "_check_gating") not in (GatingConfigurationAll, GatingConfigurationAny):
+        return False
+
+    return all(is_pure(gate) for gate in configuration.gates)
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of flag check results keyed by (flag version, entity key),
+    each result expiring ttl seconds after it was computed. Flag versions change
+    with every configuration change, so stale configurations are never served.
+
+    Only pure flags are cached, and only for truthy entities with a key: either
+    the entity_key given to the check, or entity_key(entity) when the cache has an
+    entity_key function (returning None skips the cache). The key must identify
+    the entity's state the flags depend on, for up to ttl seconds. Checks that
+    raised (and called their exception_callback) are not cached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 30.0,
+        entity_key: Optional[Callable[[Any], Optional[Hashable]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 0:
+            raise ValueError("maxsize must be greater than or equal to 0")
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entity_key = entity_key
+        self.clock = clock
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Returns the cached result for key, or None when missing or expired.
+        """
+        now = self.clock()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                expires, result = cached
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return result
+                del self._entries[key]
+            self._misses += 1
+
+        return None
+
+    def put(self, key: Hashable, result: bool):
+        if self.maxsize == 0:
+            return
+
+        expires = self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def check(
+        self,
+        entry: Any,
+        entity: Optional[Any] = None,
+        exception_callback: Optional[Callable] = None,
+        entity_key: Optional[Hashable] = None,
+    ) -> bool:
+        """
+        Checks a FlagEntry through the cache.
+        """
+        configuration = entry.configuration
+        if entry.pure and entity and entity_key is None and self.entity_key is not None:
+            entity_key = self.entity_key(entity)
+        if not entry.pure or not entity or entity_key is None:
+            return configuration.check(entity=entity, exception_callback=exception_callback)
+
+        key = (entry.version, entity_key)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        errors = []
+
+        def record(exception: Exception):
+            errors.append(exception)
+            if exception_callback:
+                exception_callback(exception)
+
+        result = configuration.check(entity=entity, exception_callback=record)
+        if not errors:
+            self.put(key, result)
+
+        return result
+
+    def cache_info(self) -> ResultCacheInfo:
+        with self._lock:
+            return ResultCacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
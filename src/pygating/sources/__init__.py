@@ -0,0 +1,4 @@
+from .base import ConfigSource
+from .filesystem import FileSystemSource
+from .sqlite import SQLiteConfigRepository, SQLiteSource
+from .http import BundleServer, HTTPSource
@@ -0,0 +1,139 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+
+class ConfigSource(ABC):
+    """
+    Base class of the config sources feeding a FlagStore (PyGating.flag_store by
+    default) from outside the process. Subclasses implement poll(), which applies
+    the changes made since the previous poll, and may override _wait() to block
+    until changes are likely. start() polls from a daemon thread until stop().
+
+    Configurations failing to parse never replace the flag's previous version,
+    they are reported to error_callback(origin, exception).
+    """
+
+    def __init__(
+        self,
+        store: Optional[Any] = None,
+        poll_interval: float = 1.0,
+        error_callback: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        if store is None:
+            from ..pygating import PyGating
+
+            store = PyGating.flag_store
+
+        self.store = store
+        self.poll_interval = poll_interval
+        self.error_callback = error_callback
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @abstractmethod
+    def poll(self) -> Set[str]:
+        """
+        Applies the changes made since the previous poll. Returns the names of the
+        flags that were updated or removed.
+        """
+        pass
+
+    def load(self) -> Set[str]:
+        return self.poll()
+
+    def _report(self, origin: str, exception: Exception):
+        if self.error_callback:
+            self.error_callback(origin, exception)
+
+    def _apply(self, changed: Dict[str, Any], removed: Iterable[str], origins: Dict[str, str]) -> Set[str]:
+        """
+        Publishes the changed flags and removals as one store update. If a
+        configuration fails to parse the flags are applied one at a time instead,
+        so only the failing flags keep their previous version.
+        """
+        removed = list(removed)
+        if not changed and not removed:
+            return set()
+
+        try:
+            self.store.update(changed, removed=removed)
+            return set(changed) | set(removed)
+        except Exception:
+            pass
+
+        applied = set(removed)
+        if removed:
+            self.store.update({}, removed=removed)
+        for name, configuration in changed.items():
+            try:
+                self.store.update({name: configuration})
+                applied.add(name)
+            except Exception as e:
+                self._report(origins.get(name, name), e)
+
+        return applied
+
+    def _retry_delay(self, failures: int) -> float:
+        """
+        Seconds to wait before polling again after failures consecutive failed polls.
+        """
+        return self.poll_interval
+
+    def _wait(self) -> bool:
+        """
+        Blocks until the next poll is due. Returns whether to poll, False once stopped.
+        """
+        return not self._stop.wait(self.poll_interval)
+
+    def _open(self):
+        """
+        Hook called by start() before the initial load.
+        """
+
+    def _close(self):
+        """
+        Hook called by stop() once the watcher thread exited.
+        """
+
+    def _watch(self):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if self._wait():
+                    self.poll()
+                failures = 0
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                failures += 1
+                self._report(type(self).__name__, e)
+                self._stop.wait(self._retry_delay(failures))
+
+    def start(self) -> "ConfigSource":
+        """
+        Loads every flag and keeps polling for changes from a daemon thread.
+        """
+        if self._thread is not None:
+            return self
+
+        self._stop.clear()
+        self._open()
+        self.load()
+        self._thread = threading.Thread(target=self._watch, name=f"pygating-{type(self).__name__}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+
+    def __enter__(self) -> "ConfigSource":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
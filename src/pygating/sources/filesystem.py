@@ -0,0 +1,225 @@
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .base import ConfigSource
+
+# inotify(7) constants
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+
+Signature = Tuple[int, int, int]
+
+
+class _Inotify:
+    """
+    Minimal ctypes binding of Linux inotify watching a single directory. Events are
+    only used as a wake up signal, the directory is rescanned to find what changed.
+    """
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits up to timeout seconds for events, and drains them. Returns whether any arrived.
+        An overflowed event queue (IN_Q_OVERFLOW, always reported) counts as an event.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    break
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+
+        return True
+
+    def close(self):
+        os.close(self._fd)
+
+
+def _open_inotify(directory: str) -> Optional[_Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        return _Inotify(directory)
+    except (OSError, AttributeError):
+        # No inotify support (old libc, exhausted watches, ...), fall back to polling
+        return None
+
+
+class FileSystemSource(ConfigSource):
+    """
+    Feeds a FlagStore from a directory of flag json files, one gating configuration
+    per file, named after the file without its extension.
+
+    poll() rescans the directory and only re-parses files whose mtime, size or
+    inode changed, updating just those flags (and removing flags whose file is
+    gone). start() runs a background watcher: inotify wakes it up where available,
+    otherwise the directory is polled every poll_interval seconds. With inotify the
+    directory is still rescanned every rescan_interval seconds (never for None), for
+    the changes inotify does not report, e.g. made on network filesystems. Bursts of
+    edits are debounced, changes are applied once the directory was quiet for
+    debounce seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        store: Optional[Any] = None,
+        extension: str = ".json",
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        rescan_interval: Optional[float] = 60.0,
+        error_callback: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        super().__init__(store=store, poll_interval=poll_interval, error_callback=error_callback)
+        self.directory = directory
+        self.extension = extension
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.rescan_interval = rescan_interval
+
+        self._signatures: Dict[str, Signature] = {}
+        self._lock = threading.Lock()
+        self.inotify: Optional[_Inotify] = None
+        self._rescanned = 0.0
+
+    def _flag_name(self, filename: str) -> Optional[str]:
+        if filename.startswith(".") or not filename.endswith(self.extension):
+            return None
+
+        return filename[: -len(self.extension)] or None
+
+    def scan(self) -> Dict[str, Tuple[str, Signature]]:
+        """
+        Returns flag name -> (path, signature) for every flag file in the directory.
+        """
+        files = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = self._flag_name(entry.name)
+                if name is None:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if not entry.is_file():
+                    continue
+                files[name] = (entry.path, (stat.st_mtime_ns, stat.st_size, stat.st_ino))
+
+        return files
+
+    def poll(self) -> Set[str]:
+        with self._lock:
+            files = self.scan()
+            changed: Dict[str, Any] = {}
+            paths: Dict[str, str] = {}
+            for name, (path, signature) in files.items():
+                if self._signatures.get(name) == signature:
+                    continue
+                # Recorded even when invalid, the file is retried once it changes again
+                self._signatures[name] = signature
+                try:
+                    with open(path, "rb") as file:
+                        changed[name] = json.load(file)
+                    paths[name] = path
+                except (OSError, ValueError) as e:
+                    self._report(path, e)
+
+            removed = [name for name in self._signatures if name not in files]
+            for name in removed:
+                del self._signatures[name]
+
+            return self._apply(changed, removed, paths)
+
+    def _pending(self, files: Dict[str, Tuple[str, Signature]]) -> bool:
+        return {name: signature for name, (_, signature) in files.items()} != self._signatures
+
+    def _settle_scan(self) -> bool:
+        """
+        Polling mode: waits until the directory differs from the applied state and
+        then stays unchanged for debounce seconds.
+        """
+        if self._stop.wait(self.poll_interval):
+            return False
+
+        current = self.scan()
+        if not self._pending(current):
+            return False
+
+        while not self._stop.wait(self.debounce):
+            latest = self.scan()
+            if latest == current:
+                return True
+            current = latest
+
+        return False
+
+    def _settle_inotify(self) -> bool:
+        if not self.inotify.wait(self.poll_interval):
+            if self.rescan_interval is None or time.monotonic() - self._rescanned < self.rescan_interval:
+                return False
+            self._rescanned = time.monotonic()
+            # poll() only applies what changed
+            return True
+
+        # Wait for a quiet period before applying a burst of edits
+        while not self._stop.is_set() and self.inotify.wait(self.debounce):
+            pass
+
+        return not self._stop.is_set()
+
+    def _wait(self) -> bool:
+        if self.inotify is not None:
+            return self._settle_inotify()
+
+        return self._settle_scan()
+
+    def _open(self):
+        # Watch before the initial load so no change made during it is missed
+        if self.use_inotify:
+            self.inotify = _open_inotify(self.directory)
+        self._rescanned = time.monotonic()
+
+    def _close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
@@ -0,0 +1,365 @@
+import gzip
+import hashlib
+import http.client
+import json
+import random
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from .base import ConfigSource
+
+
+def _connect(url: str, timeout: Optional[float]) -> Tuple[http.client.HTTPConnection, str]:
+    """
+    Returns a (not yet connected) connection to url's host and the request target.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"Expected an http or https url, got: {url!r}")
+
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    return connection_class(parts.hostname, parts.port, timeout=timeout), target
+
+
+class HTTPSource(ConfigSource):
+    """
+    Feeds a FlagStore from a flag bundle, a json object of flag name -> gating
+    configuration, served at url.
+
+    Requests reuse one keep-alive connection and are conditional: the bundle's
+    ETag is sent back as If-None-Match, so an unchanged bundle costs a 304 and is
+    neither downloaded nor parsed again. When a bundle changed, only the flags
+    whose configuration changed are re-parsed, and flags missing from it are removed.
+
+    Without stream_url the bundle is polled every poll_interval seconds. With it,
+    the watcher listens to a server-sent events stream and fetches the bundle
+    whenever an event arrives (and after every reconnection). Failures are retried
+    with jittered exponential backoff, from backoff up to max_backoff seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        store: Optional[Any] = None,
+        poll_interval: float = 5.0,
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+        stream_url: Optional[str] = None,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        error_callback: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        super().__init__(store=store, poll_interval=poll_interval, error_callback=error_callback)
+        self.url = url
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.stream_url = stream_url
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.etag: Optional[str] = None
+
+        self._names: Set[str] = set()
+        self._lock = threading.Lock()
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._target = ""
+        self._stream: Optional[http.client.HTTPResponse] = None
+        self._stream_socket: Optional[socket.socket] = None
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _get(self, headers: Dict[str, str]) -> Tuple[http.client.HTTPResponse, bytes]:
+        for attempt in range(2):
+            reused = self._connection is not None
+            if not reused:
+                self._connection, self._target = _connect(self.url, self.timeout)
+
+            try:
+                self._connection.request("GET", self._target, headers=headers)
+                response = self._connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self._close_connection()
+                # The server may have closed an idle keep-alive connection, retry once on a new one
+                if reused and attempt == 0 and not isinstance(e, socket.timeout):
+                    continue
+                raise
+
+            if response.will_close:
+                self._close_connection()
+            return response, body
+
+    def poll(self) -> Set[str]:
+        with self._lock:
+            headers = {"Accept": "application/json", "Accept-Encoding": "gzip", **self.headers}
+            if self.etag is not None:
+                headers["If-None-Match"] = self.etag
+
+            response, body = self._get(headers)
+            if response.status == 304:
+                return set()
+            if response.status != 200:
+                raise http.client.HTTPException(f"{self.url} responded with status {response.status}")
+
+            etag = response.getheader("ETag")
+            try:
+                if response.getheader("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                bundle = json.loads(body)
+                if not isinstance(bundle, dict):
+                    raise ValueError(f"Expected a json object of flags, got: {type(bundle).__name__}")
+            except (OSError, ValueError) as e:
+                # Recorded anyway, an invalid bundle is not downloaded again until it changes
+                self.etag = etag
+                self._report(self.url, e)
+                return set()
+
+            removed = self._names - set(bundle)
+            before = self.store.snapshot()
+            self._apply(bundle, removed, {})
+            after = self.store.snapshot()
+
+            self.etag = etag
+            self._names = set(bundle)
+            return {name for name in bundle if after.get(name) is not before.get(name)} | removed
+
+    def _open_stream(self):
+        connection, target = _connect(self.stream_url, self.timeout)
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache", **self.headers}
+        try:
+            connection.request("GET", target, headers=headers)
+            stream_socket = connection.sock
+            response = connection.getresponse()
+            if response.status != 200:
+                raise http.client.HTTPException(f"{self.stream_url} responded with status {response.status}")
+        except BaseException:
+            connection.close()
+            raise
+
+        # Events may be far apart, only the connection itself is subject to the timeout
+        stream_socket.settimeout(None)
+        self._stream_socket = stream_socket
+        self._stream = response
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            self._stream_socket = None
+
+    def _next_event(self):
+        """
+        Blocks until the stream delivers a complete event, the event's content is ignored.
+        """
+        pending = False
+        while True:
+            line = self._stream.readline()
+            if not line:
+                raise ConnectionError(f"{self.stream_url} closed the event stream")
+            line = line.rstrip(b"\r\n")
+            if not line:
+                if pending:
+                    return
+            elif not line.startswith(b":"):
+                pending = True
+
+    def _wait(self) -> bool:
+        if self.stream_url is None:
+            return super()._wait()
+
+        if self._stream is None:
+            self._open_stream()
+            # Events may have been missed while disconnected
+            return True
+
+        try:
+            self._next_event()
+        except Exception:
+            self._close_stream()
+            raise
+
+        return not self._stop.is_set()
+
+    def _retry_delay(self, failures: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** (failures - 1))
+        # Jittered so a fleet of processes does not reconnect in lockstep
+        return delay * random.uniform(0.5, 1.0)
+
+    def stop(self):
+        self._stop.set()
+        stream_socket = self._stream_socket
+        if stream_socket is not None:
+            # Wakes the watcher thread up from its blocking stream read
+            try:
+                stream_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        super().stop()
+
+    def _close(self):
+        self._close_stream()
+        with self._lock:
+            self._close_connection()
+
+
+class BundleServer:
+    """
+    Minimal local stand-in for a flag bundle endpoint, for tests and development.
+    Serves the published flags as json at /flags, with an ETag and gzip support,
+    and a server-sent events stream at /flags/events notifying every publish().
+    """
+
+    def __init__(self, flags: Optional[Dict[str, Any]] = None, host: str = "127.0.0.1", port: int = 0, keepalive: float = 15.0):
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        # Counters of accepted connections, requests and full bundle downloads
+        self.connections = 0
+        self.requests = 0
+        self.downloads = 0
+        self.version = 0
+
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._sockets: Set[socket.socket] = set()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.publish(flags or {})
+
+    def publish(self, flags: Dict[str, Any]):
+        body = json.dumps(flags, sort_keys=True).encode()
+        with self._condition:
+            self._body = body
+            self._gzip_body = gzip.compress(body)
+            self._etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            self.version += 1
+            self._condition.notify_all()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/flags"
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.url}/events"
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._condition:
+                    server.connections += 1
+                    server._sockets.add(self.connection)
+
+            def finish(self):
+                with server._condition:
+                    server._sockets.discard(self.connection)
+                super().finish()
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                if self.path == "/flags":
+                    self._send_bundle()
+                elif self.path == "/flags/events":
+                    self._send_events()
+                else:
+                    self.send_error(404)
+
+            def _send_bundle(self):
+                with server._condition:
+                    body, gzip_body, etag = server._body, server._gzip_body, server._etag
+
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                server.downloads += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip_body
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_events(self):
+                self.close_connection = True
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.flush()
+
+                with server._condition:
+                    version = server.version
+
+                try:
+                    while True:
+                        with server._condition:
+                            server._condition.wait_for(
+                                lambda: server._stopping or server.version != version, timeout=server.keepalive
+                            )
+                            if server._stopping:
+                                return
+                            changed = server.version != version
+                            version, etag = server.version, server._etag
+
+                        self.wfile.write(f"event: update\ndata: {etag}\n\n".encode() if changed else b": keepalive\n\n")
+                        self.wfile.flush()
+                except OSError:
+                    # The client went away
+                    return
+
+        return Handler
+
+    def start(self) -> "BundleServer":
+        self._stopping = False
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="pygating-BundleServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            # Like a restarting server, drop the kept-alive connections too
+            for connection in self._sockets:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "BundleServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
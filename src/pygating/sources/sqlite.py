@@ -0,0 +1,201 @@
+import json
+import queue
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Set
+
+from .base import ConfigSource
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class FlagChange(NamedTuple):
+    name: str
+    # The configuration's json text, None for deleted flags
+    configuration: Optional[str]
+    version: int
+    deleted: bool
+
+
+class SQLiteConfigRepository:
+    """
+    Flag configurations stored in a SQLite table, one row per flag. Every write
+    stamps the rows it touches with the next value of a monotonically increasing
+    version, and deletions leave a tombstone row, so changes_since(version)
+    returns exactly the flags changed or deleted after version.
+
+    Connections are pooled (up to pool_size idle ones are kept) and the database
+    uses WAL journaling, so readers are never blocked by a writer.
+    """
+
+    def __init__(self, path: str, table: str = "pygating_flags", pool_size: int = 4, timeout: float = 5.0):
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+
+        self.path = path
+        self.table = table
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
+
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "name TEXT PRIMARY KEY, configuration TEXT, "
+                "version INTEGER NOT NULL, deleted INTEGER NOT NULL DEFAULT 0)"
+            )
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_version ON {table} (version)")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            uri=self.path.startswith("file:"),
+        )
+        connection.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[Any]:
+        """
+        Yields (connection, version) inside a write transaction. The write lock is
+        taken before reading the current version, so versions are committed in order.
+        """
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                version = connection.execute(f"SELECT COALESCE(MAX(version), 0) + 1 FROM {self.table}").fetchone()[0]
+                yield connection, version
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def put_many(self, flags: Mapping[str, Any]) -> int:
+        """
+        Stores name -> configuration (json dict or text) rows in one transaction. Returns their version.
+        """
+        rows = []
+        for name, configuration in flags.items():
+            if not isinstance(configuration, str):
+                configuration = json.dumps(configuration, sort_keys=True)
+            rows.append((name, configuration))
+
+        with self._write() as (connection, version):
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (name, configuration, version, deleted) VALUES (?, ?, ?, 0)",
+                [(name, configuration, version) for name, configuration in rows],
+            )
+
+        return version
+
+    def put(self, name: str, configuration: Any) -> int:
+        return self.put_many({name: configuration})
+
+    def delete_many(self, names: List[str]) -> int:
+        """
+        Replaces the named flags with tombstones. Returns their version.
+        """
+        with self._write() as (connection, version):
+            connection.executemany(
+                f"UPDATE {self.table} SET configuration = NULL, version = ?, deleted = 1 "
+                "WHERE name = ? AND deleted = 0",
+                [(version, name) for name in names],
+            )
+
+        return version
+
+    def delete(self, name: str) -> int:
+        return self.delete_many([name])
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                f"SELECT configuration FROM {self.table} WHERE name = ? AND deleted = 0", (name,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def current_version(self) -> int:
+        with self._connection() as connection:
+            return connection.execute(f"SELECT COALESCE(MAX(version), 0) FROM {self.table}").fetchone()[0]
+
+    def changes_since(self, version: int = 0) -> List[FlagChange]:
+        """
+        Returns the flags changed or deleted after version, ordered by version.
+        """
+        with self._connection() as connection:
+            rows = connection.execute(
+                f"SELECT name, configuration, version, deleted FROM {self.table} WHERE version > ? ORDER BY version",
+                (version,),
+            ).fetchall()
+
+        return [FlagChange(name, configuration, row_version, bool(deleted)) for name, configuration, row_version, deleted in rows]
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SQLiteSource(ConfigSource):
+    """
+    Feeds a FlagStore from a SQLiteConfigRepository. Each poll only fetches and
+    re-parses the rows changed since the last version it applied, so a reload
+    costs O(changed flags) instead of O(all flags).
+    """
+
+    def __init__(
+        self,
+        repository: SQLiteConfigRepository,
+        store: Optional[Any] = None,
+        poll_interval: float = 1.0,
+        error_callback: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        super().__init__(store=store, poll_interval=poll_interval, error_callback=error_callback)
+        self.repository = repository
+        self.version = 0
+
+    def poll(self) -> Set[str]:
+        changes = self.repository.changes_since(self.version)
+        if not changes:
+            return set()
+
+        changed: Dict[str, Any] = {}
+        removed = []
+        for change in changes:
+            if change.deleted:
+                removed.append(change.name)
+                continue
+            try:
+                changed[change.name] = json.loads(change.configuration)
+            except ValueError as e:
+                self._report(change.name, e)
+
+        applied = self._apply(changed, removed, {})
+        # Rows that failed to parse are not retried until they are written again
+        self.version = changes[-1].version
+        return applied
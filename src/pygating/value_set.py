@@ -0,0 +1,65 @@
+from typing import Any, Iterable, List
+
+
+class ValueSet:
+    """
+    Membership structure for gate value lists. Hashable values live in a frozenset
+    for O(1) lookups, unhashable values (lists, dicts, ...) are kept aside and
+    scanned. Results are the same as `in` over the original list.
+    """
+
+    def __init__(self, values: Iterable[Any]):
+        self.values: List[Any] = list(values)
+
+        hashable = []
+        unhashable = []
+        for value in self.values:
+            try:
+                hash(value)
+            except TypeError:
+                unhashable.append(value)
+            else:
+                hashable.append(value)
+
+        self.hashed = frozenset(hashable)
+        self.unhashable = tuple(unhashable)
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            if value in self.hashed:
+                return True
+        except TypeError:
+            # An unhashable probe can only be compared by scanning
+            return value in self.values
+
+        return bool(self.unhashable) and value in self.unhashable
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def intersects(self, container: Iterable[Any]) -> bool:
+        """
+        True when any value is in container, like any(value in container for value in values)
+        """
+        if not self.unhashable:
+            try:
+                return not self.hashed.isdisjoint(container)
+            except TypeError:
+                pass
+
+        return any(value in container for value in self.values)
+
+    def contained_in(self, container: Iterable[Any]) -> bool:
+        """
+        True when every value is in container, like all(value in container for value in values)
+        """
+        if not self.unhashable:
+            try:
+                return self.hashed.issubset(container)
+            except TypeError:
+                pass
+
+        return all(value in container for value in self.values)
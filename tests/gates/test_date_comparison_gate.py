@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from src.pygating.gates.date_comparison_gate import DateComparisonGate
 
@@ -23,3 +23,12 @@ def test_date_comparison_gate_from_json():
     gate = DateComparisonGate(**params)
     assert gate._check_gate(entity=datetime(2023, 1, 1)) == True
     assert gate._check_gate(entity=datetime(2022, 12, 31)) == False
+
+
+def test_date_comparison_gate_naive_and_aware():
+    gate = DateComparisonGate.from_json(
+        {"comparison_operator": "lt", "comparison_value": "2023-01-01T02:00:00+02:00"}
+    )
+    assert gate.check(datetime(2022, 12, 31, 23, 59))
+    assert not gate.check(datetime(2023, 1, 1))
+    assert gate.check(datetime(2023, 1, 1, 1, tzinfo=timezone(timedelta(hours=2))))
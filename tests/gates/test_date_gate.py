@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock
 
 import pytest
@@ -122,3 +122,32 @@ class TestDateGate:
         current_date = datetime(2022, 6, 5)
         gate = DateGate(start_date=current_date, end_date=current_date)
         assert gate._check_gate(entity=current_date) == True
+
+    # Naive and aware datetimes mix, naive ones being taken as UTC
+    def test_naive_and_aware_dates(self):
+        gate = DateGate(
+            start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2022, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+        )
+        assert gate.check(datetime(2022, 1, 1, 10))
+        assert not gate.check(datetime(2022, 1, 1, 10, 0, 1))
+        assert gate.check(datetime(2022, 1, 1, 3, tzinfo=timezone(timedelta(hours=-5))))
+
+    # The current time of naive clocks is local time, compared with aware bounds as an instant
+    def test_aware_dates_against_now(self):
+        now = datetime.now(timezone.utc)
+        gate = DateGate(start_date=now - timedelta(minutes=1), end_date=now + timedelta(minutes=1))
+        gate._get_current_datetime = Mock(return_value=now.astimezone().replace(tzinfo=None))
+        assert gate.check()
+
+    # Bounds parsed from json or assigned later are normalized alike
+    def test_bounds_normalized(self):
+        gate = DateGate.from_json({"start_date": "2022-01-01T00:00:00Z"})
+        assert gate.start_date == datetime(2022, 1, 1, tzinfo=timezone.utc)
+        assert gate.check(datetime(2022, 1, 1))
+
+        gate.start_date = datetime(2023, 1, 1)
+        assert not gate.check(datetime(2022, 6, 1))
+
+        with pytest.raises(ValueError):
+            DateGate(end_date="2022-01-01")
@@ -0,0 +1,124 @@
+import pytest
+from src.pygating import GatingException, PyGating
+from src.pygating.gates import IdFileGate
+from src.pygating.id_file import build_id_file, open_id_file
+
+
+@pytest.fixture
+def id_path(tmp_path):
+    source = tmp_path / "ids.txt"
+    source.write_text("\n".join(str(value) for value in [42, 7, 2**64 - 1, 7, 1000]) + "\n")
+    output = tmp_path / "ids.bin"
+    build_id_file(str(source), str(output))
+    return str(output)
+
+
+class TestIdFileGate:
+
+    # Should pass for ids in the file, given as ints or decimal strings
+    def test_ids_in_file(self, id_path):
+        gate = IdFileGate(id_path)
+        assert gate._check_gate(42) == True
+        assert gate._check_gate("1000") == True
+        assert gate._check_gate(2**64 - 1) == True
+
+    # Should fail for ids not in the file and values that cannot be ids
+    def test_ids_not_in_file(self, id_path):
+        gate = IdFileGate(id_path)
+        assert gate._check_gate(43) == False
+        assert gate._check_gate(2**64) == False
+        assert gate._check_gate(-7) == False
+        assert gate._check_gate("abc") == False
+
+    # Should raise GatingException for other entity types
+    def test_invalid_entity_type(self, id_path):
+        gate = IdFileGate(id_path, entity_property="id")
+        with pytest.raises(GatingException):
+            gate._check_gate({"id": 4.2})
+
+    # Gates referencing the same file share one mapping
+    def test_mapping_is_shared(self, id_path):
+        assert IdFileGate(id_path).id_file is IdFileGate(id_path).id_file
+        assert len(open_id_file(id_path)) == 4
+
+    # A rebuilt file is mapped again, gates using the old file keep working
+    def test_rebuilt_file(self, id_path, tmp_path):
+        gate = IdFileGate(id_path)
+        source = tmp_path / "new.txt"
+        source.write_text("5\n")
+        build_id_file(str(source), id_path)
+
+        assert gate._check_gate(42) == True
+        assert IdFileGate(id_path)._check_gate(5) == True
+        assert IdFileGate(id_path)._check_gate(42) == False
+
+    # Files that are not id files are rejected
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "bad.bin"
+        path.write_bytes(b"not an id file at all")
+        with pytest.raises(ValueError):
+            IdFileGate(str(path))
+
+    # Builds from the first csv column, skipping the header row
+    def test_build_from_csv(self, tmp_path):
+        source = tmp_path / "ids.csv"
+        source.write_text("user_id,name\n3,a\n1,b\n\n2,c\n")
+        output = tmp_path / "ids.bin"
+        assert build_id_file(str(source), str(output)) == 3
+        assert IdFileGate(str(output), entity_property="id")._check_gate({"id": 2}) == True
+
+    # Invalid ids after the first line are reported
+    def test_build_with_invalid_id(self, tmp_path):
+        source = tmp_path / "ids.txt"
+        source.write_text("1\nx\n")
+        with pytest.raises(ValueError):
+            build_id_file(str(source), str(tmp_path / "ids.bin"))
+
+    # Empty id files never match
+    def test_empty_file(self, tmp_path):
+        source = tmp_path / "ids.txt"
+        source.write_text("")
+        output = tmp_path / "ids.bin"
+        assert build_id_file(str(source), str(output)) == 0
+        assert IdFileGate(str(output))._check_gate(1) == False
+
+    # Batch checks match the scalar checks for integer columns
+    def test_batch(self, id_path):
+        np = pytest.importorskip("numpy")
+        PyGating.init()
+        config = {
+            "type": "GatingConfigurationAll",
+            "gates": [{"type": "IdFileGate", "path": id_path, "entity_property": "id"}],
+        }
+        column = np.array([-7, 7, 8, 42, 1000, 1001], dtype=np.int64)
+        assert PyGating.check_gating_batch(config, {"id": column}).tolist() == [
+            False, True, False, True, True, False
+        ]
+        column = np.array([7, 2**64 - 1, 2**64 - 2], dtype=np.uint64)
+        assert PyGating.check_gating_batch(config, {"id": column}).tolist() == [True, True, False]
+
+    def test_from_json_with_valid_data(self, id_path):
+        gate = IdFileGate.from_json({"path": id_path, "entity_property": "user.id", "allow": False})
+        assert gate.path == id_path
+        assert gate.entity_property == "user.id"
+        assert gate.check({"user": {"id": 42}}) == False
+
+    def test_from_json_without_path_raises_value_error(self):
+        with pytest.raises(ValueError):
+            IdFileGate.from_json({"entity_property": "id"})
+
+    # Flag sets holding id file gates are evaluated together, sharing gates on the same file
+    def test_evaluate_all(self, id_path):
+        PyGating.init()
+        gate_json = {"type": "IdFileGate", "path": id_path, "entity_property": "id"}
+        flags = {
+            name: {"type": "GatingConfigurationAll", "gates": [gate_json]} for name in ("a", "b")
+        }
+        flags["c"] = {"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate"}]}
+        PyGating.flag_store.load(flags)
+        try:
+            assert PyGating.evaluate_all({"id": 7}) == {"a": True, "b": True, "c": True}
+            assert PyGating.evaluate_all({"id": 2}) == {"a": False, "b": False, "c": True}
+            assert len(set(PyGating.flag_store.snapshot().shared_keys.values())) == 1
+        finally:
+            PyGating.flag_store.clear()
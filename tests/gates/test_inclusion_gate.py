@@ -72,3 +72,24 @@ class TestInclusionGate:
         }
         gate = InclusionGate.from_json(json_data)
         assert gate.valid_values == []
+
+    # Large value lists are matched through a hashed set
+    def test_large_valid_values(self):
+        gate = InclusionGate(valid_values=list(range(100000)))
+        assert gate._check_gate(99999) == True
+        assert gate._check_gate(100000) == False
+
+    # Unhashable values and probes are still matched like the list
+    def test_unhashable_values(self):
+        gate = InclusionGate(valid_values=["a", ["b"], {"c": 1}])
+        assert gate._check_gate(["b"]) == True
+        assert gate._check_gate({"c": 1}) == True
+        assert gate._check_gate("a") == True
+        assert gate._check_gate(["a"]) == False
+
+    # Reassigning valid_values rebuilds the lookup set
+    def test_reassign_valid_values(self):
+        gate = InclusionGate(valid_values=["a"])
+        gate.valid_values = ["b"]
+        assert gate._check_gate("b") == True
+        assert gate._check_gate("a") == False
@@ -60,3 +60,43 @@ class TestListContainerGate:
         }
         gate = ListContainertGate.from_json(json_data)
         assert gate.entity_property is None
+
+    # Should match when any of the tags is in the entity list
+    def test_tags_match_any(self):
+        gate = ListContainertGate(tags=["kiwi", "banana"])
+        assert gate._check_gate(["apple", "banana"]) == True
+        assert gate._check_gate(["apple"]) == False
+
+    # Should match only when all of the tags are in the entity list
+    def test_tags_match_all(self):
+        gate = ListContainertGate(tags=["apple", "banana"], match="all")
+        assert gate._check_gate(["apple", "banana", "cherry"]) == True
+        assert gate._check_gate(["apple", "cherry"]) == False
+
+    # Unhashable tags and list items are matched by equality
+    def test_tags_unhashable(self):
+        gate = ListContainertGate(tags=[["a"], "b"], match="all")
+        assert gate._check_gate([["a"], "b"]) == True
+        assert ListContainertGate(tags=["b"])._check_gate([["a"], "b"]) == True
+
+    # Should reject invalid tag combinations and match modes
+    def test_invalid_tags(self):
+        with pytest.raises(ValueError):
+            ListContainertGate("a", tags=["b"])
+        with pytest.raises(ValueError):
+            ListContainertGate(tags=[])
+        with pytest.raises(ValueError):
+            ListContainertGate(tags=["a"], match="some")
+
+    def test_from_json_with_tags(self):
+        gate = ListContainertGate.from_json({"tags": ["red", "blue"], "match": "all", "entity_property": "colors"})
+        assert gate._check_gate({"colors": ["blue", "red"]}) == True
+        assert gate._check_gate({"colors": ["blue"]}) == False
+
+    def test_from_json_with_invalid_tags_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ListContainertGate.from_json({"tags": "red"})
+        with pytest.raises(ValueError):
+            ListContainertGate.from_json({"tag": "red", "tags": ["blue"]})
+        with pytest.raises(ValueError):
+            ListContainertGate.from_json({"tags": ["red"], "match": "some"})
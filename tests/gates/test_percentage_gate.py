@@ -20,12 +20,12 @@ class TestPercentageGate:
 
     # PercentageGate with a percentage of 50 should return True for half of the entities and False for the other half
     def test_percentage_gate_percentage_50_fixed(self, mocker):
-        mocker.patch("hashlib.md5", return_value=Mock(hexdigest=lambda: "5000"))
+        mocker.patch("hashlib.md5", return_value=Mock(digest=lambda: bytes.fromhex("5000")))
         gate = PercentageGate(50)
         entity_true = "test_true"
         entity_false = "test_false"
         assert gate._check_gate(entity_true) == True
-        mocker.patch("hashlib.md5", return_value=Mock(hexdigest=lambda: "4999"))
+        mocker.patch("hashlib.md5", return_value=Mock(digest=lambda: bytes.fromhex("4999")))
         assert gate._check_gate(entity_false) == False
 
     # PercentageGate with a percentage of -1 should raise an exception
@@ -124,3 +124,50 @@ class TestPercentageGate:
         json_data = {"percentage": 50.0, "salt": "some_salt", "allow": True}
         gate = PercentageGate.from_json(json_data)
         assert gate.entity_property is None
+
+    # The md5 mode keeps the legacy hexdigest based buckets
+    def test_md5_mode_matches_legacy_hexdigest(self):
+        import hashlib
+
+        gate = PercentageGate(50, salt="salt")
+        for value in ["a", "user-1", "dfa2oi1nrffvnoivwe", "ünïcode"]:
+            legacy = int(hashlib.md5(str(value + "salt").encode()).hexdigest(), 16) % 10000
+            assert gate.bucket(value) == legacy
+
+    # The splitmix64 mode accepts integer and string properties and is consistent
+    def test_splitmix64_mode(self):
+        gate = PercentageGate(50, hash_mode="splitmix64", salt="salt")
+        assert gate.bucket(12345) == gate.bucket(12345)
+        assert gate.bucket("12345") == gate.bucket("12345")
+        assert 0 <= gate.bucket(-1) < 10000
+        assert gate._check_gate(12345) == (gate.bucket(12345) / 100.0 < 50)
+
+    # The splitmix64 mode spreads entities evenly over the buckets
+    def test_splitmix64_mode_distribution(self):
+        gate = PercentageGate(30, hash_mode="splitmix64")
+        passed = sum(gate._check_gate(value) for value in range(1, 20001))
+        assert 5600 < passed < 6400
+
+    # Different salts give different assignments in the splitmix64 mode
+    def test_splitmix64_mode_salt_changes_buckets(self):
+        first = PercentageGate(50, hash_mode="splitmix64", salt="a")
+        second = PercentageGate(50, hash_mode="splitmix64", salt="b")
+        assert [first.bucket(v) for v in range(20)] != [second.bucket(v) for v in range(20)]
+
+    # The md5 mode still requires string properties
+    def test_md5_mode_rejects_integers(self):
+        from src.pygating import GatingException
+
+        with pytest.raises(GatingException):
+            PercentageGate(50)._check_gate(12345)
+
+    def test_invalid_hash_mode_raises_value_error(self):
+        with pytest.raises(ValueError):
+            PercentageGate(50, hash_mode="crc32")
+
+    def test_from_json_with_hash_mode(self):
+        gate = PercentageGate.from_json({"percentage": 10, "hash_mode": "splitmix64"})
+        assert gate.hash_mode == "splitmix64"
+        assert PercentageGate.from_json({"percentage": 10}).hash_mode == "md5"
+        with pytest.raises(ValueError):
+            PercentageGate.from_json({"percentage": 10, "hash_mode": "crc32"})
@@ -1,3 +1,4 @@
+import re
 
 import pytest
 from src.pygating.gates import RegexGate
@@ -101,3 +102,78 @@ class TestRegexGate:
         }
         with pytest.raises(ValueError):
             RegexGate.from_json(json_data)
+
+    # The pattern is compiled once on construction
+    def test_pattern_is_precompiled(self, mocker):
+        gate = RegexGate(pattern=r'\d+')
+        match = mocker.patch("re.match")
+        assert gate.check("123") is True
+        match.assert_not_called()
+
+    # Invalid patterns raise when checking, like re.match would
+    def test_invalid_pattern_raises_on_check(self):
+        gate = RegexGate(pattern=r'(')
+        with pytest.raises(re.error):
+            gate.check("abc")
+
+    # Matches when any of the patterns matches at the start of the value
+    def test_multiple_patterns(self):
+        gate = RegexGate(patterns=[r'foo\d', r'bar', r'(?i)baz', r'(a)\1'])
+        assert gate.check("foo1") is True
+        assert gate.check("barx") is True
+        assert gate.check("BAZ") is True
+        assert gate.check("aa") is True
+        assert gate.check("xfoo1") is False
+        assert gate.check("ab") is False
+
+    # Mergeable patterns are combined into a single regular expression
+    def test_multiple_patterns_are_merged(self):
+        gate = RegexGate(patterns=[r'a(b)', r'c(?P<x>d)', r'(?i)e', r'(f)\1'])
+        assert len(gate._regexes) == 3
+
+    # Repeated values are answered from the bounded cache
+    def test_cache_size(self):
+        gate = RegexGate(pattern=r'\d+', cache_size=2)
+        for value in ["1", "1", "a", "1", "b", "c"]:
+            gate.check(value)
+        info = gate.match_value.cache_info()
+        assert info.hits == 2
+        assert info.currsize == 2
+
+    # Reassigning the patterns recompiles them and drops the cached matches
+    def test_reassign_patterns(self):
+        gate = RegexGate(pattern=r'\d+', cache_size=2)
+        assert gate.check("1")
+        gate.pattern = "a"
+        assert gate.patterns == ["a"]
+        assert not gate.check("1")
+        assert gate.check("a")
+        gate.patterns = ["b", "1"]
+        assert gate.pattern is None
+        assert gate.check("1") and gate.check("b") and not gate.check("a")
+        gate.patterns = ["("]
+        with pytest.raises(re.error):
+            gate.check("1")
+
+    def test_pattern_and_patterns_raise_value_error(self):
+        with pytest.raises(ValueError):
+            RegexGate(pattern="a", patterns=["b"])
+        with pytest.raises(ValueError):
+            RegexGate(patterns=[])
+        with pytest.raises(ValueError):
+            RegexGate()
+
+    def test_from_json_with_patterns(self):
+        gate = RegexGate.from_json({"patterns": ["a", "b"], "cache_size": 10, "entity_property": "text"})
+        assert gate.patterns == ["a", "b"]
+        assert gate.check({"text": "bc"}) is True
+
+    def test_from_json_with_invalid_patterns_raises_value_error(self):
+        with pytest.raises(ValueError):
+            RegexGate.from_json({"patterns": "a"})
+        with pytest.raises(ValueError):
+            RegexGate.from_json({"patterns": ["a", 1]})
+        with pytest.raises(ValueError):
+            RegexGate.from_json({"pattern": "a", "patterns": ["b"]})
+        with pytest.raises(ValueError):
+            RegexGate.from_json({"pattern": "a", "cache_size": -1})
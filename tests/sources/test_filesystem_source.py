@@ -0,0 +1,120 @@
+import json
+import os
+import time
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.sources import FileSystemSource
+
+
+def write_flag(directory, name, allow=True, content=None):
+    path = directory / f"{name}.json"
+    if content is None:
+        content = json.dumps({"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate", "allow": allow}]})
+    # Written next to the target and renamed in, like editors and deploy tools do
+    temporary = directory / f".{name}.tmp"
+    temporary.write_text(content)
+    os.replace(temporary, path)
+    return path
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def store():
+    PyGating.init()
+    return FlagStore()
+
+
+class TestFileSystemSource:
+    # Every flag file is loaded, named after the file
+    def test_load(self, tmp_path, store):
+        write_flag(tmp_path, "a")
+        write_flag(tmp_path, "b", allow=False)
+        (tmp_path / "notes.txt").write_text("ignored")
+        source = FileSystemSource(str(tmp_path), store=store)
+        assert source.load() == {"a", "b"}
+        assert store.check("a") is True
+        assert store.check("b") is False
+
+    # Only changed files are re-parsed, and removed files remove their flag
+    def test_poll_is_incremental(self, tmp_path, store):
+        write_flag(tmp_path, "a")
+        write_flag(tmp_path, "b")
+        source = FileSystemSource(str(tmp_path), store=store)
+        source.load()
+        unchanged = store.snapshot()["a"]
+
+        write_flag(tmp_path, "b", allow=False)
+        write_flag(tmp_path, "c")
+        assert source.poll() == {"b", "c"}
+        assert store.snapshot()["a"] is unchanged
+        assert store.check("b") is False
+
+        os.remove(tmp_path / "c.json")
+        assert source.poll() == {"c"}
+        assert "c" not in store
+        assert source.poll() == set()
+
+    # Invalid files keep the previous flag and are reported
+    def test_invalid_files(self, tmp_path, store):
+        write_flag(tmp_path, "a")
+        write_flag(tmp_path, "b")
+        errors = []
+        source = FileSystemSource(str(tmp_path), store=store, error_callback=lambda path, e: errors.append(path))
+        source.load()
+
+        write_flag(tmp_path, "a", content="{not json")
+        write_flag(tmp_path, "b", content=json.dumps({"type": "Unknown", "gates": []}))
+        write_flag(tmp_path, "c", allow=False)
+        assert source.poll() == {"c"}
+        assert store.check("a") is True
+        assert store.check("b") is True
+        assert store.check("c") is False
+        assert sorted(os.path.basename(path) for path in errors) == ["a.json", "b.json"]
+
+    # The watcher picks up changes through inotify or polling
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_watch(self, tmp_path, store, use_inotify):
+        write_flag(tmp_path, "a")
+        source = FileSystemSource(
+            str(tmp_path), store=store, debounce=0.02, poll_interval=0.05, use_inotify=use_inotify
+        )
+        with source:
+            assert store.check("a") is True
+            write_flag(tmp_path, "a", allow=False)
+            assert wait_for(lambda: store.check("a") is False)
+            write_flag(tmp_path, "b")
+            assert wait_for(lambda: "b" in store)
+        assert source.inotify is None
+
+    # With inotify, changes it does not report are picked up by the periodic rescan
+    def test_rescan_without_events(self, tmp_path, store, mocker):
+        write_flag(tmp_path, "a")
+        source = FileSystemSource(str(tmp_path), store=store, poll_interval=0.02, rescan_interval=0.1)
+        with source:
+            if source.inotify is None:
+                pytest.skip("inotify is not available")
+            mocker.patch.object(source.inotify, "wait", side_effect=lambda timeout: time.sleep(timeout) or False)
+            write_flag(tmp_path, "a", allow=False)
+            assert wait_for(lambda: store.check("a") is False)
+
+    # Bursts of edits are applied once the directory is quiet
+    def test_debounce(self, tmp_path, store, mocker):
+        source = FileSystemSource(str(tmp_path), store=store, debounce=0.3, poll_interval=0.02)
+        with source:
+            update = mocker.spy(store, "update")
+            for index in range(5):
+                write_flag(tmp_path, f"flag{index}")
+                time.sleep(0.02)
+            assert wait_for(lambda: len(store) == 5)
+            assert update.call_count == 1
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.sources import BundleServer, HTTPSource
+
+
+def flag(allow=True):
+    return {"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate", "allow": allow}]}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def store():
+    PyGating.init()
+    return FlagStore()
+
+
+@pytest.fixture
+def server():
+    with BundleServer({"a": flag(), "b": flag()}) as server:
+        yield server
+
+
+class TestHTTPSource:
+    # Unchanged bundles are answered with a 304 over the same connection
+    def test_conditional_fetch(self, server, store):
+        source = HTTPSource(server.url, store=store)
+        assert source.load() == {"a", "b"}
+        assert store.check("a") is True
+        assert source.poll() == set()
+        assert source.poll() == set()
+        assert server.requests == 3
+        assert server.downloads == 1
+        assert server.connections == 1
+        source.stop()
+
+    # Only changed flags are re-parsed, and flags missing from the bundle are removed
+    def test_changed_flags(self, server, store, mocker):
+        source = HTTPSource(server.url, store=store)
+        source.load()
+        unchanged = store.snapshot()["a"]
+
+        parse = mocker.spy(PyGating, "_parse_gate_configuration_from_json")
+        server.publish({"a": flag(), "c": flag(False)})
+        assert source.poll() == {"b", "c"}
+        assert store.snapshot()["a"] is unchanged
+        assert "b" not in store
+        assert store.check("c") is False
+        assert parse.call_count == 1
+        source.stop()
+
+    # Invalid flags keep their previous version and are reported
+    def test_invalid_flags(self, server, store):
+        errors = []
+        source = HTTPSource(server.url, store=store, error_callback=lambda origin, e: errors.append(origin))
+        source.load()
+
+        server.publish({"a": {"type": "Unknown", "gates": []}, "b": flag(False)})
+        assert source.poll() == {"b"}
+        assert store.check("a") is True
+        assert store.check("b") is False
+        assert errors == ["a"]
+        source.stop()
+
+    # A server restart drops the keep-alive connection, the request is retried on a new one
+    def test_reconnect(self, store):
+        with BundleServer({"a": flag()}) as server:
+            source = HTTPSource(server.url, store=store)
+            source.load()
+            port = server.port
+
+        with BundleServer({"a": flag(False)}, port=port) as server:
+            assert source.poll() == {"a"}
+            assert store.check("a") is False
+        source.stop()
+
+    # Failed polls back off exponentially up to max_backoff
+    def test_backoff(self):
+        source = HTTPSource("http://127.0.0.1:1/flags", store=FlagStore(), backoff=1.0, max_backoff=5.0)
+        delays = [source._retry_delay(failures) for failures in range(1, 6)]
+        for delay, expected in zip(delays, [1.0, 2.0, 4.0, 5.0, 5.0]):
+            assert expected / 2 <= delay <= expected
+
+    # Server-sent events trigger a fetch, and stop() interrupts the stream
+    def test_stream(self, server, store):
+        source = HTTPSource(server.url, store=store, stream_url=server.stream_url, poll_interval=60)
+        with source:
+            assert wait_for(lambda: source._stream is not None)
+            server.publish({"a": flag(False), "b": flag()})
+            assert wait_for(lambda: store.check("a") is False)
+        assert source._stream is None
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.sources import SQLiteConfigRepository, SQLiteSource
+
+
+def flag(allow=True):
+    return {"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate", "allow": allow}]}
+
+
+@pytest.fixture
+def store():
+    PyGating.init()
+    return FlagStore()
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteConfigRepository(str(tmp_path / "flags.db"))
+    yield repository
+    repository.close()
+
+
+class TestSQLiteConfigRepository:
+    # Every write gets the next version, deletes leave tombstones in the change feed
+    def test_changes_since(self, repository):
+        assert repository.current_version() == 0
+        assert repository.put_many({"a": flag(), "b": flag()}) == 1
+        assert repository.put("a", flag(False)) == 2
+        assert repository.delete("b") == 3
+        assert repository.get("a") == flag(False)
+        assert repository.get("b") is None
+
+        changes = repository.changes_since(1)
+        assert [(change.name, change.version, change.deleted) for change in changes] == [("a", 2, False), ("b", 3, True)]
+        assert repository.changes_since(3) == []
+
+    # Concurrent writers never commit the same version
+    def test_concurrent_writes(self, repository):
+        versions = []
+
+        def write(index):
+            for step in range(10):
+                versions.append(repository.put(f"flag{index}", flag(step % 2 == 0)))
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(versions) == list(range(1, 41))
+        assert repository.current_version() == 40
+
+    # Invalid table names are rejected before reaching SQL
+    def test_invalid_table(self, tmp_path):
+        with pytest.raises(ValueError):
+            SQLiteConfigRepository(str(tmp_path / "flags.db"), table="flags; DROP TABLE x")
+
+
+class TestSQLiteSource:
+    # Only the rows changed since the last poll are applied
+    def test_poll_is_incremental(self, repository, store):
+        repository.put_many({"a": flag(), "b": flag()})
+        source = SQLiteSource(repository, store=store)
+        assert source.load() == {"a", "b"}
+        unchanged = store.snapshot()["a"]
+
+        repository.put("b", flag(False))
+        repository.put("c", flag())
+        assert source.poll() == {"b", "c"}
+        assert store.snapshot()["a"] is unchanged
+        assert store.check("b") is False
+
+        repository.delete("c")
+        assert source.poll() == {"c"}
+        assert "c" not in store
+        assert source.poll() == set()
+
+    # Invalid rows keep the previous flag, are reported, and are not retried until rewritten
+    def test_invalid_rows(self, repository, store):
+        repository.put_many({"a": flag(), "b": flag()})
+        errors = []
+        source = SQLiteSource(repository, store=store, error_callback=lambda name, e: errors.append(name))
+        source.load()
+
+        repository.put("a", "{not json")
+        repository.put("b", {"type": "Unknown", "gates": []})
+        repository.put("c", flag(False))
+        assert source.poll() == {"c"}
+        assert store.check("a") is True
+        assert store.check("b") is True
+        assert sorted(errors) == ["a", "b"]
+        assert source.poll() == set()
+
+        repository.put("a", flag(False))
+        assert source.poll() == {"a"}
+        assert store.check("a") is False
+
+    # The watcher thread applies new versions
+    def test_watch(self, repository, store):
+        repository.put("a", flag())
+        with SQLiteSource(repository, store=store, poll_interval=0.02) as source:
+            assert store.check("a") is True
+            repository.put("a", flag(False))
+            changed = threading.Event()
+            for _ in range(250):
+                if store.check("a") is False:
+                    changed.set()
+                    break
+                changed.wait(0.02)
+            assert changed.is_set()
+        assert source._thread is None
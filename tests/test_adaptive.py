@@ -0,0 +1,130 @@
+import random
+from typing import Any, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from src.pygating import AbstractGate, GatingException, PyGating
+from src.pygating import adaptive
+from src.pygating.adaptive import adaptive_evaluator, side_effect_free
+from src.pygating.gates import AndGate, CustomScriptGate, InclusionGate, OrGate, RegexGate, SimpleGate
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+
+class SlowGate(AbstractGate):
+    side_effect_free = True
+    static_cost = 0.5
+
+    def __init__(self, result: bool, iterations: int = 2000, allow: bool = True):
+        super().__init__(allow=allow)
+        self.result = result
+        self.iterations = iterations
+
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        sum(range(self.iterations))
+        return self.result
+
+
+class UntrustedGate(InclusionGate):
+    def _check_gate(self, entity: Any) -> bool:
+        return super()._check_gate(entity)
+
+
+class RaisingGate(AbstractGate):
+    side_effect_free = True
+
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        raise GatingException("Simulated exception in gate check")
+
+
+def root_order(config):
+    # Declaration indexes of the root gates in evaluation order
+    evaluator = adaptive_evaluator(config, isinstance(config, GatingConfigurationAny))
+    checks = [child.check.__self__ for child in evaluator.root.order]
+    return [config.gates.index(gate) for gate in checks]
+
+
+class TestAdaptiveConfigurations:
+    # Before statistics exist children are ordered by static cost
+    def test_static_cost_order(self):
+        config = GatingConfigurationAll(
+            gates=[RegexGate("a", entity_property="name"), InclusionGate(["a"], entity_property="name"), SimpleGate()],
+            adaptive=True,
+        )
+        assert config.check({"name": "a"}) is True
+        assert root_order(config) == [2, 1, 0]
+
+    # Cheap, selective children move to the front once sampled
+    def test_reorders_by_cost_and_pass_rate(self, monkeypatch):
+        monkeypatch.setattr(adaptive, "SAMPLE_INTERVAL", 1)
+        monkeypatch.setattr(adaptive, "REORDER_INTERVAL", 8)
+        expensive = SlowGate(True, iterations=20000)
+        selective = SlowGate(False, iterations=10)
+        config = GatingConfigurationAll(gates=[SimpleGate(), expensive, selective], adaptive=True)
+        for _ in range(16):
+            assert config.check() is False
+        assert root_order(config)[0] == 2
+
+    # Adaptive evaluation returns exactly the declaration order results
+    @pytest.mark.parametrize("configuration_type", [GatingConfigurationAll, GatingConfigurationAny])
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_results_match_declaration_order(self, monkeypatch, configuration_type, fail_closed):
+        monkeypatch.setattr(adaptive, "SAMPLE_INTERVAL", 2)
+        monkeypatch.setattr(adaptive, "REORDER_INTERVAL", 4)
+        gates = [
+            NumericComparisonGate("ge", 30, entity_property="age"),
+            OrGate(gates=[InclusionGate(["CA"], entity_property="country"), RegexGate("^b", entity_property="name")]),
+            AndGate(gates=[NumericComparisonGate("lt", 60, entity_property="age"), RegexGate("a", entity_property="name")], allow=False),
+            InclusionGate(["US", "FR"], entity_property="country", allow=False),
+        ]
+        plain = configuration_type(gates=gates, fail_closed=fail_closed)
+        adaptive_config = configuration_type(gates=gates, fail_closed=fail_closed, adaptive=True)
+        rng = random.Random(3)
+        for _ in range(500):
+            entity = {
+                "age": rng.choice([rng.randint(0, 90), "unknown"]),
+                "country": rng.choice(["CA", "US", "FR", "DE"]),
+                "name": rng.choice(["bob", "alice", "ann", None]),
+            }
+            assert adaptive_config.check(entity) == plain.check(entity)
+
+    # Roots whose exceptions do not match their short-circuit result keep declaration order
+    def test_unsafe_roots_are_not_reordered(self):
+        gates = [RegexGate("a"), SimpleGate()]
+        assert not adaptive_evaluator(GatingConfigurationAll(gates=gates, fail_closed=False), False).root.reorder
+        assert not adaptive_evaluator(GatingConfigurationAny(gates=gates, fail_closed=True), True).root.reorder
+        assert adaptive_evaluator(GatingConfigurationAll(gates=gates, fail_closed=True), False).root.reorder
+        assert adaptive_evaluator(GatingConfigurationAny(gates=gates, fail_closed=False), True).root.reorder
+
+    # Gates with side effects are never reordered
+    def test_side_effects_keep_declaration_order(self):
+        script = Mock(return_value=False)
+        config = GatingConfigurationAll(gates=[CustomScriptGate(script), SimpleGate()], adaptive=True)
+        assert config.check() is False
+        assert not adaptive_evaluator(config, False).root.reorder
+        assert not side_effect_free(UntrustedGate(["a"]))
+        assert not side_effect_free(AndGate(gates=[SimpleGate(), CustomScriptGate(script)]))
+
+    # Raising gates are handled according to fail_closed
+    def test_exceptions(self):
+        config = GatingConfigurationAll(gates=[SimpleGate(), RaisingGate()], adaptive=True)
+        callback = Mock()
+        assert config.check(exception_callback=callback) is False
+        callback.assert_called_once()
+
+    # A replaced gates list rebuilds the evaluator
+    def test_replaced_gates(self):
+        config = GatingConfigurationAll(gates=[SimpleGate()], adaptive=True)
+        assert config.check() is True
+        config.gates = [SimpleGate(allow=False)]
+        assert config.check() is False
+
+    def test_from_json(self):
+        PyGating.init()
+        config = GatingConfigurationAny.from_json(
+            {"type": "GatingConfigurationAny", "adaptive": True, "gates": [{"type": "SimpleGate"}]}
+        )
+        assert config.adaptive is True
+        with pytest.raises(ValueError):
+            GatingConfigurationAny.from_json({"adaptive": "yes", "gates": []})
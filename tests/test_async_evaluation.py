@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.gates import AndGate, CustomScriptGate, InclusionGate
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gates.property_gating_type import PropertyGatingType
+from src.pygating.gating_configurations import GatingConfigurationAll
+
+
+class User:
+    def __init__(self, user_id, country, age):
+        self.user_id = user_id
+        self.country = country
+        self.age = age
+        self.loads = 0
+
+    async def profile(self):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return {"country": self.country, "age": self.age}
+
+    async def broken(self):
+        raise ValueError("lookup failed")
+
+
+def flag(*gates, config_type="GatingConfigurationAll", **params):
+    return {"type": config_type, "gates": list(gates), **params}
+
+
+FLAGS = [
+    flag({"type": "InclusionGate", "valid_values": ["fr", "de"], "entity_property": "country"}),
+    flag(
+        {"type": "InclusionGate", "valid_values": ["fr"], "entity_property": "country"},
+        {"type": "RegexGate", "pattern": "^user[12]", "entity_property": "user_id"},
+    ),
+    flag(
+        {"type": "BooleanGate", "entity_property": "missing"},
+        {"type": "OrGate", "gates": [{"type": "SimpleGate", "allow": False}, {"type": "SimpleGate"}]},
+        config_type="GatingConfigurationAny",
+    ),
+    flag({"type": "BooleanGate", "entity_property": "missing"}, fail_closed=False),
+    flag({"type": "PercentageGate", "percentage": 50, "entity_property": "user_id", "salt": "s"}),
+]
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+class TestCheckGatingAsync:
+    # Results equal check_gating for synchronous entities
+    @pytest.mark.parametrize("configuration", FLAGS)
+    @pytest.mark.parametrize("user", [User("user1", "fr", 30), User("user2", "de", 12), User("user3", "us", 50)])
+    def test_matches_check_gating(self, configuration, user):
+        errors, async_errors = [], []
+        expected = PyGating.check_gating(configuration, user, exception_callback=errors.append)
+        assert asyncio.run(PyGating.check_gating_async(configuration, user, async_errors.append)) == expected
+        assert [type(error) for error in async_errors] == [type(error) for error in errors]
+
+    # Awaitable properties are awaited once per path prefix, even across concurrent branches
+    def test_awaitable_properties(self):
+        configuration = GatingConfigurationAll(
+            gates=[
+                AndGate(
+                    [
+                        InclusionGate(["fr"], entity_property="profile.country"),
+                        NumericComparisonGate("ge", 18, entity_property="profile.age"),
+                    ]
+                ),
+                InclusionGate(["fr"], entity_property="profile.country"),
+            ]
+        )
+
+        adult, minor = User("user1", "fr", 30), User("user2", "fr", 12)
+        assert asyncio.run(PyGating.check_gating_async(configuration, adult))
+        assert not asyncio.run(PyGating.check_gating_async(configuration, minor))
+        assert adult.loads == 1
+        assert minor.loads == 1
+
+    # Exceptions raised by awaited properties are reported like synchronous ones
+    def test_awaitable_property_errors(self):
+        errors = []
+        configuration = GatingConfigurationAll(gates=[InclusionGate(["fr"], entity_property="broken.country")])
+        assert not asyncio.run(PyGating.check_gating_async(configuration, User("user1", "fr", 30), errors.append))
+        assert len(errors) == 1
+        assert isinstance(errors[0], ValueError)
+
+    # Async script functions are awaited
+    def test_async_scripts(self):
+        async def is_adult(entity):
+            await asyncio.sleep(0)
+            return entity.age >= 18
+
+        configuration = GatingConfigurationAll(gates=[CustomScriptGate(is_adult, allow=False)])
+        assert not asyncio.run(PyGating.check_gating_async(configuration, User("user1", "fr", 30)))
+        assert asyncio.run(PyGating.check_gating_async(configuration, User("user2", "fr", 12)))
+
+    # Independent branches run concurrently, the first decisive one cancels the others
+    def test_concurrent_short_circuit(self):
+        started, cancelled = [], []
+
+        def lookup(delay, result):
+            async def script(entity):
+                started.append(delay)
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    cancelled.append(delay)
+                    raise
+                return result
+
+            return CustomScriptGate(script, pure=True)
+
+        # Failing closed, a raise gives the same result as a gate closing the configuration
+        configuration = GatingConfigurationAll(gates=[AndGate([lookup(10, True), lookup(0.01, False)]), lookup(10, True)])
+
+        async def check():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await PyGating.check_gating_async(configuration, User("user1", "fr", 30))
+            return result, loop.time() - start
+
+        result, elapsed = asyncio.run(check())
+        assert not result
+        assert elapsed < 5
+        assert sorted(started) == [0.01, 10, 10]
+        assert cancelled == [10, 10]
+
+    # Gates with side effects run in declaration order and still short-circuit
+    def test_side_effects_in_order(self):
+        calls = []
+
+        def script(name, result):
+            async def run(entity):
+                calls.append(name)
+                await asyncio.sleep(0)
+                return result
+
+            return CustomScriptGate(run)
+
+        configuration = GatingConfigurationAll(gates=[script("a", True), script("b", False), script("c", True)])
+        assert not asyncio.run(PyGating.check_gating_async(configuration, User("user1", "fr", 30)))
+        assert calls == ["a", "b"]
+
+    # Custom gates reading their property through entity_value get awaited values
+    def test_custom_gate(self):
+        class AdultGate(PropertyGatingType):
+            def __init__(self, entity_property):
+                super().__init__(property_type=int, entity_property=entity_property)
+
+            def _check_gate(self, entity):
+                return self.entity_value(entity) >= 18
+
+        configuration = GatingConfigurationAll(gates=[AdultGate("profile.age"), AdultGate("profile.age")])
+        adult, minor = User("user1", "fr", 30), User("user2", "fr", 12)
+        assert asyncio.run(PyGating.check_gating_async(configuration, adult))
+        assert not asyncio.run(PyGating.check_gating_async(configuration, minor))
+        assert adult.loads == 1
+        assert minor.loads == 1
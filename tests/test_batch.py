@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from src.pygating import AbstractGate, GatingException, PyGating
+from src.pygating.batch import GatingBatch
+from src.pygating.gates import (
+    AndGate,
+    BooleanGate,
+    CustomScriptGate,
+    DateGate,
+    InclusionGate,
+    OrGate,
+    PercentageGate,
+    RegexGate,
+    SimpleGate,
+)
+from src.pygating.gates.date_comparison_gate import DateComparisonGate
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+np = pytest.importorskip("numpy")
+
+
+class OddAgeGate(AbstractGate):
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        return entity["user"]["age"] % 2 == 1
+
+
+def make_columns(size=200, seed=7):
+    rng = np.random.default_rng(seed)
+    return {
+        "user.age": rng.integers(0, 90, size),
+        "user.score": rng.random(size) * 100,
+        "user.country": rng.choice(np.array(["CA", "US", "FR", "DE"]), size),
+        "user.beta": rng.random(size) < 0.5,
+        "user.created_at": np.datetime64("2021-01-01") + rng.integers(0, 1500, size).astype("timedelta64[D]"),
+        "id": np.array([f"user-{i}" for i in range(size)]),
+    }
+
+
+def assert_matches_scalar(config, columns):
+    mask = PyGating.check_gating_batch(config, columns)
+    batch = GatingBatch(columns)
+    expected = [config.check(batch.row(index)) for index in range(batch.size)]
+    assert mask.dtype == bool
+    assert mask.tolist() == expected
+
+
+class TestCheckGatingBatch:
+    # Vectorised kernels match the scalar path for every built-in gate
+    @pytest.mark.parametrize("configuration_type", [GatingConfigurationAll, GatingConfigurationAny])
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_matches_scalar_results(self, configuration_type, fail_closed):
+        config = configuration_type(
+            fail_closed=fail_closed,
+            gates=[
+                SimpleGate(),
+                OrGate(
+                    gates=[
+                        InclusionGate(["CA", "FR", 3], entity_property="user.country"),
+                        AndGate(
+                            gates=[
+                                BooleanGate(entity_property="user.beta", allow=False),
+                                NumericComparisonGate("ge", 18, entity_property="user.age"),
+                            ]
+                        ),
+                    ]
+                ),
+                NumericComparisonGate("lt", 75.5, entity_property="user.score"),
+                DateGate(start_date=datetime(2022, 1, 1), end_date=datetime(2023, 6, 1), entity_property="user.created_at"),
+                DateComparisonGate("ge", datetime(2021, 6, 1), entity_property="user.created_at"),
+                PercentageGate(50, entity_property="id"),
+            ],
+        )
+        assert_matches_scalar(config, make_columns())
+
+    # Gates without a kernel are checked per row, and custom gates work on row entities
+    def test_row_fallback(self):
+        config = GatingConfigurationAll(
+            gates=[OddAgeGate(), RegexGate("user-1", entity_property="id", allow=False)]
+        )
+        assert_matches_scalar(config, make_columns())
+
+    # Type errors are handled according to fail_closed only for rows that reach the gate
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_type_errors_follow_short_circuit(self, fail_closed):
+        config = GatingConfigurationAll(
+            fail_closed=fail_closed,
+            gates=[
+                InclusionGate(["CA"], entity_property="user.country"),
+                NumericComparisonGate("gt", 10, entity_property="user.country"),
+            ],
+        )
+        assert_matches_scalar(config, make_columns())
+
+    # Missing columns fail every row like a missing property would
+    def test_missing_column(self):
+        config = GatingConfigurationAll(gates=[BooleanGate(entity_property="user.unknown")])
+        callback = Mock()
+        mask = PyGating.check_gating_batch(config, make_columns(10), exception_callback=callback)
+        assert not mask.any()
+        assert callback.call_count == 10
+        assert isinstance(callback.call_args[0][0], GatingException)
+
+    # Kernel errors are reported once per failing gate
+    def test_kernel_errors_reported_once(self):
+        config = GatingConfigurationAll(gates=[BooleanGate(entity_property="user.age")])
+        callback = Mock()
+        mask = PyGating.check_gating_batch(config, make_columns(10), exception_callback=callback)
+        assert not mask.any()
+        callback.assert_called_once()
+
+    # Not a time datetimes fail the datetime type check
+    def test_nat_values(self):
+        columns = {"created_at": np.array(["2022-01-01", "NaT"], dtype="datetime64[s]")}
+        config = GatingConfigurationAll(gates=[DateGate(start_date=datetime(2021, 1, 1), entity_property="created_at")])
+        assert PyGating.check_gating_batch(config, columns).tolist() == [True, False]
+
+    # Timezone aware bounds compare with naive rows as UTC, like the scalar path
+    def test_aware_dates(self):
+        columns = {"created_at": np.array(["2022-01-01", "2022-01-01T01:00", "NaT"], dtype="datetime64[s]")}
+        aware = datetime(2022, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+        config = GatingConfigurationAll(
+            gates=[DateGate(start_date=datetime(2021, 1, 1, tzinfo=timezone.utc), entity_property="created_at")]
+        )
+        assert_matches_scalar(config, columns)
+
+        config = GatingConfigurationAll(gates=[DateComparisonGate("le", aware, entity_property="created_at")])
+        assert_matches_scalar(config, columns)
+        assert PyGating.check_gating_batch(config, columns).tolist() == [True, False, False]
+
+    # Gates after a short-circuit are never called for the decided rows
+    def test_short_circuit_skips_rows(self):
+        script = Mock(return_value=True)
+        config = GatingConfigurationAll(
+            gates=[
+                NumericComparisonGate("ge", 50, entity_property="user.age"),
+                CustomScriptGate(script_function=script),
+            ]
+        )
+        columns = make_columns(50)
+        PyGating.check_gating_batch(config, columns)
+        assert script.call_count == int((columns["user.age"] >= 50).sum())
+
+    # Json configurations are accepted
+    def test_json_configuration(self):
+        PyGating.init()
+        config = {
+            "type": "GatingConfigurationAny",
+            "gates": [{"type": "InclusionGate", "valid_values": ["CA"], "entity_property": "user.country"}],
+        }
+        columns = make_columns(20)
+        assert PyGating.check_gating_batch(config, columns).tolist() == (columns["user.country"] == "CA").tolist()
+
+    # Columns must be consistent
+    def test_invalid_columns(self):
+        with pytest.raises(ValueError):
+            GatingBatch({})
+        with pytest.raises(ValueError):
+            GatingBatch({"a": np.zeros(2), "b": np.zeros(3)})
+        with pytest.raises(ValueError):
+            GatingBatch({"a": np.zeros(2), "a.b": np.zeros(2)})
+
+    # Both hash modes bucket numpy columns exactly like the scalar path
+    @pytest.mark.parametrize("hash_mode", ["md5", "splitmix64"])
+    def test_percentage_hash_modes(self, hash_mode):
+        config = GatingConfigurationAll(
+            gates=[PercentageGate(40, entity_property="id", salt="s", hash_mode=hash_mode)]
+        )
+        assert_matches_scalar(config, make_columns())
+
+    # The splitmix64 mode buckets integer columns without leaving numpy
+    def test_percentage_splitmix64_integer_column(self):
+        config = GatingConfigurationAll(
+            gates=[PercentageGate(40, entity_property="user.id", hash_mode="splitmix64")]
+        )
+        columns = {"user.id": np.arange(-100, 10000, dtype=np.int64)}
+        assert_matches_scalar(config, columns)
+
+    # Mixed int and float comparisons are exact, like python compares them
+    def test_mixed_int_float(self):
+        large = {"int": np.array([2**53 + 1, 3], dtype=np.int64), "float": np.array([2.0**53, 3.0])}
+        for gate in (
+            NumericComparisonGate("gt", float(2**53), entity_property="int"),
+            NumericComparisonGate("eq", 2**53 + 1, entity_property="float"),
+            NumericComparisonGate("lt", 2**70, entity_property="int"),
+            InclusionGate([float(2**53), 3.0], entity_property="int"),
+            InclusionGate([2**53 + 1, 2**70], entity_property="float"),
+            InclusionGate([2**53 + 1, 2**70, "3"], entity_property="int"),
+        ):
+            assert_matches_scalar(GatingConfigurationAll(gates=[gate]), large)
+
+        small = {"float32": np.array([0.1, 0.5], dtype=np.float32)}
+        assert_matches_scalar(GatingConfigurationAll(gates=[NumericComparisonGate("eq", 0.1, entity_property="float32")]), small)
+        assert_matches_scalar(GatingConfigurationAll(gates=[InclusionGate([0.1], entity_property="float32")]), small)
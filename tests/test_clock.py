@@ -0,0 +1,163 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.clock import Clock, CoarseClock, SystemClock, get_clock, set_clock
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import AndGate, CustomScriptGate, DateGate, OrGate, SimpleGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+
+class FixedClock(Clock):
+    def __init__(self, now: datetime):
+        self.current = now
+        self.reads = 0
+
+    def now(self) -> datetime:
+        self.reads += 1
+        return self.current
+
+
+@pytest.fixture
+def clock():
+    clock = FixedClock(datetime(2024, 1, 1))
+    set_clock(clock)
+    yield clock
+    set_clock(None)
+
+
+class TestClock:
+    # The global clock defaults to the system clock and is injectable
+    def test_set_clock(self, clock):
+        assert get_clock() is clock
+        assert DateGate(start_date=datetime(2023, 12, 31)).check()
+        assert not DateGate(start_date=datetime(2024, 1, 2)).check()
+
+        PyGating.set_clock(None)
+        assert isinstance(get_clock(), SystemClock)
+
+    # A gate's own clock takes precedence over the global one
+    def test_gate_clock(self, clock):
+        gate = DateGate(end_date=datetime(2024, 6, 1), entity_property="date", clock=FixedClock(datetime(2025, 1, 1)))
+        assert not gate.check()
+        # Entities are compared by their own date
+        assert gate.check({"date": datetime(2024, 1, 1)})
+
+    # The coarse clock serves the wrapped clock's time refreshed by a background thread
+    def test_coarse_clock(self):
+        source = FixedClock(datetime(2024, 1, 1))
+        coarse = CoarseClock(resolution=0.001, clock=source)
+        try:
+            assert coarse.now() == datetime(2024, 1, 1)
+            source.current = datetime(2024, 1, 2)
+            deadline = time.monotonic() + 5
+            while coarse.now() != datetime(2024, 1, 2) and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert coarse.now() == datetime(2024, 1, 2)
+        finally:
+            coarse.stop()
+
+        reads = source.reads
+        time.sleep(0.01)
+        assert source.reads == reads
+
+        with pytest.raises(ValueError):
+            CoarseClock(resolution=0)
+
+
+class TestTimeBoundary:
+    # The next boundary is the earliest start_date or end_date crossing across the whole tree
+    def test_next_time_boundary(self):
+        start, end = datetime(2024, 3, 1), datetime(2024, 6, 1)
+        configuration = GatingConfigurationAll(
+            gates=[
+                SimpleGate(),
+                AndGate([DateGate(start_date=start), OrGate([DateGate(end_date=end)])]),
+            ]
+        )
+
+        assert configuration.next_time_boundary(datetime(2024, 1, 1)) == start
+        assert configuration.next_time_boundary(start) == end + timedelta(microseconds=1)
+        assert configuration.next_time_boundary(end) == end + timedelta(microseconds=1)
+        assert configuration.next_time_boundary(datetime(2025, 1, 1)) is None
+        assert GatingConfigurationAny(gates=[SimpleGate()]).next_time_boundary(datetime(2024, 1, 1)) is None
+        assert GatingConfigurationAll(gates=[DateGate(end_date=datetime.max)]).next_time_boundary(start) is None
+
+    # Without an entity, pure flags are served as constants until their next time boundary
+    def test_constant_until_boundary(self, clock):
+        calls = []
+
+        def script(entity):
+            calls.append(entity)
+            return True
+
+        store = FlagStore()
+        start, end = datetime(2024, 1, 10), datetime(2024, 1, 20)
+        store.load(
+            {
+                "launch": GatingConfigurationAll(
+                    gates=[CustomScriptGate(script, pure=True), DateGate(start_date=start, end_date=end)]
+                ),
+            }
+        )
+
+        results = []
+        for day in [1, 2, 9, 10, 15, 20, 21, 22]:
+            clock.current = datetime(2024, 1, day)
+            results.append(store.check("launch"))
+
+        assert results == [False, False, False, True, True, True, False, False]
+        # Re-evaluated only when crossing start_date and end_date
+        assert len(calls) == 3
+
+        # Clocks going backwards are re-evaluated too
+        clock.current = datetime(2024, 1, 15)
+        assert store.check("launch")
+        assert len(calls) == 4
+
+    # Impure flags and flags that raised are evaluated on every check
+    def test_not_constant(self, clock):
+        calls = []
+
+        def script(entity):
+            calls.append(entity)
+            raise ValueError("boom")
+
+        store = FlagStore()
+        store.load(
+            {
+                "impure": GatingConfigurationAll(gates=[CustomScriptGate(lambda entity: calls.append(entity) or True)]),
+                "raises": GatingConfigurationAll(gates=[CustomScriptGate(script, pure=True)]),
+            }
+        )
+
+        errors = []
+        for _ in range(2):
+            assert store.check("impure")
+            assert not store.check("raises", exception_callback=errors.append)
+
+        assert len(calls) == 4
+        assert len(errors) == 2
+
+    # Flags with gates reading their own clock are not served as constants
+    def test_own_clock_not_constant(self, clock):
+        own = FixedClock(datetime(2024, 1, 1))
+        store = FlagStore()
+        store.load(
+            {"launch": GatingConfigurationAll(gates=[OrGate([DateGate(start_date=datetime(2024, 1, 10), clock=own)])])}
+        )
+
+        assert not store.check("launch")
+        own.current = datetime(2024, 1, 15)
+        assert store.check("launch")
+
+    # Clocks switching between naive and aware datetimes re-evaluate the constant
+    def test_constant_aware_clock(self, clock):
+        store = FlagStore()
+        store.load({"launch": GatingConfigurationAll(gates=[DateGate(start_date=datetime(2024, 1, 10))])})
+
+        assert not store.check("launch")
+        clock.current = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        assert store.check("launch")
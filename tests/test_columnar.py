@@ -0,0 +1,152 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.pygating import GatingException, PyGating
+from src.pygating.columnar import arrow_columns, dataframe_columns
+from src.pygating.gates import BooleanGate, DateGate, InclusionGate, OrGate, SimpleGate
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gating_configurations import GatingConfigurationAll
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+def make_configuration(fail_closed=True):
+    return GatingConfigurationAll(
+        fail_closed=fail_closed,
+        gates=[
+            OrGate(
+                gates=[
+                    InclusionGate(["CA", "FR"], entity_property="user.country"),
+                    BooleanGate(entity_property="user.beta"),
+                ]
+            ),
+            NumericComparisonGate("ge", 18, entity_property="user.age"),
+            DateGate(start_date=datetime(2022, 1, 1), entity_property="user.created_at"),
+        ],
+    )
+
+
+USERS = [
+    {"country": "CA", "beta": False, "age": 30, "created_at": datetime(2022, 5, 1)},
+    {"country": "US", "beta": True, "age": 17, "created_at": datetime(2023, 1, 1)},
+    {"country": "US", "beta": False, "age": 40, "created_at": datetime(2022, 5, 1)},
+    {"country": "FR", "beta": True, "age": 25, "created_at": datetime(2021, 1, 1)},
+    {"country": "DE", "beta": True, "age": 65, "created_at": datetime(2024, 2, 29)},
+]
+
+
+def expected(configuration, users):
+    return [configuration.check({"user": user}) for user in users]
+
+
+class TestCheckGatingDataframe:
+    pd = pytest.importorskip("pandas")
+
+    def make_frame(self):
+        columns = {f"user.{key}": [user[key] for user in USERS] for key in USERS[0]}
+        columns["unused"] = [[index] for index in range(len(USERS))]
+        return self.pd.DataFrame(columns, index=[f"row-{index}" for index in range(len(USERS))])
+
+    # Rows give the same results as checking their entities one at a time
+    def test_matches_scalar_results(self):
+        frame = self.make_frame()
+        result = PyGating.check_gating_dataframe(make_configuration(), frame)
+        assert result.dtype == bool
+        assert result.index.equals(frame.index)
+        assert result.tolist() == expected(make_configuration(), USERS)
+
+    # Only the columns the configuration reads are converted, numpy backed ones without copies
+    def test_zero_copy_projection(self):
+        frame = self.make_frame()
+        columns = dataframe_columns(frame, make_configuration().required_properties().paths)
+        assert sorted(columns) == ["user.age", "user.beta", "user.country", "user.created_at"]
+        assert np.shares_memory(columns["user.age"], frame["user.age"].to_numpy())
+        assert list(dataframe_columns(frame, frozenset())) == ["user.country"]
+
+    # Missing values of extension dtypes are None, and raise according to fail_closed
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_missing_values(self, fail_closed):
+        frame = self.make_frame()
+        frame["user.age"] = self.pd.array([30, None, 40, 25, None], dtype="Int64")
+        users = [dict(user, age=age) for user, age in zip(USERS, [30, None, 40, 25, None])]
+
+        callback = Mock()
+        result = PyGating.check_gating_dataframe(make_configuration(fail_closed), frame, callback)
+        assert result.tolist() == expected(make_configuration(fail_closed), users)
+        assert isinstance(callback.call_args[0][0], GatingException)
+
+    # Timezone aware datetimes compare at the same instant, MultiIndex names are joined
+    def test_aware_dates_and_multi_index(self):
+        frame = self.make_frame()
+        frame["user.created_at"] = self.pd.to_datetime(frame["user.created_at"]).dt.tz_localize("Europe/Paris")
+        frame.columns = self.pd.MultiIndex.from_tuples(
+            [tuple(name.split(".")) for name in frame.columns[:-1]] + [("unused", "")]
+        )
+        users = [
+            dict(user, created_at=self.pd.Timestamp(user["created_at"], tz="Europe/Paris").to_pydatetime())
+            for user in USERS
+        ]
+
+        result = PyGating.check_gating_dataframe(make_configuration(), frame)
+        assert result.tolist() == expected(make_configuration(), users)
+
+
+class TestCheckGatingArrow:
+    pa = pytest.importorskip("pyarrow")
+
+    def make_table(self, users=USERS):
+        return self.pa.table({"user": self.pa.array(users), "id": self.pa.array(range(len(users)))})
+
+    # Struct fields are read as dotted paths, with the scalar results
+    def test_matches_scalar_results(self):
+        result = PyGating.check_gating_arrow(make_configuration(), self.make_table())
+        assert result.dtype == bool
+        assert result.tolist() == expected(make_configuration(), USERS)
+
+    # Only the fields the configuration reads are converted, numeric ones without copies
+    def test_zero_copy_projection(self):
+        table = self.make_table()
+        columns = arrow_columns(table, frozenset({"user.age"}))
+        assert list(columns) == ["user.age"]
+        age = table.column("user").chunk(0).field("age")
+        assert columns["user.age"].ctypes.data == age.buffers()[1].address
+        assert list(arrow_columns(table, frozenset())) == ["user.country"]
+        assert sorted(arrow_columns(table, frozenset({"user"}))) == [
+            "user.age",
+            "user.beta",
+            "user.country",
+            "user.created_at",
+        ]
+
+    # Null structs and fields are None, and raise according to fail_closed
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_nulls(self, fail_closed):
+        users = [USERS[0], None, dict(USERS[2], age=None), USERS[3], dict(USERS[4], created_at=None)]
+        table = self.make_table(users)
+        rows = [dict.fromkeys(USERS[0]) if user is None else user for user in users]
+
+        callback = Mock()
+        result = PyGating.check_gating_arrow(make_configuration(fail_closed), table, callback)
+        assert result.tolist() == expected(make_configuration(fail_closed), rows)
+        assert isinstance(callback.call_args[0][0], GatingException)
+
+    # Chunked columns and record batches are supported
+    def test_chunks(self):
+        table = self.pa.concat_tables([self.make_table(USERS[:2]), self.make_table(USERS[2:])])
+        assert PyGating.check_gating_arrow(make_configuration(), table).tolist() == expected(make_configuration(), USERS)
+        batch = table.combine_chunks().to_batches()[0]
+        assert PyGating.check_gating_arrow(make_configuration(), batch).tolist() == expected(make_configuration(), USERS)
+
+    # Configurations reading no property still get one result per row
+    def test_no_property(self):
+        configuration = {"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate"}]}
+        assert PyGating.check_gating_arrow(configuration, self.make_table()).tolist() == [True] * len(USERS)
+        configuration = GatingConfigurationAll(gates=[SimpleGate(allow=False)])
+        assert PyGating.check_gating_arrow(configuration, self.make_table()).tolist() == [False] * len(USERS)
@@ -0,0 +1,177 @@
+from typing import Any, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from src.pygating import AbstractGate, AbstractGatingConfiguration, GatingException, PyGating
+from src.pygating.compiler import CompiledGatingConfiguration
+from src.pygating.gates import (
+    AndGate,
+    BooleanGate,
+    CustomScriptGate,
+    InclusionGate,
+    ListContainertGate,
+    OrGate,
+    PercentageGate,
+    RegexGate,
+    SimpleGate,
+)
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gates.regex_gate import merge_regex_gates
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+
+class RaisingGate(AbstractGate):
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        raise GatingException("Simulated exception in gate check")
+
+
+class TruthyGate(AbstractGate):
+    def _check_gate(self, entity: Optional[Any] = None) -> bool:
+        return 1
+
+
+class InvertedInclusionGate(InclusionGate):
+    def _check_gate(self, entity: Any) -> bool:
+        return not super()._check_gate(entity)
+
+
+ENTITIES = [
+    {"age": 30, "country": "CA", "beta": True, "tags": ["a", "b"], "id": "user-1"},
+    {"age": 12, "country": "US", "beta": False, "tags": ["b"], "id": "user-2"},
+    {"age": 45, "country": "FR", "beta": True, "tags": [], "id": "user-3"},
+    {"age": 30, "country": "US", "beta": False, "tags": ["a"], "id": "user-4"},
+    {"country": "CA"},
+]
+
+
+def nested_configuration(configuration_type=GatingConfigurationAll, fail_closed=True):
+    return configuration_type(
+        fail_closed=fail_closed,
+        gates=[
+            SimpleGate(),
+            OrGate(
+                gates=[
+                    InclusionGate(["CA", "FR"], entity_property="country"),
+                    AndGate(
+                        gates=[
+                            BooleanGate(entity_property="beta", allow=False),
+                            NumericComparisonGate("ge", 18, entity_property="age"),
+                        ]
+                    ),
+                ]
+            ),
+            ListContainertGate("a", entity_property="tags", allow=False),
+            PercentageGate(50, entity_property="id"),
+        ],
+    )
+
+
+class TestGatingCompiler:
+    # Compiled configurations give the same results as the interpreted configuration
+    @pytest.mark.parametrize("configuration_type", [GatingConfigurationAll, GatingConfigurationAny])
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_compiled_matches_interpreted(self, configuration_type, fail_closed):
+        config = nested_configuration(configuration_type, fail_closed)
+        compiled = config.compile()
+
+        assert isinstance(compiled, CompiledGatingConfiguration)
+        for entity in ENTITIES + [None]:
+            assert compiled.check(entity) == config.check(entity)
+
+    # The compiled configuration can be passed to PyGating.check_gating
+    def test_compiled_configuration_with_check_gating(self):
+        config = nested_configuration()
+        compiled = config.compile()
+        for entity in ENTITIES:
+            assert PyGating.check_gating(compiled, entity=entity) == config.check(entity)
+
+    # Exceptions are handled according to fail_closed and reported to the callback
+    @pytest.mark.parametrize("fail_closed", [True, False])
+    def test_exception_callback_and_fail_closed(self, fail_closed):
+        config = GatingConfigurationAll(fail_closed=fail_closed, gates=[RaisingGate()])
+        compiled = config.compile()
+        callback = Mock()
+
+        assert compiled.check({"a": 1}, exception_callback=callback) is (not fail_closed)
+        callback.assert_called_once()
+        assert isinstance(callback.call_args[0][0], GatingException)
+
+    # Short-circuiting follows the declaration order of the gates
+    def test_short_circuit_skips_later_gates(self):
+        script = Mock(return_value=True)
+        config = GatingConfigurationAll(
+            gates=[SimpleGate(allow=False), CustomScriptGate(script_function=script)]
+        )
+        assert config.compile().check("entity") is False
+        script.assert_not_called()
+
+    # Gates without a compile hook fall back to their _check_gate and compare with allow
+    def test_custom_gate_fallback(self):
+        config = GatingConfigurationAll(gates=[TruthyGate(allow=True)])
+        assert config.compile().check() == config.check()
+
+        config = GatingConfigurationAll(gates=[TruthyGate(allow=False)])
+        assert config.compile().check() == config.check()
+
+    # A subclass overriding _check_gate is not compiled with its parent's inlined logic
+    def test_subclass_override_is_respected(self):
+        config = GatingConfigurationAll(gates=[InvertedInclusionGate(["CA"], entity_property="country")])
+        compiled = config.compile()
+        for entity in ENTITIES:
+            assert compiled.check(entity) == config.check(entity)
+
+    # Custom configurations without a compile hook are still compiled through _check_gating
+    def test_custom_configuration_fallback(self):
+        class EveryOtherConfiguration(AbstractGatingConfiguration):
+            def _check_gating(self, entity: Optional[Any] = None):
+                return all(gate.check(entity) for gate in self.gates[::2])
+
+        config = EveryOtherConfiguration(gates=[SimpleGate(), SimpleGate(allow=False)])
+        assert config.compile().check() is True
+
+    # Empty configurations compile to their identity values
+    def test_empty_configurations(self):
+        assert GatingConfigurationAll(gates=[]).compile().check() is True
+        assert GatingConfigurationAny(gates=[]).compile().check() is False
+
+    # Generated source is kept for debugging
+    def test_source_is_available(self):
+        compiled = nested_configuration().compile()
+        assert "def compiled_check" in compiled.source
+
+
+class TestRegexMerging:
+    # Sibling regexes on the same property are compiled into one multi-pattern gate
+    def test_or_gate_merges_sibling_regexes(self):
+        gate = OrGate(
+            gates=[
+                RegexGate("a", entity_property="name"),
+                RegexGate("b", entity_property="name"),
+                RegexGate("c", entity_property="other"),
+                RegexGate("d", entity_property="name"),
+            ]
+        )
+        merged = merge_regex_gates(gate.gates)
+        assert [g.patterns for g in merged] == [["a", "b"], ["c"], ["d"]]
+
+        config = GatingConfigurationAll(gates=[gate])
+        compiled = config.compile()
+        for entity in [{"name": "b", "other": "x"}, {"name": "x", "other": "c"}, {"name": "x", "other": "x"}, {"name": 1}]:
+            assert compiled(entity) == config.check(entity)
+
+    # Denying and subclassed regex gates are left alone
+    def test_unmergeable_regex_gates(self):
+        class Prefix(RegexGate):
+            pass
+
+        gates = [RegexGate("a"), RegexGate("b", allow=False), Prefix("c"), RegexGate("d")]
+        assert merge_regex_gates(gates) == gates
+
+    # Root level regexes of any configurations are merged too
+    def test_any_configuration_merges_regexes(self):
+        config = GatingConfigurationAny(gates=[RegexGate("a"), RegexGate("b")])
+        compiled = config.compile()
+        assert compiled.source.count("(entity)") == 1
+        assert compiled("b") is True
+        assert compiled("c") is False
@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Any, Optional
+
+import pytest
+
+from src.pygating import AbstractGate, PyGating
+from src.pygating.configuration_cache import (
+    GatingConfigurationCache,
+    configuration_content_key,
+)
+from src.pygating.gating_configurations import GatingConfigurationAll
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, gate_configuration_json):
+        self.calls += 1
+        return object()
+
+
+class TestConfigurationContentKey:
+    # Dicts with the same content produce the same key regardless of key order
+    def test_key_ignores_key_order(self):
+        first = {"type": "GatingConfigurationAll", "fail_closed": True, "gates": []}
+        second = {"gates": [], "fail_closed": True, "type": "GatingConfigurationAll"}
+        assert configuration_content_key(first) == configuration_content_key(second)
+
+    # Different content produces different keys
+    def test_key_differs_for_different_content(self):
+        first = {"type": "GatingConfigurationAll", "fail_closed": True, "gates": []}
+        second = {"type": "GatingConfigurationAll", "fail_closed": False, "gates": []}
+        assert configuration_content_key(first) != configuration_content_key(second)
+
+    # Datetimes are supported in the key
+    def test_key_supports_datetimes(self):
+        config = {"start_date": datetime(2022, 1, 1)}
+        assert configuration_content_key(config) is not None
+
+    # Values that cannot be serialized deterministically produce no key
+    def test_key_is_none_for_unserializable_values(self):
+        assert configuration_content_key({"script": lambda entity: True}) is None
+
+
+class TestGatingConfigurationCache:
+    # Identical dicts are only parsed once
+    def test_repeated_config_is_parsed_once(self):
+        cache = GatingConfigurationCache(maxsize=4)
+        parser = CountingParser()
+        first = cache.get_or_parse({"type": "A", "gates": []}, parser)
+        second = cache.get_or_parse({"type": "A", "gates": []}, parser)
+
+        assert first is second
+        assert parser.calls == 1
+        info = cache.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    # The least recently used entry is evicted when the cache is full
+    def test_lru_eviction(self):
+        cache = GatingConfigurationCache(maxsize=2)
+        parser = CountingParser()
+        cache.get_or_parse({"type": "A"}, parser)
+        cache.get_or_parse({"type": "B"}, parser)
+        cache.get_or_parse({"type": "A"}, parser)
+        cache.get_or_parse({"type": "C"}, parser)
+
+        assert cache.cache_info().evictions == 1
+        cache.get_or_parse({"type": "A"}, parser)
+        assert parser.calls == 3
+        cache.get_or_parse({"type": "B"}, parser)
+        assert parser.calls == 4
+
+    # A maxsize of 0 disables caching
+    def test_maxsize_zero_disables_cache(self):
+        cache = GatingConfigurationCache(maxsize=0)
+        parser = CountingParser()
+        cache.get_or_parse({"type": "A"}, parser)
+        cache.get_or_parse({"type": "A"}, parser)
+        assert parser.calls == 2
+        assert len(cache) == 0
+
+    # Unserializable configs are parsed every time rather than cached
+    def test_unserializable_config_is_not_cached(self):
+        cache = GatingConfigurationCache()
+        parser = CountingParser()
+        config = {"type": "A", "script": object()}
+        cache.get_or_parse(config, parser)
+        cache.get_or_parse(config, parser)
+        assert parser.calls == 2
+
+    # invalidate drops entries but keeps the statistics
+    def test_invalidate_keeps_stats(self):
+        cache = GatingConfigurationCache()
+        parser = CountingParser()
+        cache.get_or_parse({"type": "A"}, parser)
+        cache.invalidate()
+        assert len(cache) == 0
+        assert cache.cache_info().misses == 1
+
+    # cache_clear resets both the entries and the statistics
+    def test_cache_clear_resets_stats(self):
+        cache = GatingConfigurationCache()
+        parser = CountingParser()
+        cache.get_or_parse({"type": "A"}, parser)
+        cache.cache_clear()
+        assert cache.cache_info() == (0, 0, 0, 1024, 0)
+
+    def test_negative_maxsize_raises_value_error(self):
+        with pytest.raises(ValueError):
+            GatingConfigurationCache(maxsize=-1)
+
+
+class TestPyGatingConfigurationCache:
+    # PyGating.check_gating reuses the parsed configuration for identical dicts
+    def test_check_gating_reuses_parsed_configuration(self, mocker):
+        PyGating.init()
+        PyGating.configuration_cache.cache_clear()
+        parse = mocker.spy(GatingConfigurationAll, "from_json")
+        config = {
+            "type": "GatingConfigurationAll",
+            "fail_closed": True,
+            "gates": [{"type": "SimpleGate"}],
+        }
+
+        assert PyGating.check_gating(config) is True
+        assert PyGating.check_gating(dict(config)) is True
+        assert parse.call_count == 1
+        assert PyGating.configuration_cache.cache_info().hits == 1
+
+    # Registering a gate invalidates the cached configurations
+    def test_register_gate_invalidates_cache(self):
+        class FalseGate(AbstractGate):
+            def _check_gate(self, entity: Optional[Any] = None) -> bool:
+                return False
+
+        PyGating.init()
+        config = {"type": "GatingConfigurationAll", "gates": [{"type": "CachedGate"}]}
+
+        FalseGate.__name__ = "CachedGate"
+        PyGating.register_gate(FalseGate)
+        assert PyGating.check_gating(config) is False
+
+        class TrueGate(AbstractGate):
+            def _check_gate(self, entity: Optional[Any] = None) -> bool:
+                return True
+
+        TrueGate.__name__ = "CachedGate"
+        PyGating.register_gate(TrueGate)
+        assert PyGating.check_gating(config) is True
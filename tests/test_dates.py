@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+import dateutil.parser
+import pytest
+
+from src.pygating.dates import epoch_us, from_epoch_us, parse_datetime
+
+
+class TestDates:
+    # Naive datetimes are taken as UTC, aware ones are converted
+    def test_epoch_us(self):
+        assert epoch_us(datetime(1970, 1, 1)) == 0
+        assert epoch_us(datetime(1970, 1, 1, 0, 0, 1, 5)) == 1000005
+        assert epoch_us(datetime(1969, 12, 31, 23, 59, 59)) == -1000000
+        assert epoch_us(datetime(1970, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))) == 0
+        assert from_epoch_us(epoch_us(datetime(2024, 5, 6, 7, 8, 9, 10))) == datetime(
+            2024, 5, 6, 7, 8, 9, 10, tzinfo=timezone.utc
+        )
+
+        with pytest.raises(TypeError):
+            epoch_us("2024-01-01")
+
+    # Strict ISO-8601 strings parse like dateutil does, other formats still go through dateutil
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2022-01-01",
+            "2022-01-01T10:00",
+            "2022-01-01 10:00:00.5",
+            "2022-01-01T10:00:00.123456+02:00",
+            "2022-12-31T23:59:59Z",
+            "Jan 5 2022 10:00",
+            "2022/01/05",
+        ],
+    )
+    def test_parse_datetime(self, value):
+        assert parse_datetime(value) == dateutil.parser.parse(value)
+
+    # Invalid dates raise a ValueError on both paths
+    @pytest.mark.parametrize("value", ["2022-02-30", "invalid_date"])
+    def test_parse_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_datetime(value)
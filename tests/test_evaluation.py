@@ -0,0 +1,141 @@
+import pytest
+
+from src.pygating import GatingException, PyGating
+from src.pygating.evaluation import EntityContext, evaluate_all
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import CustomScriptGate, InclusionGate, PercentageGate
+from src.pygating.gating_configurations import GatingConfigurationAll
+
+
+class User:
+    def __init__(self, user_id, country):
+        self.user_id = user_id
+        self.country = country
+        self.calls = 0
+
+    def get_id(self):
+        self.calls += 1
+        return self.user_id
+
+
+def flag(*gates, config_type="GatingConfigurationAll", **params):
+    return {"type": config_type, "gates": list(gates), **params}
+
+
+FLAGS = {
+    "rollout": flag({"type": "PercentageGate", "percentage": 50, "entity_property": "get_id", "salt": "s"}),
+    "rollout_wide": flag({"type": "PercentageGate", "percentage": 90, "entity_property": "get_id", "salt": "s"}),
+    "country": flag({"type": "InclusionGate", "valid_values": ["fr", "de"], "entity_property": "country"}),
+    "combined": flag(
+        {"type": "InclusionGate", "valid_values": ["fr", "de"], "entity_property": "country"},
+        {"type": "RegexGate", "pattern": "^u", "entity_property": "get_id", "allow": False},
+    ),
+    "any": flag(
+        {"type": "BooleanGate", "entity_property": "missing"},
+        {"type": "OrGate", "gates": [{"type": "SimpleGate", "allow": False}, {"type": "SimpleGate"}]},
+        config_type="GatingConfigurationAny",
+    ),
+    "open": flag({"type": "BooleanGate", "entity_property": "missing"}, fail_closed=False),
+    "date": flag({"type": "DateGate", "start_date": "2000-01-01T00:00:00"}),
+}
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+class TestEvaluateAll:
+    # Results equal checking every flag on its own
+    @pytest.mark.parametrize("user_id", [f"user{index}" for index in range(20)])
+    def test_matches_check_gating(self, user_id):
+        user = User(user_id, "fr")
+        expected = {name: PyGating.check_gating(config, User(user_id, "fr")) for name, config in FLAGS.items()}
+        assert PyGating.evaluate_all(user, FLAGS) == expected
+
+    # Each property path is resolved once for the entity
+    def test_properties_resolved_once(self):
+        user = User("user1", "fr")
+        PyGating.evaluate_all(user, FLAGS)
+        assert user.calls == 1
+
+    # Gates bucketing the same property and salt share the hash
+    def test_percentage_hash_shared(self, mocker):
+        rollouts = {name: FLAGS[name] for name in ("rollout", "rollout_wide")}
+        md5 = mocker.spy(PercentageGate, "_md5_bucket")
+        PyGating.evaluate_all(User("user1", "fr"), rollouts)
+        assert md5.call_count == 1
+
+    # Identical side effect free gates of flag store flags are evaluated once
+    def test_identical_gates_shared(self, mocker):
+        store = FlagStore()
+        store.load({name: FLAGS[name] for name in ("country", "combined")})
+        check = mocker.spy(InclusionGate, "_check_gate_context")
+        store.snapshot().evaluate_all(User("user1", "fr"))
+        assert check.call_count == 1
+
+    # Gates changed after parsing are not mistaken for the gates they were parsed like
+    def test_changed_gates_not_shared(self):
+        first = PyGating._parse_gate_configuration_from_json(FLAGS["country"])
+        second = PyGating._parse_gate_configuration_from_json(FLAGS["country"])
+        second.gates[0].valid_values = ["de"]
+        assert evaluate_all({"a": first, "b": second}, {"country": "fr"}) == {"a": True, "b": False}
+
+        store = FlagStore()
+        store.load({"a": first, "b": second})
+        assert store.snapshot().evaluate_all({"country": "fr"}) == {"a": True, "b": False}
+
+    # Gates with side effects run for every flag
+    def test_side_effects_not_shared(self):
+        calls = []
+        gate = CustomScriptGate(lambda entity: calls.append(entity) or True)
+        configurations = {name: GatingConfigurationAll(gates=[gate]) for name in ("a", "b")}
+        assert evaluate_all(configurations, {"id": 1}) == {"a": True, "b": True}
+        assert len(calls) == 2
+
+    # Exceptions are reported for every flag they affect
+    def test_exceptions(self):
+        errors = []
+        results = PyGating.evaluate_all({"country": "fr"}, FLAGS, exception_callback=errors.append)
+        assert results["rollout"] is False
+        assert results["open"] is True
+        assert results["country"] is True
+        expected = []
+        for config in FLAGS.values():
+            PyGating.check_gating(config, {"country": "fr"}, exception_callback=expected.append)
+        assert [str(error) for error in errors] == [str(error) for error in expected]
+
+    # Overridden evaluation methods are honoured
+    def test_subclass_override(self):
+        class AlwaysIncluded(InclusionGate):
+            def _check_gate(self, entity):
+                return True
+
+        config = GatingConfigurationAll(gates=[AlwaysIncluded(["de"], entity_property="country")])
+        assert evaluate_all({"flag": config}, {"country": "fr"}) == {"flag": True}
+
+    # The bitset holds the i-th flag's result in bit i
+    def test_bitset(self):
+        flags = {name: FLAGS[name] for name in ("country", "open", "any", "rollout")}
+        user = User("user1", "us")
+        results = PyGating.evaluate_all(user, flags)
+        bits = PyGating.evaluate_all(User("user1", "us"), flags, as_bitset=True)
+        assert bits == sum(1 << index for index, name in enumerate(flags) if results[name])
+
+    # Flag store flags are evaluated by name, or all of them in sorted order
+    def test_flag_store(self):
+        store = FlagStore()
+        store.load({"b": FLAGS["country"], "a": FLAGS["open"]})
+        snapshot = store.snapshot()
+        assert snapshot.evaluate_all({"country": "fr"}) == {"a": True, "b": True}
+        assert snapshot.evaluate_all({"country": "us"}, as_bitset=True) == 0b01
+        assert snapshot.evaluate_all({"country": "us"}, names=["b"]) == {"b": False}
+        with pytest.raises(GatingException):
+            snapshot.evaluate_all({"country": "us"}, names=["missing"])
+
+    # A falsy entity fails property gates but not entity free date gates
+    def test_no_entity(self):
+        context = EntityContext(None)
+        config = PyGating._parse_gate_configuration_from_json(FLAGS["date"])
+        assert context.check_configuration(config) is True
+        assert context.check_configuration(PyGating._parse_gate_configuration_from_json(FLAGS["country"])) is False
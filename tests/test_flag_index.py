@@ -0,0 +1,94 @@
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.evaluation import EntityContext
+from src.pygating.flag_index import FlagIndex
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import CustomScriptGate, InclusionGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+
+
+def inclusion(values, path="country", **params):
+    return {"type": "InclusionGate", "valid_values": values, "entity_property": path, **params}
+
+
+def flag(*gates, config_type="GatingConfigurationAll", **params):
+    return {"type": config_type, "gates": list(gates), **params}
+
+
+FLAGS = {
+    "fr": flag(inclusion(["fr"])),
+    "eu": flag(inclusion(["fr", "de", "es"]), {"type": "PercentageGate", "percentage": 50, "entity_property": "id"}),
+    "pro_fr": flag({"type": "AndGate", "gates": [inclusion(["pro"], path="plan"), inclusion(["fr"])]}),
+    "not_fr": flag(inclusion(["fr"], allow=False)),
+    "any_fr": flag(inclusion(["fr"]), config_type="GatingConfigurationAny"),
+    "open": flag(inclusion(["fr"]), fail_closed=False),
+    "lists": flag(inclusion([["fr"]])),
+    "ids": flag(inclusion([1, 2, 3], path="id")),
+}
+
+
+@pytest.fixture
+def snapshot():
+    PyGating.init()
+    store = FlagStore()
+    return store.load(FLAGS)
+
+
+class TestFlagIndex:
+    # Only flags that cannot pass without an inclusion gate are indexed
+    def test_indexed_flags(self, snapshot):
+        assert snapshot.index.indexed == {"fr", "eu", "pro_fr", "ids"}
+        # The most selective inclusion gate is used
+        assert set(snapshot.index.paths["plan"][1]) == {"pro"}
+
+    # Candidates are the indexed flags listed under the entity's values
+    def test_candidates(self, snapshot):
+        index = snapshot.index
+        assert index.candidates(EntityContext({"country": "fr", "plan": "pro", "id": 7})) == {"fr", "eu", "pro_fr"}
+        assert index.candidates(EntityContext({"country": "us", "plan": "pro", "id": 2})) == {"pro_fr", "ids"}
+        assert index.candidates(EntityContext({"plan": "free"})) == set()
+        assert index.candidates(EntityContext(None)) == set()
+
+    # Results equal evaluating every flag
+    @pytest.mark.parametrize(
+        "entity",
+        [
+            {"country": "fr", "plan": "pro", "id": "7"},
+            {"country": "de", "plan": "free", "id": 2},
+            {"country": ["fr"], "plan": "pro", "id": True},
+            {"plan": "pro"},
+            {},
+            None,
+        ],
+    )
+    def test_matches_check_gating(self, snapshot, entity):
+        expected = {name: PyGating.check_gating(FLAGS[name], entity) for name in sorted(FLAGS)}
+        assert snapshot.evaluate_all(entity) == expected
+
+    # Ruled out flags are not evaluated, unless their errors must be reported
+    def test_ruled_out_flags_skipped(self, snapshot, mocker):
+        check = mocker.spy(InclusionGate, "_check_gate_context")
+        snapshot.evaluate_all({"country": "us", "plan": "free", "id": 9}, names=["fr", "eu", "pro_fr"])
+        assert check.call_count == 0
+
+        errors = []
+        snapshot.evaluate_all({"plan": "free"}, names=["fr", "eu"], exception_callback=errors.append)
+        assert len(errors) == 2
+
+    # Configurations with side effects or overridden evaluation are not indexed
+    def test_not_indexable(self):
+        class Custom(GatingConfigurationAll):
+            def _check_gating(self, entity=None):
+                return True
+
+        gate = InclusionGate(["fr"], entity_property="country")
+        index = FlagIndex(
+            {
+                "script": GatingConfigurationAll(gates=[CustomScriptGate(lambda entity: True), gate]),
+                "custom": Custom(gates=[gate]),
+                "any": GatingConfigurationAny(gates=[gate]),
+                "plain": GatingConfigurationAll(gates=[gate]),
+            }
+        )
+        assert index.indexed == {"plain"}
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from src.pygating import GatingException, PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import SimpleGate
+from src.pygating.gating_configurations import GatingConfigurationAll
+
+
+def simple_flag(allow=True):
+    return {"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate", "allow": allow}]}
+
+
+@pytest.fixture
+def store():
+    PyGating.init()
+    return FlagStore()
+
+
+class TestFlagStore:
+    # Flags are parsed on load and checked by name
+    def test_load_and_check(self, store):
+        store.load({"on": simple_flag(), "off": simple_flag(False)})
+        assert store.check("on") is True
+        assert store.check("off") is False
+        assert isinstance(store.get("on"), GatingConfigurationAll)
+
+    # Unknown flags raise unless a default is given
+    def test_unknown_flag(self, store):
+        with pytest.raises(GatingException):
+            store.check("missing")
+        assert store.check("missing", default=True) is True
+
+    # Configuration objects can be stored directly
+    def test_configuration_objects(self, store):
+        config = GatingConfigurationAll(gates=[SimpleGate(allow=False)])
+        store.load({"flag": config})
+        assert store.get("flag") is config
+        with pytest.raises(ValueError):
+            store.load({"flag": 1})
+
+    # Unchanged flags keep their parsed configuration and version
+    def test_unchanged_flags_are_kept(self, store):
+        store.load({"a": simple_flag(), "b": simple_flag()})
+        first = store.snapshot()
+        store.load({"a": simple_flag(), "b": simple_flag(False)})
+        second = store.snapshot()
+        assert second["a"] is first["a"]
+        assert second["b"].version != first["b"].version
+        assert second.generation == first.generation + 1
+
+    # Updates only touch the given flags
+    def test_update(self, store):
+        store.load({"a": simple_flag(), "b": simple_flag()})
+        store.update({"c": simple_flag(False)}, removed=["a"])
+        assert sorted(store.snapshot()) == ["b", "c"]
+        assert store.check("c") is False
+
+    # A bundle failing to parse leaves the published flags untouched
+    def test_failed_load_is_not_published(self, store):
+        store.load({"a": simple_flag()})
+        snapshot = store.snapshot()
+        with pytest.raises(Exception):
+            store.load({"a": simple_flag(False), "b": {"type": "Unknown", "gates": []}})
+        assert store.snapshot() is snapshot
+        assert store.check("a") is True
+
+    # Snapshots are immutable and unaffected by later reloads
+    def test_snapshots_are_immutable(self, store):
+        store.load({"a": simple_flag()})
+        snapshot = store.snapshot()
+        store.load({"a": simple_flag(False)})
+        assert snapshot.check("a") is True
+        with pytest.raises(TypeError):
+            snapshot._entries["b"] = None
+
+    # Readers always see a complete bundle while writers reload
+    def test_concurrent_reload(self, store):
+        bundles = [{name: simple_flag(value) for name in "abcd"} for value in (True, False)]
+        store.load(bundles[0])
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                snapshot = store.snapshot()
+                results = {snapshot.check(name) for name in "abcd"}
+                if len(results) != 1:
+                    errors.append(results)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for index in range(200):
+            store.load(bundles[index % 2])
+        stop.set()
+        for reader in readers:
+            reader.join()
+        assert not errors
+
+
+class TestPyGatingFlags:
+    def test_check_flag(self):
+        PyGating.init()
+        PyGating.load_flags({"new_checkout": simple_flag()})
+        try:
+            assert PyGating.check_flag("new_checkout") is True
+            PyGating.update_flags({"new_checkout": simple_flag(False)})
+            assert PyGating.check_flag("new_checkout") is False
+            assert PyGating.check_flag("missing", default=False) is False
+            with pytest.raises(GatingException):
+                PyGating.check_flag("missing")
+        finally:
+            PyGating.flag_store.clear()
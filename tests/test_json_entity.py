@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.json_entity import json_entity
+
+PAYLOAD = {
+    "items": [{"id": i, "name": f"item {i}", "tags": ["a", "b"]} for i in range(50)],
+    "scores": [1, 2.5, -3e2],
+    "user": {
+        "bio": 'quote " and \\ backslash',
+        "profile": {"tags": ["beta", "staff"], "age": 42},
+        "email": "jane@corp.com",
+        "is_staff": False,
+    },
+    "shop": {"country": "fr", "plan": None},
+    "kéy": "v",
+}
+TEXT = json.dumps(PAYLOAD)
+
+FLAGS = {
+    "staff": {
+        "type": "GatingConfigurationAny",
+        "gates": [
+            {"type": "BooleanGate", "entity_property": "user.is_staff"},
+            {"type": "RegexGate", "pattern": ".*@corp", "entity_property": "user.email"},
+        ],
+    },
+    "country": {
+        "type": "GatingConfigurationAll",
+        "gates": [{"type": "InclusionGate", "valid_values": ["fr"], "entity_property": "shop.country"}],
+    },
+    "missing": {
+        "type": "GatingConfigurationAll",
+        "fail_closed": False,
+        "gates": [{"type": "InclusionGate", "valid_values": ["fr"], "entity_property": "shop.missing"}],
+    },
+    "whole": {
+        "type": "GatingConfigurationAll",
+        "fail_closed": False,
+        # Reads the entity itself, which is then fully decoded
+        "gates": [{"type": "DateGate", "start_date": "2022-01-01T00:00:00"}],
+    },
+    # A missing property must raise rather than compare the current time
+    "missing_date": {
+        "type": "GatingConfigurationAll",
+        "gates": [{"type": "DateGate", "start_date": "2000-01-01T00:00:00", "entity_property": "created_at"}],
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+class TestJsonEntity:
+    # Only the requested paths are decoded, with the values json.loads gives
+    def test_sparse(self):
+        entity = json_entity(TEXT.encode(), ["user.email", "user.profile.tags", "shop"])
+        assert entity == {
+            "user": {"email": "jane@corp.com", "profile": {"tags": ["beta", "staff"]}},
+            "shop": {"country": "fr", "plan": None},
+        }
+
+    # A parent needed whole wins over paths below it
+    def test_parent_path(self):
+        entity = json_entity(TEXT, ["user.profile.age", "user", "scores"])
+        assert entity == {"user": PAYLOAD["user"], "scores": PAYLOAD["scores"]}
+
+    # Missing keys are left out, non object values are kept as is
+    def test_missing(self):
+        assert json_entity(TEXT, ["shop.missing", "nothing", "user.email.domain"]) == {
+            "shop": {},
+            "user": {"email": "jane@corp.com"},
+        }
+
+    # Bytes are decoded like json.loads decodes them, memoryviews and escaped keys included
+    def test_inputs(self):
+        for data in (TEXT, TEXT.encode(), memoryview(TEXT.encode("utf-16")), bytearray(TEXT.encode("utf-8-sig"))):
+            assert json_entity(data, ["kéy", "user.bio"]) == {"kéy": "v", "user": {"bio": PAYLOAD["user"]["bio"]}}
+        assert json_entity(json.dumps(PAYLOAD, ensure_ascii=True), ["kéy"]) == {"kéy": "v"}
+
+    # Without paths, or for payloads other than objects, the whole payload is decoded
+    def test_full_decode(self):
+        assert json_entity(TEXT) == PAYLOAD
+        assert json_entity(" [1, 2] ", ["a"]) == [1, 2]
+        assert json_entity('{"a": 1}', []) == {}
+
+    # The sparse entity is truthy when the object is, even when no path was found
+    def test_truthiness(self):
+        assert json_entity('{"user": "x"}', ["created_at"]) == {}
+        assert json_entity('{"user": "x"}', ["created_at"])
+        assert json_entity('{"user": "x"}', [])
+        assert not json_entity(" { } ", ["created_at"])
+        assert not json_entity("{}", [])
+
+    # Duplicate keys keep their last value like json.loads, escaped duplicates included
+    def test_duplicate_keys(self):
+        for text in (
+            '{"role": "user", "user": {"role": "user", "role": "admin"}}',
+            '{"user": {"role": "user"}, "n": [1], "user": {"role": "admin"}}',
+            '{"user": {"role": "user"}, "n": [1], "\\u0075ser": {"role": "admin"}}',
+        ):
+            assert json_entity(text, ["user.role"])["user"]["role"] == json.loads(text)["user"]["role"] == "admin"
+
+    # Invalid json after the last requested top level key is not validated, unless
+    # the rest holds that key again and is fully decoded
+    def test_unscanned_rest(self):
+        assert json_entity('{"a": 1, "b": [1, }', ["a"]) == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            json_entity('{"a": 1, "b": [1, }', ["b"])
+        with pytest.raises(json.JSONDecodeError):
+            json_entity('{"a": 1, "b": "\\u0061", "c": }', ["a"])
+
+    # Invalid json up to the requested paths raises like json.loads
+    def test_invalid(self):
+        with pytest.raises(json.JSONDecodeError):
+            json_entity('{"a": [1, }', ["b"])
+        with pytest.raises(json.JSONDecodeError):
+            json_entity('{"a" 1}', ["a"])
+        with pytest.raises(json.JSONDecodeError):
+            json_entity("", ["a"])
+
+
+class TestCheckGatingJson:
+    # Results match check_gating on the fully decoded entity, errors included
+    def test_matches_check_gating(self):
+        for name, configuration in FLAGS.items():
+            errors, json_errors = [], []
+            expected = PyGating.check_gating(configuration, json.loads(TEXT), errors.append)
+            assert PyGating.check_gating_json(configuration, TEXT.encode(), json_errors.append) == expected, name
+            assert [type(e) for e in json_errors] == [type(e) for e in errors], name
+
+        data = b'{"user": "x"}'
+        assert PyGating.check_gating(FLAGS["missing_date"], json.loads(data)) is False
+        assert PyGating.check_gating_json(FLAGS["missing_date"], data) is False
+
+    # The projection is computed once per configuration
+    def test_cached_projection(self):
+        configuration = PyGating.configuration_cache.get_or_parse(
+            FLAGS["staff"], PyGating._parse_gate_configuration_from_json
+        )
+        PyGating.check_gating_json(configuration, TEXT)
+        projection = configuration._projection
+        assert PyGating.check_gating_json(configuration, TEXT)
+        assert configuration._projection is projection
+        assert projection[1].paths == frozenset({"user.is_staff", "user.email"})
@@ -0,0 +1,130 @@
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.gates import CustomScriptGate, InclusionGate
+from src.pygating.gates.property_gating_type import PropertyGatingType
+from src.pygating.gating_configurations import GatingConfigurationAll
+from src.pygating.loaders import PropertyLoader, check_many
+
+
+class Customer:
+    def __init__(self, customer_id, plan):
+        self.customer_id = customer_id
+        self.plan = plan
+        self.calls = 0
+
+    def get_plan(self):
+        self.calls += 1
+        return self.plan
+
+
+class Order:
+    def __init__(self, order_id, customer, country="fr"):
+        self.order_id = order_id
+        self.customer = customer
+        self.country = country
+
+
+CONFIGURATION = {
+    "type": "GatingConfigurationAll",
+    "gates": [
+        {"type": "InclusionGate", "valid_values": ["fr", "de"], "entity_property": "country"},
+        {"type": "InclusionGate", "valid_values": ["pro", "team"], "entity_property": "customer.get_plan"},
+    ],
+}
+
+
+class Plans:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, customers):
+        self.calls.append([customer.customer_id for customer in customers])
+        return [customer.plan for customer in customers]
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+def make_orders(count):
+    customers = [Customer(index, ["free", "pro", "team"][index % 3]) for index in range(count // 2)]
+    return [Order(index, customers[index % len(customers)], ["fr", "us"][index % 7 == 0]) for index in range(count)]
+
+
+class TestCheckGatingMany:
+    # Results equal check_gating, with one bulk load for all the distinct customers
+    def test_bulk_load(self):
+        orders = make_orders(500)
+        plans = Plans()
+        expected = [PyGating.check_gating(CONFIGURATION, order) for order in orders]
+        for order in orders:
+            order.customer.calls = 0
+
+        assert PyGating.check_gating_many(CONFIGURATION, orders, {"customer.get_plan": plans}) == expected
+        assert len(plans.calls) == 1
+        # Orders outside the countries never need their customer's plan
+        assert sorted(plans.calls[0]) == sorted({order.customer.customer_id for order in orders if order.country == "fr"})
+        assert all(order.customer.calls == 0 for order in orders)
+
+    # Without loaders entities are resolved as usual
+    def test_without_loaders(self):
+        orders = make_orders(20)
+        expected = [PyGating.check_gating(CONFIGURATION, order) for order in orders]
+        assert PyGating.check_gating_many(CONFIGURATION, orders) == expected
+
+    # Objects are told apart by the loader's key
+    def test_loader_key(self):
+        orders = [Order(index, Customer(index % 2, "pro")) for index in range(10)]
+        plans = Plans()
+        loader = PropertyLoader(plans, key=lambda customer: customer.customer_id)
+        assert all(PyGating.check_gating_many(CONFIGURATION, orders, {"customer.get_plan": loader}))
+        assert sorted(plans.calls[0]) == [0, 1]
+
+    # Failed loads are reported like failed property accesses
+    def test_load_errors(self):
+        def fail(customers):
+            raise ValueError("store unavailable")
+
+        errors = []
+        orders = make_orders(10)
+        assert not any(PyGating.check_gating_many(CONFIGURATION, orders, {"customer.get_plan": fail}, errors.append))
+        assert len(errors) == sum(order.country == "fr" for order in orders)
+
+        errors.clear()
+        assert not any(PyGating.check_gating_many(CONFIGURATION, orders, {"customer.get_plan": lambda customers: []}, errors.append))
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    # Gates evaluated before a deferred property are not run again
+    def test_gates_run_once(self):
+        calls = []
+        configuration = GatingConfigurationAll(
+            gates=[
+                CustomScriptGate(lambda order: calls.append(order.order_id) or True),
+                InclusionGate(["pro"], entity_property="customer.get_plan"),
+            ]
+        )
+        orders = make_orders(10)
+        results = check_many(configuration, orders, {"customer.get_plan": Plans()})
+
+        assert results == [order.customer.plan == "pro" for order in orders]
+        assert sorted(calls) == list(range(10))
+
+    # Custom gates reading their property through entity_value are batched too
+    def test_custom_gate(self):
+        class PaidPlanGate(PropertyGatingType):
+            def __init__(self, entity_property):
+                super().__init__(property_type=str, entity_property=entity_property)
+
+            def _check_gate(self, entity):
+                return self.entity_value(entity) != "free"
+
+        configuration = GatingConfigurationAll(gates=[PaidPlanGate("customer.get_plan")])
+        orders = make_orders(10)
+        plans = Plans()
+        expected = [order.customer.plan != "free" for order in orders]
+
+        assert check_many(configuration, orders, {"customer.get_plan": plans}) == expected
+        assert len(plans.calls) == 1
+        assert all(order.customer.calls == 0 for order in orders)
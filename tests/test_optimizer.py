@@ -0,0 +1,145 @@
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.gates import (
+    AndGate,
+    CustomScriptGate,
+    InclusionGate,
+    OrGate,
+    PercentageGate,
+    RandomGate,
+    RegexGate,
+    SimpleGate,
+)
+from src.pygating.gates.numeric_comparison_gate import NumericComparisonGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+from src.pygating.optimizer import FoldedPropertyGate, optimize_configuration
+
+
+def outcome(config, entity):
+    # The result and the errors reported for an entity
+    callback = Mock()
+    result = config.check(entity, exception_callback=callback)
+    return result, [str(call.args[0]) for call in callback.call_args_list]
+
+
+def random_entity(rng):
+    return {
+        "age": rng.choice([rng.randint(0, 90), "unknown"]),
+        "country": rng.choice(["CA", "US", "FR", "DE", 3]),
+        "name": rng.choice(["bob", "alice", "ann", None]),
+        "id": rng.choice(["a", "b", "c", 1]),
+    }
+
+
+def random_gate(rng, depth=0):
+    choice = rng.randrange(9 if depth < 2 else 6)
+    allow = rng.random() < 0.7
+    if choice == 0:
+        return SimpleGate(allow=allow)
+    if choice == 1:
+        return InclusionGate(rng.sample(["CA", "US", "FR", "DE"], 2), entity_property="country", allow=allow)
+    if choice == 2:
+        return RegexGate(rng.choice(["a", "b", "^an"]), entity_property="name", allow=allow)
+    if choice == 3:
+        return PercentageGate(rng.choice([0, 50, 100]), entity_property="id", allow=allow)
+    if choice == 4:
+        return NumericComparisonGate("ge", rng.randint(0, 90), entity_property="age", allow=allow)
+    if choice == 5:
+        return RandomGate(1, allow=allow)
+    gate_type = AndGate if choice in (6, 7) else OrGate
+    return gate_type(gates=[random_gate(rng, depth + 1) for _ in range(rng.randint(1, 4))], allow=allow)
+
+
+class TestOptimizer:
+    # Nested And inside All and Or inside Any are flattened
+    def test_flattening(self):
+        inner = [InclusionGate(["CA"], entity_property="country"), RegexGate("b", entity_property="name")]
+        config = GatingConfigurationAll(gates=[AndGate(gates=[AndGate(gates=inner)])]).optimize()
+        assert config.gates == inner
+
+        config = GatingConfigurationAny(gates=[OrGate(gates=inner), AndGate(gates=inner)]).optimize()
+        assert len(config.gates) == 3
+        assert isinstance(config.gates[2], AndGate)
+
+    # Constant gates are folded with respect to allow and unreachable gates dropped
+    def test_constant_folding(self):
+        regex = RegexGate("b", entity_property="name")
+        config = GatingConfigurationAll(gates=[SimpleGate(), RandomGate(1), regex, SimpleGate(allow=False), regex])
+        optimized = config.optimize()
+        assert optimized.gates[0] is regex
+        assert len(optimized.gates) == 2
+        assert optimized.gates[1].allow is False
+
+        config = GatingConfigurationAny(gates=[SimpleGate(allow=False), OrGate(gates=[SimpleGate()]), regex])
+        optimized = config.optimize()
+        assert len(optimized.gates) == 1
+        assert optimized.check() is True
+
+    # PercentageGate(0 or 100) keeps resolving the property unless errors may be dropped
+    def test_percentage_folding(self):
+        config = GatingConfigurationAll(gates=[PercentageGate(100, entity_property="id")], fail_closed=False)
+        folded = config.optimize().gates[0]
+        assert isinstance(folded, FoldedPropertyGate)
+        assert outcome(config.optimize(), {"id": 1}) == outcome(config, {"id": 1})
+        assert config.optimize(preserve_errors=False).gates == []
+
+    # Adjacent InclusionGates on the same property are merged
+    @pytest.mark.parametrize("first_allow", [True, False])
+    @pytest.mark.parametrize("second_allow", [True, False])
+    @pytest.mark.parametrize("configuration_type", [GatingConfigurationAll, GatingConfigurationAny])
+    def test_inclusion_merging(self, first_allow, second_allow, configuration_type):
+        config = configuration_type(
+            gates=[
+                InclusionGate(["CA", "US", 1], entity_property="country", allow=first_allow),
+                InclusionGate(["US", "FR", True], entity_property="country", allow=second_allow),
+            ]
+        )
+        optimized = config.optimize()
+        assert len(optimized.gates) == 1
+        for country in ["CA", "US", "FR", "DE", 1, True, [1]]:
+            assert optimized.check({"country": country}) == config.check({"country": country})
+
+    # Gates with custom behaviour are left alone and the original configuration is not modified
+    def test_original_is_unchanged(self):
+        script = CustomScriptGate(lambda entity: True)
+        gates = [AndGate(gates=[script, SimpleGate()])]
+        config = GatingConfigurationAll(gates=gates)
+        optimized = optimize_configuration(config)
+        assert optimized is not config
+        assert optimized.gates == [script]
+        assert config.gates is gates
+        assert len(gates[0].gates) == 2
+
+    # Optimized configurations return the same results and errors for every entity
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_configurations(self, seed):
+        rng = random.Random(seed)
+        configuration_type = rng.choice([GatingConfigurationAll, GatingConfigurationAny])
+        config = configuration_type(
+            gates=[random_gate(rng) for _ in range(rng.randint(1, 6))], fail_closed=rng.random() < 0.5
+        )
+        optimized = config.optimize()
+        for _ in range(50):
+            entity = random_entity(rng)
+            assert outcome(optimized, entity) == outcome(config, entity)
+            assert optimized.compile()(entity) == config.check(entity)
+
+    # The optimizer can be applied to every parsed json configuration
+    def test_set_optimizer(self):
+        PyGating.init()
+        config = {
+            "type": "GatingConfigurationAll",
+            "gates": [{"type": "AndGate", "gates": [{"type": "SimpleGate"}, {"type": "SimpleGate", "allow": False}]}],
+        }
+        try:
+            PyGating.set_optimizer(True)
+            assert PyGating.check_gating(config) is False
+            parsed = PyGating.configuration_cache.get_or_parse(config, PyGating._parse_gate_configuration_from_json)
+            assert len(parsed.gates) == 1
+            assert isinstance(parsed.gates[0], SimpleGate)
+        finally:
+            PyGating.set_optimizer(False)
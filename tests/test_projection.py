@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import AndGate, CustomScriptGate, DateGate, InclusionGate, OrGate, RandomGate, SimpleGate
+from src.pygating.gating_configurations import GatingConfigurationAll
+from src.pygating.projection import Projection, gate_projection, merge_projections, required_properties
+
+
+def flag(*gates, config_type="GatingConfigurationAll"):
+    return {"type": config_type, "gates": list(gates)}
+
+
+FLAGS = {
+    "country": flag({"type": "InclusionGate", "valid_values": ["fr"], "entity_property": "shop.country"}),
+    "nested": flag(
+        {
+            "type": "OrGate",
+            "gates": [
+                {"type": "BooleanGate", "entity_property": "user.is_staff"},
+                {
+                    "type": "AndGate",
+                    "gates": [
+                        {"type": "PercentageGate", "percentage": 10, "entity_property": "user.get_id"},
+                        {"type": "RegexGate", "pattern": "@corp", "entity_property": "user.email"},
+                    ],
+                },
+            ],
+        },
+        {"type": "DateGate", "start_date": "2022-01-01T00:00:00", "entity_property": "user.created_at"},
+        config_type="GatingConfigurationAny",
+    ),
+}
+
+
+@pytest.fixture(autouse=True)
+def init():
+    PyGating.init()
+
+
+class TestProjection:
+    # Every entity_property read by the configuration, And/Or children included
+    def test_required_properties(self):
+        nested = PyGating.configuration_cache.get_or_parse(FLAGS["nested"], PyGating._parse_gate_configuration_from_json)
+        assert nested.required_properties() == Projection(
+            frozenset({"user.is_staff", "user.get_id", "user.email", "user.created_at"}), True
+        )
+
+    # Gates reading the entity itself or running scripts make the projection incomplete
+    def test_incomplete(self):
+        assert gate_projection(InclusionGate(["fr"])) == Projection(frozenset(), False)
+        assert gate_projection(DateGate(start_date=datetime(2022, 1, 1))) == Projection(frozenset(), False)
+        assert gate_projection(CustomScriptGate(lambda entity: True)) == Projection(frozenset(), False)
+        assert gate_projection(AndGate([SimpleGate(), RandomGate(0.5)])) == Projection(frozenset(), True)
+
+        configuration = GatingConfigurationAll(
+            gates=[OrGate([InclusionGate(["fr"], entity_property="country"), CustomScriptGate(lambda entity: True)])]
+        )
+        assert required_properties(configuration) == Projection(frozenset({"country"}), False)
+
+    # Subclasses changing evaluation must implement the hook themselves
+    def test_subclass(self):
+        class Custom(InclusionGate):
+            def _check_gate(self, entity):
+                return entity["other"] in self.valid_values
+
+        assert gate_projection(Custom(["fr"], entity_property="country")).complete is False
+
+    # Projections of a whole flag set are merged
+    def test_flag_set(self):
+        expected = Projection(frozenset({"shop.country", "user.is_staff", "user.get_id", "user.email", "user.created_at"}), True)
+        assert PyGating.required_properties(FLAGS) == expected
+
+        store = FlagStore()
+        store.load(FLAGS)
+        assert store.snapshot().required_properties() == expected
+        assert store.snapshot().required_properties(["country"]) == Projection(frozenset({"shop.country"}), True)
+        assert merge_projections([]) == Projection(frozenset(), True)
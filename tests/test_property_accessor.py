@@ -0,0 +1,109 @@
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass
+
+import pytest
+
+from src.pygating import GatingException
+from src.pygating.property_accessor import PropertyAccessor
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@dataclass
+class Details:
+    length: int
+
+
+class Name:
+    def __init__(self, first):
+        self.first = first
+        self.details = Details(len(first))
+
+
+class Shop:
+    def __init__(self, name):
+        self._name = name
+
+    def get_name(self):
+        return self._name
+
+
+class SlottedShop:
+    __slots__ = ("shop", "missing")
+
+    def __init__(self, shop):
+        self.shop = shop
+
+
+class Broken:
+    def explode(self):
+        raise RuntimeError("boom")
+
+
+class Dynamic:
+    def __getattr__(self, name):
+        if name == "virtual":
+            return "value"
+        raise AttributeError(name)
+
+
+class TestPropertyAccessor:
+    # The path is split once at construction
+    def test_segments_are_parsed_once(self):
+        accessor = PropertyAccessor("shop.get_name.details.length")
+        assert accessor.segments == ("shop", "get_name", "details", "length")
+
+    # Without a path the entity itself is returned
+    def test_no_path_returns_entity(self):
+        assert PropertyAccessor(None).resolve("entity") == "entity"
+
+    # Paths mixing dicts, methods, dataclasses and __slots__ classes resolve
+    def test_deep_mixed_path(self):
+        accessor = PropertyAccessor("shop.get_name.details.length")
+        entity = {"shop": Shop(Name("Ada"))}
+        assert accessor.resolve(entity) == 3
+        assert accessor.resolve(SlottedShop(Shop(Name("Grace")))) == 5
+
+    # namedtuple fields are resolved
+    def test_namedtuple_field(self):
+        assert PropertyAccessor("point.y").resolve({"point": Point(1, 2)}) == 2
+
+    # dict subclasses keep their own membership semantics
+    def test_dict_subclass(self):
+        assert PropertyAccessor("a").resolve(OrderedDict(a=1)) == 1
+
+    # Classes with __getattr__ are resolved through the generic protocol
+    def test_custom_getattr(self):
+        assert PropertyAccessor("virtual").resolve(Dynamic()) == "value"
+        with pytest.raises(GatingException, match="property or function named 'other'"):
+            PropertyAccessor("other").resolve(Dynamic())
+
+    # Missing dict keys keep the original error message
+    def test_missing_key_message(self):
+        with pytest.raises(GatingException, match="Entity does not have a key named 'b'"):
+            PropertyAccessor("a.b").resolve({"a": {}})
+
+    # Missing attributes keep the original error message, including unset slots
+    def test_missing_attribute_message(self):
+        with pytest.raises(GatingException, match="property or function named 'missing'"):
+            PropertyAccessor("missing").resolve(SlottedShop(None))
+        with pytest.raises(GatingException, match="property or function named 'nope'"):
+            PropertyAccessor("nope").resolve(Shop("a"))
+
+    # Entity functions raising keep the original error message
+    def test_function_exception_message(self):
+        with pytest.raises(GatingException, match="Entity function explode threw an exception, boom"):
+            PropertyAccessor("explode").resolve(Broken())
+
+    # Resolvers are cached per concrete type and reused
+    def test_resolvers_cached_per_type(self):
+        accessor = PropertyAccessor("x")
+        accessor.resolve(Point(1, 2))
+        accessor.resolve(Point(3, 4))
+        accessor.resolve_segment(0, {"x": 2})
+        assert set(accessor._resolvers[0]) == {dict, Point}
+
+    # Non string paths are reported when resolving
+    def test_invalid_path(self):
+        with pytest.raises(GatingException):
+            PropertyAccessor(1.5).resolve({"a": 1})
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.pygating import GatingException, PyGating
+from src.pygating import registry
+from src.pygating.gates import SimpleGate
+from src.pygating.registry import LazyRegistry, import_path
+
+
+class TestLazyRegistry:
+    # Paths are only imported when the name is first looked up
+    def test_paths_are_resolved_on_lookup(self):
+        lazy = LazyRegistry()
+        lazy.register_path("Simple", ".gates.simple_gate:SimpleGate")
+        assert lazy._entries["Simple"] == ".gates.simple_gate:SimpleGate"
+        assert lazy["Simple"] is SimpleGate
+        assert lazy._entries["Simple"] is SimpleGate
+
+    # Unknown names raise KeyError and are not contained
+    def test_unknown_names(self):
+        lazy = LazyRegistry()
+        assert "Missing" not in lazy
+        with pytest.raises(KeyError):
+            lazy["Missing"]
+
+    # Entry points of the registry group are looked up for unknown names
+    def test_entry_points(self, monkeypatch):
+        loaded = []
+
+        def load():
+            loaded.append(True)
+            return SimpleGate
+
+        entry_point = SimpleNamespace(name="PluginGate", load=load)
+        monkeypatch.setattr(registry, "_entry_points", lambda group: [entry_point] if group == "plugins" else [])
+        lazy = LazyRegistry("plugins")
+        assert "PluginGate" in lazy
+        assert not loaded
+        assert lazy["PluginGate"] is SimpleGate
+        assert "Other" not in lazy
+
+    # Registry changes invalidate the parsed configuration cache
+    def test_changes_notify(self):
+        changes = []
+        lazy = LazyRegistry(on_change=lambda: changes.append(True))
+        lazy["Simple"] = SimpleGate
+        del lazy["Simple"]
+        assert len(changes) == 2
+
+    def test_import_path(self):
+        assert import_path("os.path:join") is __import__("os").path.join
+        with pytest.raises(ValueError):
+            import_path("os.path")
+
+
+class TestPyGatingRegistration:
+    # Library types are registered lazily and resolved by name
+    def test_init_registers_paths(self):
+        PyGating.init()
+        assert isinstance(PyGating.registered_gates._entries["DateGate"], (str, type))
+        assert PyGating.check_gating({"type": "GatingConfigurationAll", "gates": [{"type": "SimpleGate"}]}) is True
+
+    # Gates can be registered by module path
+    def test_register_gate_path(self):
+        PyGating.init()
+        PyGating.register_gate_path("AliasGate", "src.pygating.gates.simple_gate:SimpleGate")
+        config = {"type": "GatingConfigurationAny", "gates": [{"type": "AliasGate", "allow": False}]}
+        assert PyGating.check_gating(config) is False
+        del PyGating.registered_gates["AliasGate"]
+        with pytest.raises(GatingException):
+            PyGating.check_gating(config)
+
+    # Importing the package and its configurations does not import every gate or dateutil
+    def test_import_is_lazy(self):
+        code = (
+            "import sys; import src.pygating.gating_configurations; from src.pygating.gates import InclusionGate; "
+            "print(any(name.startswith('dateutil') for name in sys.modules), "
+            "'src.pygating.gates.date_gate' in sys.modules)"
+        )
+        output = subprocess.run([sys.executable, "-c", code],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parents[1]).stdout
+        assert output.split() == ["False", "False"]
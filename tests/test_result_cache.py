@@ -0,0 +1,138 @@
+import pytest
+
+from src.pygating import PyGating
+from src.pygating.flag_store import FlagStore
+from src.pygating.gates import AndGate, CustomScriptGate, DateGate, InclusionGate, RandomGate, SimpleGate
+from src.pygating.gating_configurations import GatingConfigurationAll, GatingConfigurationAny
+from src.pygating.result_cache import ResultCache, is_pure, is_pure_configuration
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_flag(calls, pure=True):
+    def script(entity):
+        calls.append(entity)
+        return entity["country"] == "fr"
+
+    return GatingConfigurationAll(gates=[CustomScriptGate(script, pure=pure)])
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(clock):
+    PyGating.init()
+    store = FlagStore()
+    store.set_result_cache(ResultCache(maxsize=2, ttl=10, entity_key=lambda entity: entity["id"], clock=clock))
+    return store
+
+
+class TestPurity:
+    # Gates are pure when their class declares it, And/Or gates when all of their gates are
+    def test_is_pure(self):
+        inclusion = InclusionGate(["fr"], entity_property="country")
+        assert is_pure(inclusion)
+        assert is_pure(DateGate(end_date=None, start_date=None))
+        assert not is_pure(RandomGate(0.5))
+        assert not is_pure(CustomScriptGate(lambda entity: True))
+        assert is_pure(CustomScriptGate(lambda entity: True, pure=True))
+        assert is_pure(AndGate([inclusion, SimpleGate()]))
+        assert not is_pure(AndGate([inclusion, RandomGate(0.5)]))
+
+    # Subclasses changing evaluation must declare purity themselves
+    def test_subclass(self):
+        class Random(InclusionGate):
+            def _check_gate(self, entity):
+                return True
+
+        class Declared(Random):
+            pure = True
+
+        assert not is_pure(Random(["fr"]))
+        assert is_pure(Declared(["fr"]))
+
+    # Only built-in configurations of pure gates are pure
+    def test_is_pure_configuration(self):
+        class Custom(GatingConfigurationAll):
+            def _check_gating(self, entity=None):
+                return True
+
+        assert is_pure_configuration(GatingConfigurationAny(gates=[SimpleGate()]))
+        assert not is_pure_configuration(GatingConfigurationAll(gates=[RandomGate(0.5)]))
+        assert not is_pure_configuration(Custom(gates=[SimpleGate()]))
+
+
+class TestResultCache:
+    # Repeated checks for the same entity key reuse the result until it expires
+    def test_ttl(self, store, clock):
+        calls = []
+        store.load({"flag": counting_flag(calls)})
+        for _ in range(3):
+            assert store.check("flag", {"id": 1, "country": "fr"}) is True
+        assert len(calls) == 1
+
+        clock.now = 10
+        assert store.check("flag", {"id": 1, "country": "fr"}) is True
+        assert len(calls) == 2
+        assert store.result_cache.cache_info().hits == 2
+
+    # A new flag version is never served a previous version's result
+    def test_version(self, store):
+        calls = []
+        store.load({"flag": counting_flag(calls)})
+        store.check("flag", {"id": 1, "country": "fr"})
+        store.load({"flag": GatingConfigurationAll(gates=[SimpleGate(allow=False)])})
+        assert store.check("flag", {"id": 1, "country": "fr"}) is False
+
+    # Least recently used entries are evicted
+    def test_lru(self, store):
+        calls = []
+        store.load({"flag": counting_flag(calls)})
+        for entity_id in (1, 2, 1, 3, 1, 2):
+            store.check("flag", {"id": entity_id, "country": "fr"})
+        assert [entity["id"] for entity in calls] == [1, 2, 3, 2]
+        assert store.result_cache.cache_info().evictions == 2
+
+    # Impure flags, missing keys and failed checks are not cached
+    def test_not_cached(self, store):
+        calls = []
+        store.load({"impure": counting_flag(calls, pure=False), "pure": counting_flag(calls)})
+        store.check("impure", {"id": 1, "country": "fr"})
+        store.check("impure", {"id": 1, "country": "fr"})
+        assert len(calls) == 2
+
+        errors = []
+        store.check("pure", {"id": 2}, exception_callback=errors.append)
+        store.check("pure", {"id": 2}, exception_callback=errors.append)
+        assert len(errors) == 2
+
+        cache = ResultCache()
+        store.set_result_cache(cache)
+        store.check("pure", {"id": 1, "country": "fr"})
+        store.check("pure", {"id": 1, "country": "fr"}, entity_key=1)
+        store.check("pure", {"id": 1, "country": "fr"}, entity_key=1)
+        assert len(calls) == 6
+        assert len(cache) == 1
+
+    # check_flag uses the result cache once enabled
+    def test_pygating(self):
+        PyGating.init()
+        calls = []
+        PyGating.load_flags({"flag": counting_flag(calls)})
+        PyGating.set_result_cache(entity_key=lambda entity: entity["id"])
+        try:
+            PyGating.check_flag("flag", {"id": 1, "country": "de"})
+            assert PyGating.check_flag("flag", {"id": 1, "country": "de"}) is False
+            assert len(calls) == 1
+        finally:
+            PyGating.set_result_cache(False)
+            PyGating.load_flags({})